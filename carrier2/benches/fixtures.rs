@@ -33,6 +33,37 @@ pub fn get_gefyra_clients(amount: u32) -> Vec<GefyraClient> {
     GefyraClient::from_yaml(&mapping1, false, "".to_string())
 }
 
+pub fn get_gefyra_clients_with_regex(amount: u32) -> Vec<GefyraClient> {
+    let mut yaml = "".to_string();
+
+    for x in 1..amount {
+        let user = format!(
+            "
+        user-{n}:
+            endpoint: \"www.blueshoe.io:443\"
+            rules:
+                - match:
+                    - matchHeader:
+                        name: \"x-gefyra-[a-z]+\"
+                        value: \"^user-{n}$\"
+                        type: \"regex\"
+                    - matchPath:
+                        path: \"/my-path\"
+                        type: \"prefix\"
+                - match:
+                    - matchPath:
+                        path: \"^/users/{n}/[a-z0-9-]+$\"
+                        type: \"regex\"
+        ",
+            n = x
+        );
+        yaml.push_str(&user);
+    }
+
+    let mapping1 = serde_yaml::from_str(&yaml).unwrap();
+    GefyraClient::from_yaml(&mapping1, false, "".to_string())
+}
+
 pub fn get_simple_header(amount: u32, path: String) -> RequestHeader {
     let mut req1 = RequestHeader::build(Method::GET, path.as_bytes(), None).unwrap();
 
@@ -44,3 +75,15 @@ pub fn get_simple_header(amount: u32, path: String) -> RequestHeader {
     }
     req1
 }
+
+pub fn get_regex_header(amount: u32, path: String, user: u32) -> RequestHeader {
+    let mut req1 = RequestHeader::build(Method::GET, path.as_bytes(), None).unwrap();
+
+    for x in 1..amount {
+        req1.append_header(format!("header-{}", x), format!("value-{}", x))
+            .unwrap();
+    }
+    req1.append_header("x-gefyra-user", format!("user-{}", user))
+        .unwrap();
+    req1
+}
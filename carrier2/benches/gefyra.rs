@@ -1,37 +1,67 @@
-use carrier2::GefyraClient;
+use carrier2::{GefyraClient, GefyraRouter};
 use criterion::{criterion_group, criterion_main, Criterion};
-use fixtures::{get_gefyra_clients, get_simple_header};
+use fixtures::{
+    get_gefyra_clients, get_gefyra_clients_with_regex, get_regex_header, get_simple_header,
+};
 use pingora::http::RequestHeader;
 
 mod fixtures;
 
-fn select_gefyra_client(gefyra_clients: Vec<GefyraClient>, header: RequestHeader) {
-    // this is the heavy duty function from our code
+fn select_gefyra_client(gefyra_clients: &[GefyraClient], header: &RequestHeader) {
+    // the linear scan, compiling regexes per request
     let pos = gefyra_clients
         .iter()
-        .position(|c| c.matching_rules.is_hit(&header));
+        .position(|c| c.matching_rules.is_hit(header));
     if let Some(pos) = pos {
         let _ = &gefyra_clients[pos];
     }
 }
 
+fn route_gefyra_client(router: &GefyraRouter, header: &RequestHeader) {
+    // this is the heavy duty function from our code
+    let _ = router.select(header);
+}
+
 fn criterion_benchmark(c: &mut Criterion) {
-    let clients_200 = get_gefyra_clients(200);
     let req_20 = get_simple_header(20, "/my-path".to_string());
+    let req_50 = get_simple_header(50, "/my-path/".to_string());
 
-    c.bench_function("select from 200 gefyra client, 20 header", |b| {
-        b.iter(|| select_gefyra_client(clients_200.clone(), req_20.clone()))
-    });
-
-    let clients_500 = get_gefyra_clients(200);
-    c.bench_function("select from 500 gefyra client, 20 header", |b| {
-        b.iter(|| select_gefyra_client(clients_500.clone(), req_20.clone()))
-    });
+    for amount in [200, 500, 2000] {
+        let clients = get_gefyra_clients(amount);
+        let router = GefyraRouter::new(clients.clone());
+        for (headers, req) in [(20, &req_20), (50, &req_50)] {
+            c.bench_function(
+                &format!("select from {amount} gefyra client, {headers} header"),
+                |b| b.iter(|| select_gefyra_client(&clients, req)),
+            );
+            c.bench_function(
+                &format!("route from {amount} gefyra client, {headers} header"),
+                |b| b.iter(|| route_gefyra_client(&router, req)),
+            );
+        }
+    }
 
-    let req_50 = get_simple_header(20, "/my-path/".to_string());
-    c.bench_function("select from 200 gefyra client, 50 header", |b| {
-        b.iter(|| select_gefyra_client(clients_200.clone(), req_50.clone()))
-    });
+    // compiling the regexes per request is slow, hence fewer samples
+    let mut group = c.benchmark_group("regex rules");
+    group.sample_size(10);
+    for amount in [200, 500, 2000] {
+        let clients = get_gefyra_clients_with_regex(amount);
+        let router = GefyraRouter::new(clients.clone());
+        // hits the last client by header and path, then by a regex on the path only
+        let req_header = get_regex_header(20, "/my-path".to_string(), amount - 1);
+        let req_path = get_regex_header(20, format!("/users/{}/profile", amount - 1), 0);
+        for (kind, req) in [("header", &req_header), ("path", &req_path)] {
+            group.bench_function(
+                &format!("select from {amount} gefyra client, regex {kind} hit"),
+                |b| b.iter(|| select_gefyra_client(&clients, req)),
+            );
+            group.bench_function(
+                &format!("route from {amount} gefyra client, regex {kind} hit"),
+                |b| b.iter(|| route_gefyra_client(&router, req)),
+            );
+        }
+    }
+    group.finish();
 }
 
 criterion_group!(benches, criterion_benchmark);
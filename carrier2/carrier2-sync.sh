@@ -0,0 +1,42 @@
+#!/bin/busybox sh
+# vim:sw=4:ts=4:et
+
+# Keep /tmp/config.yaml in sync with the config the Gefyra operator serves for the
+# GefyraBridgeMount of this container and reload Carrier2 once it changed. The operator
+# writes the source and starts this loop if the "configmap" config delivery is
+# enabled; the hash of the config Carrier2 loaded is reported with each request.
+
+SOURCE=/tmp/carrier2-source
+CONFIG=/tmp/config.yaml
+LOADED=/tmp/carrier2.loaded
+INTERVAL=1
+
+echo $$ > /tmp/carrier2-sync.pid
+
+reload() {
+    if kill -QUIT "$(cat /tmp/carrier2.pid)" 2>/dev/null; then
+        carrier2 -c $CONFIG -u -d > /tmp/carrier.log 2>&1
+    else
+        carrier2 -c $CONFIG -d > /tmp/carrier.log 2>&1
+    fi
+}
+
+while true; do
+    sleep $INTERVAL
+    [ -f $SOURCE ] || continue
+    . $SOURCE
+    export RUST_LOG
+    current=$(sha256sum $CONFIG | cut -d ' ' -f 1)
+    loaded=""
+    if [ -f $LOADED ]; then
+        loaded=$(sha256sum $LOADED | cut -d ' ' -f 1)
+    fi
+    rm -f $CONFIG.new
+    # an unchanged config is answered with 204 (no content)
+    wget -q -T 5 -O $CONFIG.new \
+        "$CARRIER2_CONFIG_URL?pod=$CARRIER2_POD&token=$CARRIER2_TOKEN&current=$current&loaded=$loaded" || continue
+    if [ -s $CONFIG.new ] && ! cmp -s $CONFIG.new $CONFIG; then
+        mv $CONFIG.new $CONFIG
+        reload
+    fi
+done
@@ -1,6 +1,8 @@
-use log::{debug, info};
+use std::collections::HashMap;
+
+use log::{debug, info, warn};
 use pingora::{http::RequestHeader, prelude::HttpPeer};
-use regex::Regex;
+use regex::{Regex, RegexSet};
 use serde::Deserialize;
 use serde_yaml::Mapping;
 
@@ -156,6 +158,370 @@ impl GefyraClient {
     }
 }
 
+/// Byte-wise prefix tree, yields the values of all keys that are a prefix of a query
+#[derive(Debug, Default)]
+struct PrefixTrie {
+    nodes: Vec<PrefixTrieNode>,
+}
+
+#[derive(Debug, Default)]
+struct PrefixTrieNode {
+    children: HashMap<u8, usize>,
+    values: Vec<usize>,
+}
+
+impl PrefixTrie {
+    fn insert(&mut self, key: &str, value: usize) {
+        if self.nodes.is_empty() {
+            self.nodes.push(PrefixTrieNode::default());
+        }
+        let mut node = 0;
+        for byte in key.bytes() {
+            node = match self.nodes[node].children.get(&byte) {
+                Some(&child) => child,
+                None => {
+                    self.nodes.push(PrefixTrieNode::default());
+                    let child = self.nodes.len() - 1;
+                    self.nodes[node].children.insert(byte, child);
+                    child
+                }
+            };
+        }
+        self.nodes[node].values.push(value);
+    }
+
+    fn prefixes_of(&self, query: &str, hits: &mut Vec<usize>) {
+        let mut node = match self.nodes.first() {
+            Some(root) => root,
+            None => return,
+        };
+        hits.extend(&node.values);
+        for byte in query.bytes() {
+            match node.children.get(&byte) {
+                Some(&child) => {
+                    node = &self.nodes[child];
+                    hits.extend(&node.values);
+                }
+                None => break,
+            }
+        }
+    }
+}
+
+fn compile_regex(pattern: &str) -> Option<Regex> {
+    match Regex::new(pattern) {
+        Ok(regex) => Some(regex),
+        Err(e) => {
+            warn!("Ignoring rule with invalid regex {:?}: {}", pattern, e);
+            None
+        }
+    }
+}
+
+/// Regexes matched in a single pass over a haystack
+#[derive(Debug)]
+struct PatternSet {
+    set: Option<RegexSet>,
+    // only used if the regexes cannot be combined into one RegexSet
+    regexes: Vec<Regex>,
+    values: Vec<usize>,
+}
+
+impl PatternSet {
+    fn new(patterns: Vec<(&Regex, usize)>) -> PatternSet {
+        let (regexes, values): (Vec<Regex>, Vec<usize>) = patterns
+            .into_iter()
+            .map(|(regex, value)| (regex.clone(), value))
+            .unzip();
+        match RegexSet::new(regexes.iter().map(|r| r.as_str())) {
+            Ok(set) => PatternSet {
+                set: Some(set),
+                regexes: Vec::new(),
+                values,
+            },
+            Err(e) => {
+                warn!("Matching {} regexes one by one: {}", regexes.len(), e);
+                PatternSet {
+                    set: None,
+                    regexes,
+                    values,
+                }
+            }
+        }
+    }
+
+    fn matches(&self, haystack: &str, hits: &mut Vec<usize>) {
+        match &self.set {
+            // is_match() is much cheaper than collecting the matches of all regexes
+            Some(set) if set.is_match(haystack) => {
+                hits.extend(set.matches(haystack).into_iter().map(|i| self.values[i]))
+            }
+            Some(_) => {}
+            None => hits.extend(
+                self.regexes
+                    .iter()
+                    .zip(&self.values)
+                    .filter(|(regex, _)| regex.is_match(haystack))
+                    .map(|(_, value)| *value),
+            ),
+        }
+    }
+}
+
+/// A MatchRule with its regexes compiled
+#[derive(Debug)]
+enum CompiledRule {
+    PathExact(String),
+    PathPrefix(String),
+    PathRegex(Regex),
+    HeaderExact(String, String),
+    HeaderPrefix(String, String),
+    HeaderRegex(Regex, Regex),
+    // a rule with an invalid regex
+    Never,
+}
+
+impl CompiledRule {
+    fn compile(rule: &MatchRule) -> CompiledRule {
+        match rule {
+            MatchRule::Path(m) => match m.match_type {
+                MatchType::ExactLookup => CompiledRule::PathExact(m.path.clone()),
+                MatchType::PrefixLookup => CompiledRule::PathPrefix(m.path.clone()),
+                MatchType::RegexLookup => match compile_regex(&m.path) {
+                    Some(regex) => CompiledRule::PathRegex(regex),
+                    None => CompiledRule::Never,
+                },
+            },
+            MatchRule::Header(m) => match m.match_type {
+                MatchType::ExactLookup => {
+                    CompiledRule::HeaderExact(m.name.clone(), m.value.clone())
+                }
+                MatchType::PrefixLookup => {
+                    CompiledRule::HeaderPrefix(m.name.clone(), m.value.clone())
+                }
+                MatchType::RegexLookup => match (compile_regex(&m.name), compile_regex(&m.value)) {
+                    (Some(name), Some(value)) => CompiledRule::HeaderRegex(name, value),
+                    _ => CompiledRule::Never,
+                },
+            },
+        }
+    }
+
+    /// Lower is more selective, a condition is indexed by its most selective rule
+    fn selectivity(&self) -> u8 {
+        match self {
+            CompiledRule::HeaderExact(..) => 0,
+            CompiledRule::PathExact(_) => 1,
+            CompiledRule::HeaderPrefix(..) => 2,
+            CompiledRule::HeaderRegex(..) => 3,
+            CompiledRule::PathRegex(_) => 4,
+            CompiledRule::PathPrefix(_) => 5,
+            CompiledRule::Never => 6,
+        }
+    }
+
+    fn is_hit(&self, path: &str, headers: &[(&str, &str)]) -> bool {
+        match self {
+            CompiledRule::PathExact(p) => path == p,
+            CompiledRule::PathPrefix(p) => path.starts_with(p.as_str()),
+            CompiledRule::PathRegex(regex) => regex.is_match(path),
+            CompiledRule::HeaderExact(n, v) => {
+                headers.iter().any(|(name, value)| name == n && value == v)
+            }
+            CompiledRule::HeaderPrefix(n, v) => headers
+                .iter()
+                .any(|(name, value)| name == n && value.starts_with(v.as_str())),
+            CompiledRule::HeaderRegex(n, v) => headers
+                .iter()
+                .any(|(name, value)| n.is_match(name) && v.is_match(value)),
+            CompiledRule::Never => false,
+        }
+    }
+}
+
+#[derive(Debug)]
+struct CompiledCondition {
+    client: usize,
+    rules: Vec<CompiledRule>,
+    // the rule this condition is indexed by
+    anchor: usize,
+}
+
+/// The matching rules of all GefyraClients of a proxy, compiled once the configuration
+/// is loaded. Each and-condition is indexed by its most selective rule: exact rules in
+/// hash maps, prefix rules in prefix trees and regex rules in RegexSets (one for the
+/// paths, one per header name pattern for the header values). A request looks up the
+/// conditions whose indexed rule it hits and checks their remaining rules in the order
+/// of the GefyraClients, the first GefyraClient with a matching condition is selected.
+#[derive(Debug)]
+pub struct GefyraRouter {
+    clients: Vec<GefyraClient>,
+    conditions: Vec<CompiledCondition>,
+    // the first client with a condition without rules, it matches every request
+    always: Option<usize>,
+    path_exact: HashMap<String, Vec<usize>>,
+    path_prefix: PrefixTrie,
+    path_regex: PatternSet,
+    header_exact: HashMap<String, HashMap<String, Vec<usize>>>,
+    header_prefix: HashMap<String, PrefixTrie>,
+    // header name patterns, with the value patterns per name pattern
+    header_regex_names: PatternSet,
+    header_regex_values: Vec<PatternSet>,
+}
+
+impl GefyraRouter {
+    pub fn new(clients: Vec<GefyraClient>) -> GefyraRouter {
+        let mut conditions = Vec::new();
+        let mut always = None;
+        for (client_idx, client) in clients.iter().enumerate() {
+            for and_condition in &client.matching_rules.or_rules {
+                if and_condition.and_match.is_empty() {
+                    always = always.or(Some(client_idx));
+                    continue;
+                }
+                let rules: Vec<CompiledRule> = and_condition
+                    .and_match
+                    .iter()
+                    .map(CompiledRule::compile)
+                    .collect();
+                let anchor = (0..rules.len())
+                    .min_by_key(|&idx| rules[idx].selectivity())
+                    .unwrap();
+                conditions.push(CompiledCondition {
+                    client: client_idx,
+                    rules,
+                    anchor,
+                });
+            }
+        }
+
+        let mut path_exact: HashMap<String, Vec<usize>> = HashMap::new();
+        let mut path_prefix = PrefixTrie::default();
+        let mut path_regex = Vec::new();
+        let mut header_exact: HashMap<String, HashMap<String, Vec<usize>>> = HashMap::new();
+        let mut header_prefix: HashMap<String, PrefixTrie> = HashMap::new();
+        let mut header_regex: Vec<(&Regex, Vec<(&Regex, usize)>)> = Vec::new();
+        for (idx, condition) in conditions.iter().enumerate() {
+            match &condition.rules[condition.anchor] {
+                CompiledRule::PathExact(path) => {
+                    path_exact.entry(path.clone()).or_default().push(idx)
+                }
+                CompiledRule::PathPrefix(path) => path_prefix.insert(path, idx),
+                CompiledRule::PathRegex(regex) => path_regex.push((regex, idx)),
+                CompiledRule::HeaderExact(name, value) => header_exact
+                    .entry(name.clone())
+                    .or_default()
+                    .entry(value.clone())
+                    .or_default()
+                    .push(idx),
+                CompiledRule::HeaderPrefix(name, value) => header_prefix
+                    .entry(name.clone())
+                    .or_default()
+                    .insert(value, idx),
+                CompiledRule::HeaderRegex(name, value) => {
+                    match header_regex
+                        .iter_mut()
+                        .find(|(n, _)| n.as_str() == name.as_str())
+                    {
+                        Some((_, values)) => values.push((value, idx)),
+                        None => header_regex.push((name, vec![(value, idx)])),
+                    }
+                }
+                // never hit, hence not indexed
+                CompiledRule::Never => {}
+            }
+        }
+        let path_regex = PatternSet::new(path_regex);
+        let header_regex_names = PatternSet::new(
+            header_regex
+                .iter()
+                .enumerate()
+                .map(|(idx, (name, _))| (*name, idx))
+                .collect(),
+        );
+        let header_regex_values = header_regex
+            .into_iter()
+            .map(|(_, values)| PatternSet::new(values))
+            .collect();
+
+        GefyraRouter {
+            clients,
+            conditions,
+            always,
+            path_exact,
+            path_prefix,
+            path_regex,
+            header_exact,
+            header_prefix,
+            header_regex_names,
+            header_regex_values,
+        }
+    }
+
+    pub fn clients(&self) -> &[GefyraClient] {
+        &self.clients
+    }
+
+    /// The first GefyraClient whose matching rules are hit by this request
+    pub fn select(&self, req: &RequestHeader) -> Option<&GefyraClient> {
+        let path = req.uri.path_and_query().map_or("", |p| p.as_str());
+        let headers: Vec<(&str, &str)> = req
+            .headers
+            .iter()
+            .filter_map(|(name, value)| Some((name.as_str(), value.to_str().ok()?)))
+            .collect();
+        let client = self
+            .select_index(path, &headers)
+            .map(|idx| &self.clients[idx]);
+        if let Some(client) = client {
+            debug!("GefyraRouter hit for {:?}", client.key);
+        }
+        client
+    }
+
+    fn select_index(&self, path: &str, headers: &[(&str, &str)]) -> Option<usize> {
+        let mut candidates = Vec::new();
+        if let Some(conditions) = self.path_exact.get(path) {
+            candidates.extend(conditions);
+        }
+        self.path_prefix.prefixes_of(path, &mut candidates);
+        self.path_regex.matches(path, &mut candidates);
+
+        let mut name_hits = Vec::new();
+        for (name, value) in headers {
+            if let Some(conditions) = self.header_exact.get(*name).and_then(|v| v.get(*value)) {
+                candidates.extend(conditions);
+            }
+            if let Some(trie) = self.header_prefix.get(*name) {
+                trie.prefixes_of(value, &mut candidates);
+            }
+            name_hits.clear();
+            self.header_regex_names.matches(name, &mut name_hits);
+            for &idx in &name_hits {
+                self.header_regex_values[idx].matches(value, &mut candidates);
+            }
+        }
+        // the conditions are numbered in the order of the clients
+        candidates.sort_unstable();
+        candidates.dedup();
+        for idx in candidates {
+            let condition = &self.conditions[idx];
+            if self.always.is_some_and(|always| always <= condition.client) {
+                break;
+            }
+            let hit = condition
+                .rules
+                .iter()
+                .enumerate()
+                .all(|(i, rule)| i == condition.anchor || rule.is_hit(path, headers));
+            if hit {
+                return Some(condition.client);
+            }
+        }
+        self.always
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use pingora::{
@@ -164,8 +530,8 @@ mod tests {
     };
 
     use super::{
-        GefyraClient, MatchAndCondition, MatchHeader, MatchOrCondition, MatchPath, MatchRule,
-        MatchType,
+        GefyraClient, GefyraRouter, MatchAndCondition, MatchHeader, MatchOrCondition, MatchPath,
+        MatchRule, MatchType,
     };
 
     #[test]
@@ -351,4 +717,90 @@ mod tests {
         assert_eq!(clients[0].peer.sni(), "www.blueshoe.io");
         assert_eq!(clients[0].matching_rules.or_rules.len(), 2);
     }
+
+    #[test]
+    fn router_selects_first_matching_client() {
+        let users = "
+        user-1:
+            endpoint: \"user-1:8080\"
+            rules:
+                - match:
+                    - matchHeader:
+                        name: \"x-gefyra\"
+                        value: \"user-1\"
+                    - matchPath:
+                        path: \"/my-svc\"
+                        type: \"prefix\"
+        user-2:
+            endpoint: \"user-2:8080\"
+            rules:
+                - match:
+                    - matchHeader:
+                        name: \"x-gefyra-[a-z]+\"
+                        value: \"^user-2$\"
+                        type: \"regex\"
+                - match:
+                    - matchPath:
+                        path: \"^/[a-z]+/user-2\"
+                        type: \"regex\"
+        user-3:
+            endpoint: \"user-3:8080\"
+            rules:
+                - match:
+                    - matchPath:
+                        path: \"/my-svc\"
+                        type: \"prefix\"
+        ";
+        let mapping = serde_yaml::from_str(users).unwrap();
+        let clients = GefyraClient::from_yaml(&mapping, false, "".to_string());
+        let router = GefyraRouter::new(clients.clone());
+        assert_eq!(router.clients().len(), 3);
+
+        let cases: Vec<(&str, Vec<(&str, &str)>, Option<&str>)> = vec![
+            ("/my-svc/1", vec![("x-gefyra", "user-1")], Some("user-1")),
+            // user-1 misses the path, user-3 is selected by its prefix rule
+            ("/my-svc", vec![("x-gefyra", "user-2")], Some("user-3")),
+            ("/other", vec![("x-gefyra", "user-1")], None),
+            ("/other", vec![("x-gefyra-from", "user-2")], Some("user-2")),
+            ("/other", vec![("x-gefyra-from", "user-22")], None),
+            ("/api/user-2", vec![], Some("user-2")),
+        ];
+        for (path, headers, expected) in cases {
+            let mut req = RequestHeader::build(Method::GET, path.as_bytes(), None).unwrap();
+            for (name, value) in headers {
+                req.append_header(name, value).unwrap();
+            }
+            let selected = router.select(&req).map(|c| c.key.as_str());
+            assert_eq!(selected, expected, "request to {}", path);
+            // the same as checking the clients one after another
+            let linear = clients
+                .iter()
+                .find(|c| c.matching_rules.is_hit(&req))
+                .map(|c| c.key.as_str());
+            assert_eq!(selected, linear, "request to {}", path);
+        }
+    }
+
+    #[test]
+    fn router_ignores_invalid_regex() {
+        let users = "
+        user-1:
+            endpoint: \"user-1:8080\"
+            rules:
+                - match:
+                    - matchPath:
+                        path: \"/[\"
+                        type: \"regex\"
+                - match:
+                    - matchHeader:
+                        name: \"x-gefyra\"
+                        value: \"user-1\"
+        ";
+        let mapping = serde_yaml::from_str(users).unwrap();
+        let router = GefyraRouter::new(GefyraClient::from_yaml(&mapping, false, "".to_string()));
+        let mut req = RequestHeader::build(Method::GET, "/a".as_bytes(), None).unwrap();
+        assert!(router.select(&req).is_none());
+        req.append_header("x-gefyra", "user-1").unwrap();
+        assert_eq!(router.select(&req).unwrap().key, "user-1");
+    }
 }
@@ -1,6 +1,6 @@
 use async_trait::async_trait;
 use http::{HeaderValue, Response, StatusCode};
-use lib::GefyraClient;
+use lib::{GefyraClient, GefyraRouter};
 use log::{debug, error, info, warn};
 use pingora::{
     apps::http_app::ServeHttp, prelude::*, protocols::http::ServerSession,
@@ -12,11 +12,14 @@ use std::{fs, sync::Arc};
 
 pub mod lib;
 
+// the config this process runs with, confirms a reload to carrier2-sync.sh
+const LOADED_CONFIG_PATH: &str = "/tmp/carrier2.loaded";
+
 pub struct Carrier2 {
     cluster_upstream: Option<Arc<LoadBalancer<RoundRobin>>>,
     cluster_tls: bool,
     cluster_sni: String,
-    gefyra_clients: Arc<Vec<GefyraClient>>,
+    gefyra_router: Arc<GefyraRouter>,
     logging_headers: Vec<String>,
 }
 
@@ -107,12 +110,7 @@ impl ProxyHttp for Carrier2 {
         _session: &mut Session,
         _ctx: &mut Carrier2Ctx,
     ) -> Result<Box<HttpPeer>> {
-        let client_idx = self
-            .gefyra_clients
-            .iter()
-            .position(|c| c.matching_rules.is_hit(_session.req_header()));
-        if let Some(client_idx) = client_idx {
-            let client = &self.gefyra_clients[client_idx];
+        if let Some(client) = self.gefyra_router.select(_session.req_header()) {
             info!(
                 "({}) Selected GefyraClient {:?}",
                 _ctx.get_request_id(),
@@ -129,7 +127,7 @@ impl ProxyHttp for Carrier2 {
                 self.cluster_sni.clone(),
             ));
             peer.options.verify_cert = false;
-            if self.gefyra_clients.len() == 0 {
+            if self.gefyra_router.clients().is_empty() {
                 info!(
                     "({}) Selected cluster upstream (no GefyraClient loaded)",
                     _ctx.get_request_id()
@@ -256,7 +254,8 @@ fn main() {
 
                     let carrier2_http_router = Carrier2 {
                         cluster_upstream: cluster_upstreams,
-                        gefyra_clients: Arc::new(clients),
+                        // the matching rules are compiled once per configuration
+                        gefyra_router: Arc::new(GefyraRouter::new(clients)),
                         cluster_tls: cert_path.is_some(),
                         cluster_sni: local_sni.unwrap_or_else(|| "".to_string()),
                         logging_headers: supported_logging_headers.clone(),
@@ -322,6 +321,9 @@ fn main() {
                 }
             }
         }
+        if let Err(e) = fs::write(LOADED_CONFIG_PATH, &conf_str) {
+            warn!("Could not write {}: {}", LOADED_CONFIG_PATH, e);
+        }
         my_server
     } else {
         warn!("No configuration provided. Idle mode ...");
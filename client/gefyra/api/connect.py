@@ -1,9 +1,12 @@
 import base64
 import logging
 import os
+import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import IO
+from typing import IO, TYPE_CHECKING
 
 import docker
 
@@ -14,7 +17,14 @@ from gefyra.exceptions import (
     GefyraClientNotFound,
     GefyraConnectionError,
 )
-from gefyra.local.cargo import determine_wireguard_mtu, probe_wireguard_connection
+from gefyra.local.cargo import (
+    connection_health_key,
+    determine_wireguard_mtu,
+    list_cargo_containers,
+    probe_wireguard_connection,
+    read_connection_health,
+    write_connection_health,
+)
 from gefyra.local.clients import handle_get_gefyraclient
 from gefyra.local.minikube import detect_minikube_config
 from gefyra.local.networking import handle_remove_network
@@ -28,8 +38,14 @@ from gefyra.types import (
 
 from .utils import stopwatch
 
+if TYPE_CHECKING:
+    from docker.models.containers import Container
+
 logger = logging.getLogger(__name__)
 
+# Cargo containers probed at the same time when listing connections
+CONNECTION_PROBE_WORKERS = 8
+
 
 @stopwatch
 def connect(
@@ -157,26 +173,54 @@ def disconnect(
     )
 
 
+def _probe_connection(
+    config: ClientConfiguration, cargo_container: "Container"
+) -> dict:
+    probe_config = ClientConfiguration(
+        docker_client=config.DOCKER,
+        cargo_container_name=cargo_container.name,
+        ignore_docker=True,
+    )
+    probe_config.CARGO_PROBE_TIMEOUT = 1  # don't wait too long for the probe
+    mtu = None
+    try:
+        probe_wireguard_connection(probe_config)
+        state = "running"
+        mtu = determine_wireguard_mtu(probe_config)
+    except GefyraConnectionError:
+        state = "error"
+    return {"status": state, "mtu": mtu, "checked": time.time()}
+
+
 @stopwatch
 def list_connections() -> list[GefyraConnectionItem]:
-    from gefyra.local import CARGO_LABEL, CONNECTION_NAME_LABEL, VERSION_LABEL
+    from gefyra.local import CONNECTION_NAME_LABEL, VERSION_LABEL
 
     config = ClientConfiguration()
+    containers = list_cargo_containers(config)
+    health = read_connection_health(config)
+    unprobed = [
+        cargo_container
+        for cargo_container in containers
+        if cargo_container.status == "running"
+        and connection_health_key(cargo_container) not in health
+    ]
+    if unprobed:
+        with ThreadPoolExecutor(
+            max_workers=min(len(unprobed), CONNECTION_PROBE_WORKERS)
+        ) as executor:
+            probes = executor.map(partial(_probe_connection, config), unprobed)
+            for cargo_container, probe in zip(unprobed, probes):
+                health[connection_health_key(cargo_container)] = probe
+        write_connection_health(config, health)
+
     result = []
-    containers = config.DOCKER.containers.list(
-        all=True, filters={"label": f"{CARGO_LABEL[0]}={CARGO_LABEL[1]}"}
-    )
     for cargo_container in containers:
         mtu = None
         if cargo_container.status == "running":
-            try:
-                config = ClientConfiguration(cargo_container_name=cargo_container.name)
-                config.CARGO_PROBE_TIMEOUT = 1  # don't wait too long for the probe
-                probe_wireguard_connection(config)
-                state = "running"
-                mtu = determine_wireguard_mtu(config)
-            except GefyraConnectionError:
-                state = "error"
+            probe = health[connection_health_key(cargo_container)]
+            state = probe["status"]
+            mtu = probe.get("mtu")
         else:
             state = "stopped"
         result.append(
@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from gefyra.configuration import ClientConfiguration
 from gefyra.exceptions import ClientConfigurationError
@@ -8,33 +9,39 @@ from .utils import stopwatch
 
 logger = logging.getLogger(__name__)
 
+# connections whose containers are listed at the same time
+LIST_WORKERS = 8
+
 
 @stopwatch
 def list_containers(
     connection_name: str | None = None,
 ) -> list[tuple[str, list[GefyraLocalContainer]]]:
-    from gefyra import api
+    from gefyra.local import CONNECTION_NAME_LABEL
     from gefyra.local.bridge import get_all_containers
+    from gefyra.local.cargo import list_cargo_containers
 
-    conns = api.list_connections()
+    # the containers are listed from the networks, no need to probe the connections
+    config = ClientConfiguration(ignore_docker=True)
+    names = [
+        cargo_container.labels.get(CONNECTION_NAME_LABEL, "unknown")
+        for cargo_container in list_cargo_containers(config)
+    ]
     if connection_name:
-        if connection_name not in [conns.name for conns in conns]:
+        if connection_name not in names:
             raise ClientConfigurationError(
                 f"Connection {connection_name} does not exist. Please create it first."
             )
-        return [
-            (
-                connection_name,
-                get_all_containers(
-                    ClientConfiguration(connection_name=connection_name)
-                ),
-            )
-        ]
-    else:
-        return [
-            (
-                conn.name,
-                get_all_containers(ClientConfiguration(connection_name=conn.name)),
+        names = [connection_name]
+    if not names:
+        return []
+
+    def _containers(name: str) -> list[GefyraLocalContainer]:
+        return get_all_containers(
+            ClientConfiguration(
+                docker_client=config.DOCKER, connection_name=name, ignore_docker=True
             )
-            for conn in conns
-        ]
+        )
+
+    with ThreadPoolExecutor(max_workers=min(len(names), LIST_WORKERS)) as executor:
+        return list(zip(names, executor.map(_containers, names)))
@@ -1,6 +1,5 @@
 import logging
 from pathlib import Path
-from time import sleep
 
 from gefyra.api.utils import get_workload_information, random_string, stopwatch
 from gefyra.configuration import ClientConfiguration
@@ -11,6 +10,7 @@ from gefyra.local.mount import (
     handle_create_gefyrabridgemount,
     handle_delete_gefyramount,
 )
+from gefyra.local.utils import wait_for_custom_object
 from gefyra.types import GefyraBridgeMount
 
 logger = logging.getLogger(__name__)
@@ -54,21 +54,26 @@ def create_mount(
         tls_sni,
     )
     bridge_mount = handle_create_gefyrabridgemount(config, bridge_mount_body, target)
-    waiting_time = 0
-    if timeout:
-        waiting_time = timeout
-    while True and wait:
-        # watch whether all relevant mounts have been established
-        mount = get_gefyrabridgemount(config, mount_name)
-        gmount = GefyraBridgeMount(config, mount)
-        if gmount.uid in bridge_mount["metadata"]["uid"] and gmount._state == "ACTIVE":
-            logger.info(f"Bridge mount {gmount.name} established.")
-            break
-        sleep(1)
-        # Raise exception in case timeout is reached
-        waiting_time -= 1
-        if timeout and waiting_time <= 0:
-            raise CommandTimeoutError("Timeout for bridging operation exceeded")
+    if wait:
+        # watch whether the mount has been established
+        uid = bridge_mount["metadata"]["uid"]
+        try:
+            bridge_mount = wait_for_custom_object(
+                config,
+                "gefyrabridgemounts",
+                mount_name,
+                lambda obj: (
+                    obj is not None
+                    and obj["metadata"]["uid"] == uid
+                    and obj.get("state") == "ACTIVE"
+                ),
+                timeout or None,
+            )
+        except TimeoutError:
+            raise CommandTimeoutError(
+                "Timeout for bridging operation exceeded"
+            ) from None
+        logger.info(f"Bridge mount {mount_name} established.")
     return GefyraBridgeMount(config, bridge_mount)
 
 
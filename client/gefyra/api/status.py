@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from gefyra.api import stopwatch
 from gefyra.configuration import ClientConfiguration
@@ -17,6 +18,8 @@ def _get_client_status(config: ClientConfiguration) -> GefyraClientStatus:
     from docker.errors import NotFound
 
     from gefyra.local import CARGO_ENDPOINT_LABEL, VERSION_LABEL
+    from gefyra.local.bridge import get_all_gefyrabridges
+    from gefyra.local.cargo import probe_wireguard_connection
 
     # these are the default values
     _status = GefyraClientStatus(
@@ -31,47 +34,55 @@ def _get_client_status(config: ClientConfiguration) -> GefyraClientStatus:
         context=config.KUBE_CONTEXT,
         cargo_endpoint="",
     )
+    # independent checks run concurrently, dependent ones only start once their
+    # precondition is met
+    executor = ThreadPoolExecutor(max_workers=2)
     try:
         logger.debug("Checking cargo container running")
-        cargo_container = config.DOCKER.containers.get(config.CARGO_CONTAINER_NAME)
-        if cargo_container.status == "running":
-            _status.cargo = True
-            _status.cargo_endpoint = cargo_container.attrs["Config"]["Labels"].get(
-                CARGO_ENDPOINT_LABEL
-            )
-            _status.version = cargo_container.attrs["Config"]["Labels"].get(
-                VERSION_LABEL
-            )
-            _status.cargo_image = cargo_container.image.tags[0]
-    except NotFound:
-        pass
-    try:
-        logger.debug("Checking gefyra network available")
-        gefyra_net = config.DOCKER.networks.get(f"{config.NETWORK_NAME}")
-        _status.network = True
-        _status.containers = (
-            len(gefyra_net.containers) - 1
-            if _status.cargo is True
-            else len(gefyra_net.containers)
+        cargo = executor.submit(
+            config.DOCKER.containers.get, config.CARGO_CONTAINER_NAME
         )
-    except NotFound:
-        return _status
-
-    from gefyra.local.cargo import probe_wireguard_connection
-
-    try:
-        logger.debug("Probing wireguard connection")
-        if _status.cargo:
-            probe_wireguard_connection(config)
-            _status.connection = True
-    except RuntimeError:
+        logger.debug("Checking gefyra network available")
+        network = executor.submit(config.DOCKER.networks.get, f"{config.NETWORK_NAME}")
+        try:
+            cargo_container = cargo.result()
+            if cargo_container.status == "running":
+                _status.cargo = True
+                _status.cargo_endpoint = cargo_container.attrs["Config"]["Labels"].get(
+                    CARGO_ENDPOINT_LABEL
+                )
+                _status.version = cargo_container.attrs["Config"]["Labels"].get(
+                    VERSION_LABEL
+                )
+                _status.cargo_image = cargo_container.image.tags[0]
+        except NotFound:
+            pass
+        try:
+            gefyra_net = network.result()
+            _status.network = True
+            _status.containers = (
+                len(gefyra_net.containers) - 1
+                if _status.cargo is True
+                else len(gefyra_net.containers)
+            )
+        except NotFound:
+            return _status
+
+        logger.debug("Counting all active bridges")
+        bridges = executor.submit(get_all_gefyrabridges, config)
+        try:
+            logger.debug("Probing wireguard connection")
+            if _status.cargo:
+                probe_wireguard_connection(config)
+                _status.connection = True
+        except RuntimeError:
+            return _status
+
+        _status.bridges = len(bridges.result())
         return _status
-
-    from gefyra.local.bridge import get_all_gefyrabridges
-
-    logger.debug("Counting all active bridges")
-    _status.bridges = len(get_all_gefyrabridges(config))
-    return _status
+    finally:
+        # do not wait for checks whose result is not needed anymore
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def _get_cluster_status(config: ClientConfiguration) -> GefyraClusterStatus:
@@ -89,55 +100,76 @@ def _get_cluster_status(config: ClientConfiguration) -> GefyraClusterStatus:
         namespace=False,
         operator_webhook=False,
     )
-    # check if connected to the cluster
-    try:
-        logger.debug("Reading API resources from Kubernetes")
-        config.K8S_CORE_API.get_api_resources(_request_timeout=(1, 5))
-        _status.connected = True
-    except (ApiException, ConfigException, MaxRetryError):
-        return _status
-    # check if gefyra namespace is available
+    # all checks are sent at once, their results are evaluated in order: e.g. the
+    # operator is not checked if the cluster cannot be reached
+    executor = ThreadPoolExecutor(max_workers=4)
     try:
-        logger.debug("Reading gefyra namespace")
-        config.K8S_CORE_API.read_namespace(
-            name=config.NAMESPACE, _request_timeout=(1, 5)
+        api_resources = executor.submit(
+            lambda: config.K8S_CORE_API.get_api_resources(_request_timeout=(1, 5))
         )
-        _status.namespace = True
-    except ApiException:
-        return _status
-    # check if the Gefyra operator is running and ready
-    try:
-        logger.debug("Checking operator deployment")
-        operator_deploy = config.K8S_APP_API.read_namespaced_deployment(
-            name="gefyra-operator", namespace=config.NAMESPACE, _request_timeout=(1, 5)
+        namespace = executor.submit(
+            lambda: config.K8S_CORE_API.read_namespace(
+                name=config.NAMESPACE, _request_timeout=(1, 5)
+            )
         )
-        if (
-            operator_deploy.status.ready_replicas
-            and operator_deploy.status.ready_replicas >= 1
-        ):
-            _status.operator = True
-            _status.operator_webhook = True
-            _status.operator_image = operator_deploy.spec.template.spec.containers[
-                0
-            ].image
-    except ApiException:
-        return _status
-
-    # check if the Gefyra operator is running and ready
-    try:
-        logger.debug("Checking Stowaway endpoint")
-        stowaway_pod: V1Pod = config.K8S_CORE_API.read_namespaced_pod(
-            name="gefyra-stowaway-0",
-            namespace=config.NAMESPACE,
-            _request_timeout=(1, 5),
+        operator = executor.submit(
+            lambda: config.K8S_APP_API.read_namespaced_deployment(
+                name="gefyra-operator",
+                namespace=config.NAMESPACE,
+                _request_timeout=(1, 5),
+            )
         )
-        if stowaway_pod.status.container_statuses[0].ready:
-            _status.stowaway = True
-            _status.stowaway_image = stowaway_pod.spec.containers[0].image
-    except ApiException as e:
-        logger.warning(e)
+        stowaway = executor.submit(
+            lambda: config.K8S_CORE_API.read_namespaced_pod(
+                name="gefyra-stowaway-0",
+                namespace=config.NAMESPACE,
+                _request_timeout=(1, 5),
+            )
+        )
+        # check if connected to the cluster
+        try:
+            logger.debug("Reading API resources from Kubernetes")
+            api_resources.result()
+            _status.connected = True
+        except (ApiException, ConfigException, MaxRetryError):
+            return _status
+        # check if gefyra namespace is available
+        try:
+            logger.debug("Reading gefyra namespace")
+            namespace.result()
+            _status.namespace = True
+        except ApiException:
+            return _status
+        # check if the Gefyra operator is running and ready
+        try:
+            logger.debug("Checking operator deployment")
+            operator_deploy = operator.result()
+            if (
+                operator_deploy.status.ready_replicas
+                and operator_deploy.status.ready_replicas >= 1
+            ):
+                _status.operator = True
+                _status.operator_webhook = True
+                _status.operator_image = operator_deploy.spec.template.spec.containers[
+                    0
+                ].image
+        except ApiException:
+            return _status
+
+        # check if the Gefyra operator is running and ready
+        try:
+            logger.debug("Checking Stowaway endpoint")
+            stowaway_pod: V1Pod = stowaway.result()
+            if stowaway_pod.status.container_statuses[0].ready:
+                _status.stowaway = True
+                _status.stowaway_image = stowaway_pod.spec.containers[0].image
+        except ApiException as e:
+            logger.warning(e)
 
-    return _status
+        return _status
+    finally:
+        # do not wait for checks whose result is not needed anymore
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 @stopwatch
@@ -147,9 +179,13 @@ def status(connection_name: str = "") -> GefyraStatus:
     # Check if kubeconfig is available through running Cargo
     config = ClientConfiguration(connection_name=connection_name)
 
-    cluster = _get_cluster_status(config)
+    # the cluster side and the client side are checked at the same time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        cluster_status = executor.submit(_get_cluster_status, config)
+        client_status = executor.submit(_get_client_status, config)
+        cluster = cluster_status.result()
     try:
-        client = _get_client_status(config)
+        client = client_status.result()
     except urllib3.exceptions.MaxRetryError as e:
         raise ClientConfigurationError(
             f"Cannot reach cluster on {e.pool.host}:{e.pool.port}\n"
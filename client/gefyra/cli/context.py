@@ -1,10 +1,9 @@
 import click
-import urllib3
 
-from gefyra.cli.utils import AliasedGroup
+from gefyra.cli.utils import LazyGroup
 
 
-@click.group(cls=AliasedGroup)
+@click.group(cls=LazyGroup)
 @click.option(
     "--kubeconfig",
     help="Path to the kubeconfig file to use instead of loading the default",
@@ -35,6 +34,8 @@ def cli(ctx: click.Context, kubeconfig, context, debug):
         logger.addHandler(handler)
         logging.getLogger("gefyra").setLevel(logging.DEBUG)
     else:
+        import urllib3
+
         urllib3.disable_warnings()
         logging.getLogger("gefyra").setLevel(logging.ERROR)
 
@@ -436,7 +436,7 @@ def generate_group_doc(
         lines.append(f"\n**Example:**\n{EXAMPLES[full_name]}")
 
     # Add subcommands overview for top-level groups
-    subcommands = sorted(group.commands.items(), key=lambda x: x[0])
+    subcommands = _list_commands(group)
     visible_subcommands = [(n, c) for n, c in subcommands if not c.hidden]
 
     if visible_subcommands and is_toplevel:
@@ -471,6 +471,16 @@ def generate_group_doc(
     return "\n".join(lines)
 
 
+def _list_commands(group: click.Group) -> list[tuple[str, click.Command]]:
+    """All subcommands of a group sorted by name, including lazily loaded ones."""
+    ctx = click.Context(group)
+    return [
+        (name, cmd)
+        for name in group.list_commands(ctx)
+        if (cmd := group.get_command(ctx, name)) is not None
+    ]
+
+
 def generate_toc(cli: click.Group) -> str:
     """Generate a table of contents for all commands."""
     lines = [
@@ -480,7 +490,7 @@ def generate_toc(cli: click.Group) -> str:
         "|:--------|:------------|",
     ]
 
-    commands = sorted(cli.commands.items(), key=lambda x: x[0])
+    commands = _list_commands(cli)
     for cmd_name, cmd in commands:
         if cmd.hidden:
             continue
@@ -512,7 +522,7 @@ def generate_docs(output: str | None = None) -> str:
     lines.append(generate_toc(cli))
 
     # Get all top-level commands sorted alphabetically
-    commands = sorted(cli.commands.items(), key=lambda x: x[0])
+    commands = _list_commands(cli)
 
     for cmd_name, cmd in commands:
         if cmd.hidden:
@@ -1,34 +1,58 @@
-from gefyra.cli.bridge import bridge
-from gefyra.cli.clients import clients
-from gefyra.cli.connections import connections
-from gefyra.cli.installation import install, uninstall
-from gefyra.cli.list import list
-from gefyra.cli.mount import mount
-from gefyra.cli.operator import operator
-from gefyra.cli.rm import rm
-from gefyra.cli.run import run
-from gefyra.cli.self import _self
-from gefyra.cli.status import status_command
-from gefyra.cli.updown import cluster_down, cluster_up
-from gefyra.cli.version import version
-
 from .context import cli
 
-cli.add_command(cmd=bridge, name="bridge")
-cli.add_command(cmd=clients, name="clients")
-cli.add_command(cmd=connections, name="connections")
-cli.add_command(cmd=install, name="install")
-cli.add_command(cmd=uninstall, name="uninstall")
-cli.add_command(cmd=cluster_up, name="up")
-cli.add_command(cmd=cluster_down, name="down")
-cli.add_command(cmd=status_command, name="status")
-cli.add_command(cmd=run, name="run")
-cli.add_command(cmd=rm, name="rm")
-cli.add_command(cmd=version, name="version")
-cli.add_command(cmd=_self, name="self")
-cli.add_command(cmd=operator, name="operator")
-cli.add_command(cmd=list, name="list")
-cli.add_command(cmd=mount, name="mount")
+# the modules of the subcommands are imported once a subcommand is invoked
+cli.add_lazy_command(
+    "bridge",
+    "gefyra.cli.bridge:bridge",
+    "Manage your GefyraBridges to redirect traffic from a GefyraBridgeMount target",
+)
+cli.add_lazy_command(
+    "clients",
+    "gefyra.cli.clients:clients",
+    "Manage GefyraClients for a Gefyra installation",
+)
+cli.add_lazy_command(
+    "connections",
+    "gefyra.cli.connections:connections",
+    "Manage connections to Kubernetes clusters for a GefyraClient on this machine",
+)
+cli.add_lazy_command(
+    "install",
+    "gefyra.cli.installation:install",
+    "Create and print the Kubernetes configs for Gefyra; usage: 'gefyra install"
+    " [options] | kubectl apply -f -",
+)
+cli.add_lazy_command(
+    "uninstall",
+    "gefyra.cli.installation:uninstall",
+    "Removes the Gefyra installation from the cluster",
+)
+cli.add_lazy_command(
+    "up",
+    "gefyra.cli.updown:cluster_up",
+    "Install Gefyra on a cluster and directly connect to it",
+)
+cli.add_lazy_command(
+    "down", "gefyra.cli.updown:cluster_down", "Remove Gefyra locally and on the cluster"
+)
+cli.add_lazy_command(
+    "status", "gefyra.cli.status:status_command", "Get Gefyra's status"
+)
+cli.add_lazy_command("run", "gefyra.cli.run:run", "Run a container in Gefyra.")
+cli.add_lazy_command(
+    "rm", "gefyra.cli.rm:rm", "Remove a Gefyra container and its associated bridges"
+)
+cli.add_lazy_command("version", "gefyra.cli.version:version")
+cli.add_lazy_command("self", "gefyra.cli.self:_self", "Manage this Gefyra executable")
+cli.add_lazy_command(
+    "operator", "gefyra.cli.operator:operator", "Manage operator installation"
+)
+cli.add_lazy_command("list", "gefyra.cli.list:list", "List running containers")
+cli.add_lazy_command(
+    "mount",
+    "gefyra.cli.mount:mount",
+    "Manage GefyraBridgeMounts for a Gefyra installation",
+)
 
 
 def main():
@@ -1,19 +1,22 @@
 import logging
 from collections.abc import Iterable
 from dataclasses import fields
-from typing import Any
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
 import click
 from click import ClickException
 
-from gefyra.types import ExactMatchHeader
-from gefyra.types.bridge import (
-    ExactMatchPath,
-    PrefixMatchHeader,
-    PrefixMatchPath,
-    RegexMatchHeader,
-    RegexMatchPath,
-)
+if TYPE_CHECKING:
+    # the CLI must start without loading the Kubernetes and Docker clients
+    from gefyra.types.bridge import (
+        ExactMatchHeader,
+        ExactMatchPath,
+        PrefixMatchHeader,
+        PrefixMatchPath,
+        RegexMatchHeader,
+        RegexMatchPath,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -82,7 +85,7 @@ class AliasedGroup(click.Group):
         if not matches:
             return None
         elif len(matches) == 1:
-            return click.Group.get_command(self, ctx, matches[0])
+            return self.get_command(ctx, matches[0])
         ctx.fail(f"Too many matches: {', '.join(sorted(matches))}")
 
     def format_commands(self, ctx, formatter) -> None:
@@ -121,6 +124,82 @@ class AliasedGroup(click.Group):
         return cmd.name, cmd, args
 
 
+class LazyGroup(AliasedGroup):
+    """
+    A group whose subcommands are imported only once they are invoked. The command
+    overview of '--help' is rendered from the short help registered along with each
+    lazy subcommand, hence without importing any of them.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # subcommand name -> ("module:attribute", short help)
+        self.lazy_subcommands: dict[str, tuple[str, str]] = {}
+
+    def add_lazy_command(self, name: str, import_path: str, short_help: str = ""):
+        self.lazy_subcommands[name] = (import_path, short_help)
+
+    def list_commands(self, ctx) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self.load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def load_command(self, cmd_name: str) -> click.Command:
+        module_name, attribute = self.lazy_subcommands[cmd_name][0].split(":")
+        cmd = getattr(import_module(module_name), attribute)
+        if not isinstance(cmd, click.Command):
+            raise TypeError(f"Lazy subcommand '{cmd_name}' is not a click command")
+        return cmd
+
+    def shell_complete(self, ctx, incomplete):
+        from click.shell_completion import CompletionItem
+
+        results = []
+        for subcommand in self.list_commands(ctx):
+            if not subcommand.startswith(incomplete):
+                continue
+            cmd = self.commands.get(subcommand)
+            if cmd is None:
+                help = self.lazy_subcommands[subcommand][1]
+                results.append(CompletionItem(subcommand, help=help))
+            elif not cmd.hidden:
+                results.append(
+                    CompletionItem(subcommand, help=cmd.get_short_help_str())
+                )
+        # the options of this group, skipping the subcommands of click.Group
+        results.extend(click.Command.shell_complete(self, ctx, incomplete))
+        return results
+
+    def format_commands(self, ctx, formatter) -> None:
+        commands = []
+        for subcommand in self.list_commands(ctx):
+            cmd = self.commands.get(subcommand)
+            if cmd is None:
+                commands.append((subcommand, self.lazy_subcommands[subcommand][1]))
+            elif not cmd.hidden:
+                if getattr(cmd, "alias", None):
+                    subcommand = f"{subcommand} ({','.join(cmd.alias)})"
+                commands.append((subcommand, cmd))
+
+        # allow for 3 times the default spacing
+        if len(commands):
+            limit = formatter.width - 6 - max(len(cmd[0]) for cmd in commands)
+
+            rows = []
+            for subcommand, cmd in commands:
+                if isinstance(cmd, str):
+                    help = click.utils.make_default_short_help(cmd, limit)
+                else:
+                    help = cmd.get_short_help_str(limit)
+                rows.append((subcommand, help))
+
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
 # https://stackoverflow.com/questions/50499340/specify-options-and-arguments-dynamically
 class OptionEatAll(click.Option):
     def __init__(self, *args, **kwargs):
@@ -346,7 +425,13 @@ def parse_extra_container_args(extra_args: list[str]) -> dict[str, Any]:
 
 def parse_match_header(
     ctx, param, match_header_raw: tuple[str]
-) -> list[ExactMatchHeader | PrefixMatchHeader | RegexMatchHeader]:
+) -> list["ExactMatchHeader | PrefixMatchHeader | RegexMatchHeader"]:
+    from gefyra.types.bridge import (
+        ExactMatchHeader,
+        PrefixMatchHeader,
+        RegexMatchHeader,
+    )
+
     res: list[ExactMatchHeader | PrefixMatchHeader | RegexMatchHeader] = []
     for match_header in match_header_raw:
         try:
@@ -366,7 +451,9 @@ def parse_match_header(
 
 def parse_match_path(
     ctx, param, match_path_raw: tuple[str]
-) -> list[ExactMatchPath | PrefixMatchPath | RegexMatchPath]:
+) -> list["ExactMatchPath | PrefixMatchPath | RegexMatchPath"]:
+    from gefyra.types.bridge import ExactMatchPath, PrefixMatchPath, RegexMatchPath
+
     res: list[ExactMatchPath | PrefixMatchPath | RegexMatchPath] = []
     for match_path in match_path_raw:
         if param.name == "match_path_exact":
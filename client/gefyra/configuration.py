@@ -5,6 +5,7 @@ import os
 import socket
 import struct
 import sys
+import threading
 from os import path
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -19,12 +20,99 @@ from gefyra.local import (
 
 if TYPE_CHECKING:
     from docker import DockerClient
+    from kubernetes.client import ApiClient
 
 logger = logging.getLogger("gefyra")
 
 __VERSION__ = "2.5.4"
 USER_HOME = os.path.expanduser("~")
 
+# the API clients are created once, even if concurrent status checks ask for them
+_init_lock = threading.RLock()
+# API clients shared by all ClientConfiguration instances of this process, so that
+# repeated API calls reuse their connections (and TLS sessions)
+_docker_clients: dict[tuple, DockerClient] = {}
+# (kubeconfig path, context) -> (kubeconfig mtime, client)
+_kube_api_clients: dict[tuple[str, str | None], tuple[float, ApiClient]] = {}
+# kubeconfig path -> (kubeconfig mtime, name of the active context)
+_active_kube_contexts: dict[str, tuple[float, str | None]] = {}
+
+
+def _pooled_docker_client() -> DockerClient:
+    import docker
+    from docker.context import ContextAPI
+
+    ctx = ContextAPI.get_context()
+    if ctx.name != "default":
+        endpoint = ctx.endpoints["docker"]["Host"]
+        key: tuple = (ctx.name, endpoint)
+    else:
+        key = (
+            ctx.name,
+            os.environ.get("DOCKER_HOST"),
+            os.environ.get("DOCKER_TLS_VERIFY"),
+            os.environ.get("DOCKER_CERT_PATH"),
+        )
+    with _init_lock:
+        if key not in _docker_clients:
+            if ctx.name != "default":
+                _docker_clients[key] = docker.DockerClient(base_url=endpoint)
+                logger.debug(f"Docker Context: {ctx.name}")
+            else:
+                _docker_clients[key] = docker.from_env()
+        return _docker_clients[key]
+
+
+def _pooled_kube_api_client(kube_config_file: str, context: str | None) -> ApiClient:
+    from kubernetes.client import ApiClient, Configuration
+    from kubernetes.config import load_kube_config
+
+    kube_config_path = path.realpath(path.expanduser(kube_config_file))
+    key = (kube_config_path, context)
+    # a rewritten kubeconfig, e.g. with new credentials, is loaded again
+    mtime = os.stat(kube_config_path).st_mtime
+    with _init_lock:
+        pooled = _kube_api_clients.get(key)
+        if pooled is None or pooled[0] != mtime:
+            client_configuration = Configuration()
+            load_kube_config(
+                kube_config_path,
+                context=context,
+                client_configuration=client_configuration,
+            )
+            pooled = (mtime, ApiClient(configuration=client_configuration))
+            _kube_api_clients[key] = pooled
+        return pooled[1]
+
+
+def _active_kube_context(kube_config_file: str) -> str | None:
+    from kubernetes.config.kube_config import list_kube_config_contexts
+
+    kube_config_path = path.realpath(path.expanduser(kube_config_file))
+    mtime = os.stat(kube_config_path).st_mtime
+    with _init_lock:
+        known = _active_kube_contexts.get(kube_config_path)
+        if known is None or known[0] != mtime:
+            _, active_context = list_kube_config_contexts(config_file=kube_config_path)
+            known = (mtime, active_context.get("name", None))
+            _active_kube_contexts[kube_config_path] = known
+        return known[1]
+
+
+def clear_api_clients() -> None:
+    """
+    Close and forget the pooled API clients of this process, e.g. after the Docker
+    context has been switched
+    """
+    with _init_lock:
+        for docker_client in _docker_clients.values():
+            docker_client.close()
+        for _, api_client in _kube_api_clients.values():
+            api_client.close()
+        _docker_clients.clear()
+        _kube_api_clients.clear()
+        _active_kube_contexts.clear()
+
 
 def fix_pywin32_in_frozen_build() -> None:  # pragma: no cover
     import os
@@ -203,13 +291,9 @@ class ClientConfiguration:
     def KUBE_CONTEXT(self):
         if not self._kube_context:
             from kubernetes.config.config_exception import ConfigException
-            from kubernetes.config.kube_config import list_kube_config_contexts
 
             try:
-                _, active_context = list_kube_config_contexts(
-                    config_file=self.KUBE_CONFIG_FILE
-                )
-                self.KUBE_CONTEXT = active_context.get("name", None)
+                self.KUBE_CONTEXT = _active_kube_context(self.KUBE_CONFIG_FILE)
             except ConfigException:
                 logger.error("Could not read active 'kubeconfig' context.")
                 self.KUBE_CONTEXT = None
@@ -235,16 +319,9 @@ class ClientConfiguration:
 
     def _init_docker(self):
         import docker
-        from docker.context import ContextAPI
 
         try:
-            ctx = ContextAPI.get_context()
-            if ctx.name != "default":
-                endpoint = ctx.endpoints["docker"]["Host"]
-                self.DOCKER = docker.DockerClient(base_url=endpoint)
-                logger.debug(f"Docker Context: {ctx.name}")
-            else:
-                self.DOCKER = docker.from_env()
+            self.DOCKER = _pooled_docker_client()
         except docker.errors.DockerException as de:
             logger.fatal(f"Docker init error: {de}")
             raise RuntimeError("Docker init error. Docker host not running?") from None
@@ -258,15 +335,14 @@ class ClientConfiguration:
             CustomObjectsApi,
             RbacAuthorizationV1Api,
         )
-        from kubernetes.config import load_kube_config
 
-        load_kube_config(self.KUBE_CONFIG_FILE, context=self.KUBE_CONTEXT)
-        self.K8S_CORE_API = CoreV1Api()
-        self.K8S_RBAC_API = RbacAuthorizationV1Api()
-        self.K8S_APP_API = AppsV1Api()
-        self.K8S_CUSTOM_OBJECT_API = CustomObjectsApi()
-        self.K8S_EXTENSION_API = ApiextensionsV1Api()
-        self.K8S_ADMISSION_API = AdmissionregistrationV1Api()
+        api_client = _pooled_kube_api_client(self.KUBE_CONFIG_FILE, self.KUBE_CONTEXT)
+        self.K8S_CORE_API = CoreV1Api(api_client)
+        self.K8S_RBAC_API = RbacAuthorizationV1Api(api_client)
+        self.K8S_APP_API = AppsV1Api(api_client)
+        self.K8S_CUSTOM_OBJECT_API = CustomObjectsApi(api_client)
+        self.K8S_EXTENSION_API = ApiextensionsV1Api(api_client)
+        self.K8S_ADMISSION_API = AdmissionregistrationV1Api(api_client)
 
     def __getattr__(self, item):
         if item in [
@@ -277,15 +353,17 @@ class ClientConfiguration:
             "K8S_EXTENSION_API",
             "K8S_ADMISSION_API",
         ]:
-            try:
-                return self.__getattribute__(item)
-            except AttributeError:
-                self._init_kubeapi()
+            with _init_lock:
+                try:
+                    return self.__getattribute__(item)
+                except AttributeError:
+                    self._init_kubeapi()
         if item == "DOCKER":
-            try:
-                return self.__getattribute__(item)
-            except AttributeError:
-                self._init_docker()
+            with _init_lock:
+                try:
+                    return self.__getattribute__(item)
+                except AttributeError:
+                    self._init_docker()
 
         return self.__getattribute__(item)
 
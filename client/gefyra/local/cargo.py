@@ -1,11 +1,23 @@
+import json
 import logging
+import os
+import time
+from typing import TYPE_CHECKING
 
 from gefyra.configuration import ClientConfiguration
 from gefyra.exceptions import GefyraConnectionError
 from gefyra.types import StowawayConfig
 
+if TYPE_CHECKING:
+    from docker.models.containers import Container
+
 logger = logging.getLogger("gefyra.cargo")
 
+# file in GEFYRA_LOCATION holding the latest health of each connection
+CONNECTION_HEALTH_CACHE = "connection-health.json"
+# seconds the health of a connection is reused instead of probing it again
+CONNECTION_HEALTH_TTL = 10
+
 
 def get_cargo_ip_from_netaddress(network_address: str) -> str:
     return ".".join(network_address.split(".")[:3]) + ".149"
@@ -51,6 +63,55 @@ def determine_wireguard_mtu(config: ClientConfiguration) -> int | None:
     return None
 
 
+def list_cargo_containers(config: ClientConfiguration) -> list["Container"]:
+    from gefyra.local import CARGO_LABEL
+
+    return config.DOCKER.containers.list(
+        all=True, filters={"label": f"{CARGO_LABEL[0]}={CARGO_LABEL[1]}"}
+    )
+
+
+def connection_health_key(cargo_container: "Container") -> str:
+    # a restarted Cargo container gets probed again
+    started_at = cargo_container.attrs.get("State", {}).get("StartedAt", "")
+    return f"{cargo_container.id}@{started_at}"
+
+
+def read_connection_health(config: ClientConfiguration) -> dict[str, dict]:
+    """
+    The cached health of connections probed less than CONNECTION_HEALTH_TTL seconds ago
+    """
+    try:
+        health = json.loads(
+            config.GEFYRA_LOCATION.joinpath(CONNECTION_HEALTH_CACHE).read_text()
+        )
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(health, dict):
+        return {}
+    now = time.time()
+    return {
+        key: entry
+        for key, entry in health.items()
+        if isinstance(entry, dict)
+        and 0 <= now - entry.get("checked", 0) < CONNECTION_HEALTH_TTL
+    }
+
+
+def write_connection_health(
+    config: ClientConfiguration, health: dict[str, dict]
+) -> None:
+    path = config.GEFYRA_LOCATION.joinpath(CONNECTION_HEALTH_CACHE)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(health))
+        # concurrent gefyra commands never read a partially written cache
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write the connection health cache: {e}")
+
+
 def create_wireguard_config(
     params: StowawayConfig, cargo_endpoint: str, mtu: str | None = None
 ) -> str:
@@ -7,6 +7,7 @@ from gefyra.exceptions import (
     GefyraClientNotFound,
     GefyraConnectionError,
 )
+from gefyra.local.utils import wait_for_custom_object
 
 logger = logging.getLogger(__name__)
 
@@ -103,17 +104,13 @@ def handle_delete_gefyraclient(
             version="v1",
         )
         if wait:
-            if not timeout:
-                timeout = 60
-            counter = 0
-            while counter < timeout:
-                try:
-                    handle_get_gefyraclient(config=config, client_id=client_id)
-                except GefyraClientNotFound:
-                    return True
-                time.sleep(1)
-                counter += 1
-            raise TimeoutError
+            wait_for_custom_object(
+                config,
+                "gefyraclients",
+                client_id,
+                lambda obj: obj is None,
+                timeout or 60,
+            )
         return True
     except ApiException as e:
         logger.debug(e)
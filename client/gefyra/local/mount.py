@@ -1,8 +1,8 @@
 import logging
-import time
 
 from gefyra.configuration import ClientConfiguration
 from gefyra.exceptions import GefyraBridgeMountNotFound
+from gefyra.local.utils import wait_for_custom_object
 
 logger = logging.getLogger(__name__)
 
@@ -61,20 +61,9 @@ def handle_delete_gefyramount(
             version="v1",
         )
         if wait:
-            if not timeout:
-                timeout = 60
-            counter = 0
-            while counter < timeout:
-                try:
-                    result = get_gefyrabridgemount(config=config, name=name)
-                    # return early if object is not available anymore
-                    if not result:
-                        return True
-                except (ApiException, GefyraBridgeMountNotFound):
-                    return True
-                time.sleep(1)
-                counter += 1
-            raise TimeoutError
+            wait_for_custom_object(
+                config, "gefyrabridgemounts", name, lambda obj: not obj, timeout or 60
+            )
         return True
     except ApiException as e:
         logger.debug(e)
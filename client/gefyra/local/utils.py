@@ -1,5 +1,6 @@
 import datetime
 import os
+import time
 import uuid
 from collections.abc import Callable
 from typing import TYPE_CHECKING
@@ -193,3 +194,104 @@ class WatchEventsMixin:
                 raise RuntimeError(
                     f"Cannot 'watch' events in namespace '{self._config.NAMESPACE}'"
                 ) from None
+
+
+def wait_for_custom_object(
+    config: ClientConfiguration,
+    plural: str,
+    name: str,
+    condition: Callable[[dict | None], bool],
+    timeout: float | None = 60,
+    poll_interval: float = 1,
+) -> dict | None:
+    """
+    Wait until a Gefyra custom object (e.g. a GefyraClient or GefyraBridgeMount)
+    fulfills condition. The condition receives the object, or None once it does not
+    exist (anymore). Changes are streamed from a watch, hence this returns as soon as
+    the operator has written the object. Only if watching is forbidden, the object
+    is polled.
+    :param plural: the plural of the custom resource, e.g. 'gefyraclients'
+    :param timeout: seconds to wait, None waits without limit
+    :return: the object that fulfills condition, None if it has been deleted
+    :raises TimeoutError: if the condition is not fulfilled within timeout seconds
+    """
+    import kubernetes as k8s
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    custom_object_api = config.K8S_CUSTOM_OBJECT_API
+    kwargs = {
+        "namespace": config.NAMESPACE,
+        "group": "gefyra.dev",
+        "version": "v1",
+        "plural": plural,
+        "field_selector": f"metadata.name={name}",
+    }
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            objects = custom_object_api.list_namespaced_custom_object(**kwargs)
+            obj = next(iter(objects.get("items") or []), None)
+            if condition(obj):
+                return obj
+            resource_version = objects["metadata"]["resourceVersion"]
+            w = k8s.watch.Watch()
+            try:
+                while deadline is None or time.monotonic() < deadline:
+                    remaining = (
+                        deadline - time.monotonic() if deadline is not None else 60
+                    )
+                    for event in w.stream(
+                        custom_object_api.list_namespaced_custom_object,
+                        resource_version=resource_version,
+                        timeout_seconds=max(1, int(remaining)),
+                        _request_timeout=max(1, int(remaining)) + 5,
+                        **kwargs,
+                    ):
+                        obj = None if event["type"] == "DELETED" else event["object"]
+                        if condition(obj):
+                            w.stop()
+                            return obj
+                    resource_version = w.resource_version or resource_version
+            except k8s.client.exceptions.ApiException as e:
+                if e.status != 410:
+                    raise
+                # the watch expired, list again
+                logger.debug(f"Watch of {plural} '{name}' expired, listing again")
+    except k8s.client.exceptions.ApiException as e:
+        if e.status != 403:
+            raise
+        logger.debug(f"Cannot 'watch' {plural}, polling '{name}' instead")
+        return _poll_custom_object(
+            config, plural, name, condition, timeout, poll_interval
+        )
+    raise TimeoutError(f"Timeout waiting for {plural} '{name}'")
+
+
+def _poll_custom_object(
+    config: ClientConfiguration,
+    plural: str,
+    name: str,
+    condition: Callable[[dict | None], bool],
+    timeout: float | None,
+    poll_interval: float,
+) -> dict | None:
+    import kubernetes as k8s
+
+    polls = 0
+    while timeout is None or polls < timeout / poll_interval:
+        try:
+            obj = config.K8S_CUSTOM_OBJECT_API.get_namespaced_custom_object(
+                namespace=config.NAMESPACE,
+                name=name,
+                group="gefyra.dev",
+                plural=plural,
+                version="v1",
+            )
+        except k8s.client.exceptions.ApiException as e:
+            if e.status != 404:
+                raise
+            obj = None
+        if condition(obj):
+            return obj
+        time.sleep(poll_interval)
+        polls += 1
+    raise TimeoutError(f"Timeout waiting for {plural} '{name}'")
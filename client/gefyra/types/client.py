@@ -15,7 +15,11 @@ from gefyra.exceptions import CommandTimeoutError, GefyraConnectionError
 from gefyra.local.clients import handle_get_gefyraclient
 from gefyra.local.minikube import detect_minikube_config
 from gefyra.local.networking import get_or_create_gefyra_network
-from gefyra.local.utils import WatchEventsMixin, handle_docker_get_or_create_container
+from gefyra.local.utils import (
+    WatchEventsMixin,
+    handle_docker_get_or_create_container,
+    wait_for_custom_object,
+)
 from gefyra.types.stowaway import StowawayConfig, StowawayParameter
 
 if TYPE_CHECKING:
@@ -162,16 +166,23 @@ class GefyraClient(WatchEventsMixin):
                 presharedkey=providerconfig.get("Peer.PresharedKey"),
             )
 
-    def wait_for_state(self, desired_state: GefyraClientState, timeout: int = 60):
-        start_time = time.time()
-        while True:
-            if self.state == desired_state:
-                return
-            if time.time() - start_time > timeout:
-                raise CommandTimeoutError(
-                    f"Timeout waiting for client {self.client_id} to reach state {desired_state}"
-                )
-            time.sleep(2)
+    def wait_for_state(
+        self, desired_state: GefyraClientState, timeout: int | None = 60
+    ):
+        try:
+            gclient = wait_for_custom_object(
+                self._config,
+                "gefyraclients",
+                self.client_id,
+                lambda obj: obj is not None and obj.get("state") == desired_state.value,
+                timeout,
+            )
+        except TimeoutError:
+            raise CommandTimeoutError(
+                f"Timeout waiting for client {self.client_id} to reach state {desired_state}"
+            ) from None
+        if gclient is not None:
+            self._init_data(gclient)
 
     @property
     def state(self) -> GefyraClientState:
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark of the per-call overhead of ClientConfiguration's API clients.
+
+"unpooled" drops the pooled API clients before each call, like every call did before
+the clients were shared in a process, "pooled" reuses them.
+
+    python tests/benchmark_api_clients.py [-n 200] [--kubeconfig PATH [--context NAME]]
+
+Without a kubeconfig, a generated one is used and only the client setup is measured.
+With a kubeconfig of a reachable cluster, each call also requests the cluster's
+version, which shows the reuse of connections and TLS sessions.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+from gefyra.configuration import ClientConfiguration, clear_api_clients
+
+KUBECONFIG = {
+    "apiVersion": "v1",
+    "kind": "Config",
+    "current-context": "benchmark",
+    "clusters": [
+        {"name": "benchmark", "cluster": {"server": "https://127.0.0.1:6443"}}
+    ],
+    "users": [{"name": "benchmark", "user": {"token": "benchmark"}}],
+    "contexts": [
+        {
+            "name": "benchmark",
+            "context": {"cluster": "benchmark", "user": "benchmark"},
+        }
+    ],
+}
+
+
+def api_call(kubeconfig: Path, context: str | None, live: bool):
+    from kubernetes.client import VersionApi
+
+    config = ClientConfiguration(
+        kube_config_file=kubeconfig, kube_context=context, ignore_docker=True
+    )
+    api_client = config.K8S_CORE_API.api_client
+    if live:
+        VersionApi(api_client).get_code()
+
+
+def measure(
+    kubeconfig: Path, context: str | None, live: bool, n: int, pooled: bool
+) -> list[float]:
+    timings = []
+    clear_api_clients()
+    for _ in range(n):
+        if not pooled:
+            clear_api_clients()
+        start = time.perf_counter()
+        api_call(kubeconfig, context, live)
+        timings.append(time.perf_counter() - start)
+    clear_api_clients()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=200, help="calls per run")
+    parser.add_argument("--kubeconfig", type=Path, help="kubeconfig of a cluster")
+    parser.add_argument("--context", help="context of the kubeconfig")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kubeconfig = args.kubeconfig
+        if kubeconfig is None:
+            kubeconfig = Path(tmp) / "kubeconfig.yaml"
+            kubeconfig.write_text(yaml.dump(KUBECONFIG))
+        live = args.kubeconfig is not None
+        # warm up the imports
+        measure(kubeconfig, args.context, live, 1, pooled=True)
+        for pooled in (False, True):
+            timings = measure(kubeconfig, args.context, live, args.n, pooled)
+            print(
+                f"{'pooled' if pooled else 'unpooled':>8}: "
+                f"mean {statistics.mean(timings) * 1000:.3f} ms, "
+                f"median {statistics.median(timings) * 1000:.3f} ms "
+                f"per call ({args.n} calls)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from gefyra import configuration
+from gefyra.configuration import ClientConfiguration, clear_api_clients
+
+
+@pytest.fixture
+def kubeconfig(tmp_path):
+    kubeconfig = tmp_path / "kubeconfig.yaml"
+    kubeconfig.write_text(
+        yaml.dump(
+            {
+                "apiVersion": "v1",
+                "kind": "Config",
+                "current-context": "one",
+                "clusters": [
+                    {"name": "one", "cluster": {"server": "https://one:6443"}},
+                    {"name": "two", "cluster": {"server": "https://two:6443"}},
+                ],
+                "users": [{"name": "user", "user": {"token": "some-token"}}],
+                "contexts": [
+                    {"name": "one", "context": {"cluster": "one", "user": "user"}},
+                    {"name": "two", "context": {"cluster": "two", "user": "user"}},
+                ],
+            }
+        )
+    )
+    yield kubeconfig
+    clear_api_clients()
+
+
+def _api_client(kubeconfig, context):
+    config = ClientConfiguration(
+        kube_config_file=kubeconfig, kube_context=context, ignore_docker=True
+    )
+    return config.K8S_CORE_API.api_client
+
+
+def test_kube_api_clients_are_shared(kubeconfig):
+    api_client = _api_client(kubeconfig, "one")
+    assert _api_client(kubeconfig, "one") is api_client
+    assert api_client.configuration.host == "https://one:6443"
+    # all APIs of a configuration use the same connection pool
+    config = ClientConfiguration(
+        kube_config_file=kubeconfig, kube_context="one", ignore_docker=True
+    )
+    assert config.K8S_CUSTOM_OBJECT_API.api_client is api_client
+
+    other = _api_client(kubeconfig, "two")
+    assert other is not api_client
+    assert other.configuration.host == "https://two:6443"
+
+
+def test_rewritten_kubeconfig_is_loaded_again(kubeconfig):
+    api_client = _api_client(kubeconfig, "one")
+    stat = kubeconfig.stat()
+    os.utime(kubeconfig, (stat.st_atime, stat.st_mtime + 1))
+    assert _api_client(kubeconfig, "one") is not api_client
+
+
+def test_docker_clients_are_shared():
+    context = MagicMock()
+    context.name = "default"
+    with (
+        patch("docker.context.ContextAPI.get_context", return_value=context),
+        patch("docker.from_env") as from_env,
+    ):
+        try:
+            docker_client = ClientConfiguration(ignore_docker=True).DOCKER
+            assert ClientConfiguration(ignore_docker=True).DOCKER is docker_client
+            from_env.assert_called_once()
+        finally:
+            clear_api_clients()
+    assert configuration._docker_clients == {}
+
+
+def test_active_context_is_read_once(kubeconfig):
+    with patch(
+        "kubernetes.config.kube_config.list_kube_config_contexts",
+        return_value=([], {"name": "two"}),
+    ) as list_contexts:
+        configs = [
+            ClientConfiguration(kube_config_file=kubeconfig, ignore_docker=True)
+            for _ in range(3)
+        ]
+        assert {config.KUBE_CONTEXT for config in configs} == {"two"}
+    list_contexts.assert_called_once()
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+import time
+
+import click
+
+# seconds a cold 'gefyra --help' may take, in a fresh interpreter
+CLI_STARTUP_BUDGET = 0.5
+
+HELP_IMPORTS = """
+import sys
+from gefyra.cli.main import main
+sys.argv = ["gefyra", "--help"]
+try:
+    main()
+except SystemExit:
+    pass
+print("imported:", ",".join(m for m in ("kubernetes", "docker", "gefyra.api") if m in sys.modules))
+"""
+
+
+def test_lazy_subcommands_are_consistent():
+    from gefyra.cli.main import cli
+
+    for name, (_, short_help) in cli.lazy_subcommands.items():
+        cmd = cli.load_command(name)
+        # the overview of --help shows the short help of the subcommand
+        assert cmd.get_short_help_str(limit=1000) == short_help, name
+
+
+def test_shell_completion_without_imports():
+    from gefyra.cli.main import cli
+
+    ctx = click.Context(cli)
+    completions = cli.shell_complete(ctx, "b")
+    assert [item.value for item in completions] == ["bridge"]
+    assert "bridge" not in cli.commands
+
+
+def test_help_does_not_import_subcommands():
+    result = subprocess.run(
+        [sys.executable, "-c", HELP_IMPORTS],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "Manage GefyraBridgeMounts" in result.stdout
+    assert result.stdout.splitlines()[-1] == "imported: "
+
+
+def test_cold_help_within_budget():
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "gefyra.cli.main", "--help"],
+            capture_output=True,
+            check=True,
+        )
+        durations.append(time.perf_counter() - start)
+    assert min(durations) < CLI_STARTUP_BUDGET, (
+        f"cold 'gefyra --help' took {min(durations):.3f}s, the budget is"
+        f" {CLI_STARTUP_BUDGET}s"
+    )
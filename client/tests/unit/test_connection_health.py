@@ -0,0 +1,87 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from gefyra.api.connect import list_connections
+from gefyra.api.list import list_containers
+from gefyra.local import CONNECTION_NAME_LABEL
+
+
+def _cargo(name, status="running", started_at="2026-01-01T00:00:00Z"):
+    container = MagicMock()
+    container.id = f"id-{name}"
+    container.name = f"gefyra-cargo-{name}"
+    container.status = status
+    container.labels = {CONNECTION_NAME_LABEL: name}
+    container.attrs = {"Created": "now", "State": {"StartedAt": started_at}}
+    return container
+
+
+def _config(tmp_path, containers):
+    config = MagicMock()
+    config.GEFYRA_LOCATION = tmp_path
+    config.DOCKER.containers.list.return_value = containers
+    return config
+
+
+class TestListConnections:
+    def test_probes_run_concurrently_and_are_cached(self, tmp_path):
+        containers = [_cargo(f"conn-{i}") for i in range(4)] + [
+            _cargo("stopped", status="exited")
+        ]
+        config = _config(tmp_path, containers)
+        barrier = threading.Barrier(4, timeout=5)
+
+        def probe(probe_config):
+            # fails unless all four probes are running at the same time
+            barrier.wait()
+
+        with (
+            patch("gefyra.api.connect.ClientConfiguration", return_value=config),
+            patch(
+                "gefyra.api.connect.probe_wireguard_connection", side_effect=probe
+            ) as probe_mock,
+            patch("gefyra.api.connect.determine_wireguard_mtu", return_value=1340),
+        ):
+            connections = list_connections()
+            assert probe_mock.call_count == 4
+            assert [c.status for c in connections] == ["running"] * 4 + ["stopped"]
+            assert {c.mtu for c in connections[:4]} == {1340}
+
+            # the second listing is answered from the cache
+            connections = list_connections()
+            assert probe_mock.call_count == 4
+            assert [c.status for c in connections] == ["running"] * 4 + ["stopped"]
+
+            # a restarted Cargo container is probed again
+            containers[0].attrs["State"]["StartedAt"] = "2026-01-02T00:00:00Z"
+            barrier = threading.Barrier(1)
+            list_connections()
+            assert probe_mock.call_count == 5
+
+    def test_expired_health_is_probed_again(self, tmp_path):
+        config = _config(tmp_path, [_cargo("conn")])
+        with (
+            patch("gefyra.api.connect.ClientConfiguration", return_value=config),
+            patch("gefyra.api.connect.probe_wireguard_connection") as probe_mock,
+            patch("gefyra.api.connect.determine_wireguard_mtu", return_value=None),
+            patch("gefyra.local.cargo.CONNECTION_HEALTH_TTL", 0),
+        ):
+            list_connections()
+            list_connections()
+        assert probe_mock.call_count == 2
+
+
+class TestListContainers:
+    def test_lists_without_probing(self, tmp_path):
+        config = _config(tmp_path, [_cargo("conn-a"), _cargo("conn-b")])
+        with (
+            patch("gefyra.api.list.ClientConfiguration", return_value=config),
+            patch("gefyra.api.connect.probe_wireguard_connection") as probe_mock,
+            patch(
+                "gefyra.local.bridge.get_all_containers", return_value=[]
+            ) as get_all_containers,
+        ):
+            assert list_containers() == [("conn-a", []), ("conn-b", [])]
+            assert list_containers("conn-b") == [("conn-b", [])]
+        probe_mock.assert_not_called()
+        assert get_all_containers.call_count == 3
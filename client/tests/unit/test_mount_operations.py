@@ -62,12 +62,16 @@ class TestHandleDeleteGefyramount:
         """When waiting, returns True once the object 404s."""
         config = MagicMock()
         config.K8S_CUSTOM_OBJECT_API.delete_namespaced_custom_object.return_value = {}
+        # watching is forbidden, the mount is polled instead
+        config.K8S_CUSTOM_OBJECT_API.list_namespaced_custom_object.side_effect = (
+            ApiException(status=403, reason="Forbidden")
+        )
         # First get call succeeds (still exists), second 404s (gone)
         config.K8S_CUSTOM_OBJECT_API.get_namespaced_custom_object.side_effect = [
             {"metadata": {"name": "my-mount"}},
             ApiException(status=404, reason="Not Found"),
         ]
-        with patch("gefyra.local.mount.time.sleep"):
+        with patch("gefyra.local.utils.time.sleep"):
             result = handle_delete_gefyramount(
                 config, "my-mount", force=False, wait=True, timeout=10
             )
@@ -77,11 +81,14 @@ class TestHandleDeleteGefyramount:
         """The timeout parameter controls how many poll iterations occur."""
         config = MagicMock()
         config.K8S_CUSTOM_OBJECT_API.delete_namespaced_custom_object.return_value = {}
+        config.K8S_CUSTOM_OBJECT_API.list_namespaced_custom_object.side_effect = (
+            ApiException(status=403, reason="Forbidden")
+        )
         config.K8S_CUSTOM_OBJECT_API.get_namespaced_custom_object.return_value = {
             "metadata": {"name": "my-mount"}
         }
         with (
-            patch("gefyra.local.mount.time.sleep") as mock_sleep,
+            patch("gefyra.local.utils.time.sleep") as mock_sleep,
             pytest.raises(TimeoutError),
         ):
             handle_delete_gefyramount(
@@ -1,3 +1,4 @@
+import time
 import unittest
 from unittest.mock import MagicMock, Mock, patch
 
@@ -322,6 +323,38 @@ class TestGetClusterStatus(unittest.TestCase):
         self.assertTrue(result.operator)
         self.assertFalse(result.stowaway)
 
+    def test_cluster_status_checks_run_concurrently(self):
+        """Test the cluster checks take as long as the slowest one, not their sum"""
+
+        def slow(result):
+            def _call(*args, **kwargs):
+                time.sleep(0.2)
+                return result
+
+            return _call
+
+        operator_deploy = Mock()
+        operator_deploy.status.ready_replicas = 1
+        operator_deploy.spec.template.spec.containers = [
+            Mock(image="gefyra/operator:1.0.0")
+        ]
+        stowaway_pod = Mock()
+        stowaway_pod.status.container_statuses = [Mock(ready=True)]
+        stowaway_pod.spec.containers = [Mock(image="gefyra/stowaway:1.0.0")]
+        self.config.K8S_CORE_API.get_api_resources.side_effect = slow(Mock())
+        self.config.K8S_CORE_API.read_namespace.side_effect = slow(Mock())
+        self.config.K8S_APP_API.read_namespaced_deployment.side_effect = slow(
+            operator_deploy
+        )
+        self.config.K8S_CORE_API.read_namespaced_pod.side_effect = slow(stowaway_pod)
+
+        start = time.perf_counter()
+        result = _get_cluster_status(self.config)
+
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertTrue(result.operator)
+        self.assertTrue(result.stowaway)
+
 
 class TestStatus(unittest.TestCase):
     """Tests for status function"""
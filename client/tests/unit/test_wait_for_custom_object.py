@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from gefyra.local.utils import wait_for_custom_object
+from kubernetes.client import ApiException
+
+
+def _mount(state, uid="uid-1"):
+    return {"metadata": {"name": "my-mount", "uid": uid}, "state": state}
+
+
+def _is_active(obj):
+    return bool(obj) and obj["state"] == "ACTIVE"
+
+
+class TestWaitForCustomObject:
+    def test_returns_right_away_when_fulfilled(self):
+        config = MagicMock()
+        config.K8S_CUSTOM_OBJECT_API.list_namespaced_custom_object.return_value = {
+            "items": [_mount("ACTIVE")],
+            "metadata": {"resourceVersion": "1"},
+        }
+        with patch("kubernetes.watch.Watch") as watch:
+            obj = wait_for_custom_object(
+                config, "gefyrabridgemounts", "my-mount", _is_active
+            )
+        assert obj == _mount("ACTIVE")
+        watch.assert_not_called()
+
+    def test_returns_on_watch_event(self):
+        config = MagicMock()
+        config.K8S_CUSTOM_OBJECT_API.list_namespaced_custom_object.return_value = {
+            "items": [_mount("INSTALLING")],
+            "metadata": {"resourceVersion": "1"},
+        }
+        with patch("kubernetes.watch.Watch") as watch:
+            watch.return_value.stream.return_value = iter(
+                [
+                    {"type": "MODIFIED", "object": _mount("INSTALLING")},
+                    {"type": "MODIFIED", "object": _mount("ACTIVE")},
+                    {"type": "MODIFIED", "object": _mount("TERMINATING")},
+                ]
+            )
+            obj = wait_for_custom_object(
+                config, "gefyrabridgemounts", "my-mount", _is_active
+            )
+        assert obj == _mount("ACTIVE")
+        _, kwargs = watch.return_value.stream.call_args
+        assert kwargs["resource_version"] == "1"
+        assert kwargs["field_selector"] == "metadata.name=my-mount"
+        # no polling
+        config.K8S_CUSTOM_OBJECT_API.get_namespaced_custom_object.assert_not_called()
+
+    def test_deletion(self):
+        config = MagicMock()
+        config.K8S_CUSTOM_OBJECT_API.list_namespaced_custom_object.return_value = {
+            "items": [_mount("TERMINATING")],
+            "metadata": {"resourceVersion": "1"},
+        }
+        with patch("kubernetes.watch.Watch") as watch:
+            watch.return_value.stream.return_value = iter(
+                [{"type": "DELETED", "object": _mount("TERMINATING")}]
+            )
+            obj = wait_for_custom_object(
+                config, "gefyrabridgemounts", "my-mount", lambda obj: obj is None
+            )
+        assert obj is None
+
+    def test_polls_when_watch_is_forbidden(self):
+        config = MagicMock()
+        config.K8S_CUSTOM_OBJECT_API.list_namespaced_custom_object.side_effect = (
+            ApiException(status=403, reason="Forbidden")
+        )
+        config.K8S_CUSTOM_OBJECT_API.get_namespaced_custom_object.side_effect = [
+            _mount("INSTALLING"),
+            _mount("ACTIVE"),
+        ]
+        with patch("gefyra.local.utils.time.sleep") as sleep:
+            obj = wait_for_custom_object(
+                config, "gefyrabridgemounts", "my-mount", _is_active
+            )
+        assert obj == _mount("ACTIVE")
+        assert sleep.call_count == 1
+
+    def test_timeout(self):
+        config = MagicMock()
+        config.K8S_CUSTOM_OBJECT_API.list_namespaced_custom_object.return_value = {
+            "items": [_mount("INSTALLING")],
+            "metadata": {"resourceVersion": "1"},
+        }
+        with patch("kubernetes.watch.Watch") as watch:
+            watch.return_value.stream.side_effect = lambda *args, **kwargs: iter([])
+            with pytest.raises(TimeoutError):
+                wait_for_custom_object(
+                    config, "gefyrabridgemounts", "my-mount", _is_active, timeout=0.2
+                )
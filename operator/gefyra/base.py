@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import Any, Dict, Optional
 import uuid
 from gefyra.configuration import OperatorConfiguration
@@ -11,19 +12,25 @@ from gefyra.connection.factory import (
     connection_provider_factory,
 )
 
+from gefyra.metrics import transition_duration
 from gefyra.resources.events import _get_now
 
+# shared by all state objects and machines, their requests reuse the pooled connections
+custom_api = k8s.client.CustomObjectsApi()
+events_api = k8s.client.EventsV1Api()
+
 
 class GefyraStateObject:
     plural: str
 
     def __init__(self, data: dict):
         self._state = None
+        self._unwritten_state = None
         self.data = data
         self.name = data["metadata"]["name"]
         self.namespace = data["metadata"]["namespace"]
 
-        self.custom_api = k8s.client.CustomObjectsApi()
+        self.custom_api = custom_api
 
     def __repr__(self):
         return f"{self.__class__.__name__}: {self.name} (state={self.state})"
@@ -42,7 +49,14 @@ class GefyraStateObject:
         if value.lower() in ["terminating", "terminated"]:
             pass
         else:
-            self._write_state(value)
+            # the state machine sets the state synchronously, it is written
+            # by flush_state() without blocking the event loop
+            self._unwritten_state = value
+
+    async def flush_state(self) -> None:
+        if self._unwritten_state is not None:
+            state, self._unwritten_state = self._unwritten_state, None
+            await asyncio.to_thread(self._write_state, state)
 
     def _write_state(self, state: State):
         self.custom_api.patch_namespaced_custom_object(
@@ -99,6 +113,22 @@ class StateControllerMixin:
         )
         return provider
 
+    async def on_enter_state(self) -> None:
+        # persist the state entered by a transition or the initial activation
+        await self.model.flush_state()
+
+    def before_transition(self) -> None:
+        self._transition_started = time.perf_counter()
+
+    async def after_transition(self, event: str) -> None:
+        # self transitions do not enter a state
+        await self.model.flush_state()
+        started = getattr(self, "_transition_started", None)
+        if started is not None:
+            transition_duration.observe(
+                time.perf_counter() - started, kind=self.kind, transition=str(event)
+            )
+
     def completed_transition(self, target: State) -> Optional[str]:
         """
         Read the stateTransitions attribute, return the value of the
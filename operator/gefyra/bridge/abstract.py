@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
 
 
 class AbstractGefyraBridgeProvider(ABC):
@@ -68,6 +68,14 @@ class AbstractGefyraBridgeProvider(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def proxy_routes(self) -> Set[Tuple[int, str, str]]:
+        """
+        Returns all proxy routes of this bridge provider as (container port,
+        destination "host:port", bridge name), e.g. to check many bridges at once
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def validate(self, bridge_request: dict, hints: dict | None):
         """
@@ -1,10 +1,12 @@
-from typing import Any, Callable, Dict, Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from kopf import TemporaryError
 import kopf
 import kubernetes as k8s
-from kubernetes.client import ApiException, V1PodList, V1Pod
+from kubernetes.client import ApiException, V1PodList, V1Pod, V1Service
 import asyncio
 
+from gefyra import cache
 from gefyra.bridge.abstract import AbstractGefyraBridgeProvider
 from gefyra.configuration import OperatorConfiguration
 
@@ -12,6 +14,9 @@ from gefyra.bridge.carrier2.config import (
     Carrier2Config,
     Carrier2Proxy,
     CarrierProbe,
+    committed_configs,
+    list_bridges_for_mount,
+    rendered_configs,
 )
 from gefyra.bridge_mount.utils import (
     _get_tls_from_provider_parameters,
@@ -21,6 +26,7 @@ from gefyra.bridge_mount.utils import (
     get_upstreams_for_svc,
 )
 from gefyra.bridge.carrier2.utils import read_carrier2_config
+from gefyra.utils import wait_until_condition
 
 
 app_api = k8s.client.AppsV1Api()
@@ -130,16 +136,7 @@ class Carrier2(AbstractGefyraBridgeProvider):
             raise RuntimeError(
                 "Not able to configure Carrier in Pods. See error above."
             )
-        pods = await self.pods
-        pod_updates = []
-        for _, pod in enumerate(pods.items):
-            # await self.post_event(
-            #     "Updating routing rules",
-            #     f"Now updating routing rules in Pod {pod.metadata.name} ({idx + 1} of {len(pods.items)} Pod(s))",
-            #     "Normal",
-            # )
-            pod_updates.append(self.update_carrier_config_add(pod))
-        await asyncio.gather(*pod_updates)
+        await self.update_carrier_configs(self.bridge_name, None)
         self.updated = True
 
         # 1. Call self.ready() (retry)
@@ -150,15 +147,19 @@ class Carrier2(AbstractGefyraBridgeProvider):
         # 5. Compare constructed config with actual config, return result
 
     async def _cluster_upstream(
-        self, proxy: Carrier2Proxy, rport: int
+        self, proxy: Carrier2Proxy, rport: int, svc: Optional[V1Service] = None
     ) -> Carrier2Proxy:
-        svc = await asyncio.to_thread(
+        if svc is None:
+            svc = await self._gefyra_svc()
+        proxy.clusterUpstream = get_upstreams_for_svc(svc=svc, rport=rport)
+        return proxy
+
+    async def _gefyra_svc(self) -> V1Service:
+        return await asyncio.to_thread(
             core_v1_api.read_namespaced_service,
             name=self.bridge_mount.gefyra_svc_name(),
             namespace=self.namespace,
         )
-        proxy.clusterUpstream = get_upstreams_for_svc(svc=svc, rport=rport)
-        return proxy
 
     async def _tls(self, proxy: Carrier2Proxy, rport: int) -> Carrier2Proxy:
         _parameter = await self._get_bridge_mount_provider_parameter()
@@ -207,50 +208,115 @@ class Carrier2(AbstractGefyraBridgeProvider):
                     )
         return config
 
-    async def _set_proxies(self, config: Carrier2Config, pod: V1Pod) -> Carrier2Config:
+    async def _set_proxies(
+        self, config: Carrier2Config, pod: V1Pod, svc: Optional[V1Service] = None
+    ) -> Carrier2Config:
         proxies = []
         for container in pod.spec.containers:
             if container.name == self.container:
-                for cport in container.ports:
+                # the shadow service serves all ports
+                if svc is None and container.ports:
+                    svc = await self._gefyra_svc()
+                for cport in container.ports or []:
                     proxy = Carrier2Proxy(port=cport.container_port)
                     proxy = await self._cluster_upstream(
-                        proxy=proxy, rport=cport.container_port
+                        proxy=proxy, rport=cport.container_port, svc=svc
                     )
                     proxy = await self._tls(proxy=proxy, rport=cport.container_port)
                     proxies.append(proxy)
         config.proxy = proxies
         return config
 
-    async def update_carrier_config_add(self, pod: V1Pod):
-        carrier_config = await self._base_carrier_config(pod)
-        await carrier_config.add_bridge_rules_for_mount(
-            self.bridge_mount_name, self.configuration.NAMESPACE, self.bridge_name, None
+    async def update_carrier_configs(
+        self, current_bridge_add: str | None, current_bridge_rm: str | None
+    ):
+        """
+        Commit the config with all GefyraBridges of the GefyraBridgeMount to its pods,
+        it is rendered once for all pods sharing a spec
+        """
+        pods = await self.pods
+        bridges = await list_bridges_for_mount(
+            self.bridge_mount_name, self.configuration.NAMESPACE, current_bridge_add
         )
-        await carrier_config.commit(
-            logger=self.logger,
-            pod_name=pod.metadata.name,
-            container_name=self.container,
-            namespace=self.namespace,
-            debug=self.configuration.CARRIER2_DEBUG,
+        # the shadow service is read once for all pods
+        svc = (
+            await self._gefyra_svc()
+            if any(
+                container.name == self.container and container.ports
+                for pod in pods.items
+                for container in pod.spec.containers
+            )
+            else None
         )
+        pod_updates = []
+        for pod in pods.items:
+            carrier_config = await self._render_carrier_config(
+                pod, bridges, current_bridge_add, current_bridge_rm, svc
+            )
+            pod_updates.append(
+                carrier_config.commit(
+                    logger=self.logger,
+                    pod_name=pod.metadata.name,
+                    container_name=self.container,
+                    namespace=self.namespace,
+                    debug=self.configuration.CARRIER2_DEBUG,
+                    bridge_mount=self.bridge_mount_name,
+                )
+            )
+        await asyncio.gather(*pod_updates)
 
-    async def update_carrier_config_remove(self, pod: V1Pod):
-        carrier_config = await self._base_carrier_config(pod)
-        await carrier_config.add_bridge_rules_for_mount(
-            self.bridge_mount_name, self.configuration.NAMESPACE, None, self.bridge_name
-        )
-        await carrier_config.commit(
-            logger=self.logger,
-            pod_name=pod.metadata.name,
-            container_name=self.container,
-            namespace=self.namespace,
-            debug=self.configuration.CARRIER2_DEBUG,
+    async def _render_carrier_config(
+        self,
+        pod: V1Pod,
+        bridges: List[dict],
+        current_bridge_add: str | None,
+        current_bridge_rm: str | None,
+        svc: Optional[V1Service] = None,
+    ) -> Carrier2Config:
+        bridge_mount = await self._get_bridge_mount_resource()
+        key = (
+            self.bridge_mount_name,
+            bridge_mount["metadata"].get("resourceVersion"),
+            svc.metadata.resource_version if svc is not None else None,
+            tuple(
+                sorted(
+                    (b["metadata"]["name"], b["metadata"].get("resourceVersion"))
+                    for b in bridges
+                )
+            ),
+            self._pod_spec_key(pod),
+            current_bridge_add,
+            current_bridge_rm,
         )
+        carrier_config = rendered_configs.get(key)
+        if carrier_config is None:
+            carrier_config = await self._base_carrier_config(pod, svc)
+            carrier_config.add_bridge_rules(
+                bridges, current_bridge_add, current_bridge_rm
+            )
+            rendered_configs.set(key, carrier_config)
+        return carrier_config
 
-    async def _base_carrier_config(self, pod):
+    def _pod_spec_key(self, pod: V1Pod) -> Tuple:
+        """
+        The parts of the pod spec the Carrier2 config is rendered from
+        """
+        for container in pod.spec.containers:
+            if container.name == self.container:
+                return (
+                    tuple(cport.container_port for cport in container.ports or []),
+                    tuple(
+                        (probe.http_get.port, probe.http_get.scheme)
+                        for probe in get_all_probes(container)
+                        if probe and probe.http_get
+                    ),
+                )
+        return ()
+
+    async def _base_carrier_config(self, pod, svc: Optional[V1Service] = None):
         carrier_config = Carrier2Config()
         # order of these calls is important
-        carrier_config = await self._set_proxies(carrier_config, pod)
+        carrier_config = await self._set_proxies(carrier_config, pod, svc)
         carrier_config = await self._set_probes(carrier_config, pod)
         return carrier_config
 
@@ -294,11 +360,13 @@ class Carrier2(AbstractGefyraBridgeProvider):
             if not label_selector:
                 # TODO better exception typing here
                 raise Exception(f"No label selector set for {workload_type} - {name}.")
-            pods = await asyncio.to_thread(
-                core_v1_api.list_namespaced_pod,
-                namespace=namespace,
-                label_selector=label_selector,
-            )
+            pods = cache.cached_pods(namespace, v1_label_selector)
+            if pods is None:
+                pods = await asyncio.to_thread(
+                    core_v1_api.list_namespaced_pod,
+                    namespace=namespace,
+                    label_selector=label_selector,
+                )
             setattr(
                 self,
                 f"_get_pods_workload_cache_{name}-{namespace}-{workload_type}",
@@ -310,10 +378,17 @@ class Carrier2(AbstractGefyraBridgeProvider):
 
     async def _get_bridge_mount_resource(self) -> dict:
         """
-        Get the bridge mount resource
+        Get the bridge mount resource, the current one if GefyraBridgeMounts are watched
         """
+        bridge_mount = None
+        if cache.bridge_mounts.synced.is_set():
+            bridge_mount = cache.bridge_mounts.get(
+                self.configuration.NAMESPACE, self.bridge_mount_name
+            )
         # a simple cache
-        if not hasattr(self, "_get_bridge_mount_resource_cache"):
+        if bridge_mount is None and not hasattr(
+            self, "_get_bridge_mount_resource_cache"
+        ):
             bridge_mount = await asyncio.to_thread(
                 custom_object_api.get_namespaced_custom_object,
                 "gefyra.dev",
@@ -322,6 +397,7 @@ class Carrier2(AbstractGefyraBridgeProvider):
                 "gefyrabridgemounts",
                 self.bridge_mount_name,
             )
+        if bridge_mount is not None:
             self.namespace = bridge_mount["targetNamespace"]
             self.container = bridge_mount["targetContainer"]
             self.target = bridge_mount["target"]
@@ -374,18 +450,29 @@ class Carrier2(AbstractGefyraBridgeProvider):
 
     async def _pod_running(self, pod: V1Pod):
         timeout = self.configuration.CARRIER_RUNNING_TIMEOUT
-        waiting_pod = await core_v1_api.read_namespaced_pod(
-            name=pod.metadata.name, namespace=self.namespace
-        )
         # wait for pod to be ready
-        while not await self._pod_is_running(waiting_pod) and timeout > 0:
-            await asyncio.sleep(1)  # Changed sleep to asyncio.sleep
-            timeout -= 1
-            waiting_pod = await core_v1_api.read_namespaced_pod(
-                name=pod.metadata.name, namespace=self.namespace
-            )
-        if timeout == 0:
-            raise RuntimeError(f"Pod {pod.metadata.name} did not become ready in time")
+        try:
+            if (
+                await cache.wait_for_pod(
+                    self.namespace, pod.metadata.name, self._pod_is_running, timeout
+                )
+                is None
+            ):
+                await asyncio.to_thread(
+                    wait_until_condition,
+                    partial(
+                        core_v1_api.read_namespaced_pod,
+                        name=pod.metadata.name,
+                        namespace=self.namespace,
+                    ),
+                    self._pod_is_running,
+                    timeout=timeout,
+                    backoff=1,
+                )
+        except RuntimeError:
+            raise RuntimeError(
+                f"Pod {pod.metadata.name} did not become ready in time"
+            ) from None
         self.logger.debug(f"Pod {pod.metadata.name} is ready")
 
     async def remove_proxy_route(
@@ -400,11 +487,44 @@ class Carrier2(AbstractGefyraBridgeProvider):
             raise RuntimeError(
                 "Not able to configure Carrier in Pods. See error above."
             )
-        pods = await self.pods
-        pod_updates = []
-        for pod in pods.items:
-            pod_updates.append(self.update_carrier_config_remove(pod))
-        await asyncio.gather(*pod_updates)
+        await self.update_carrier_configs(None, self.bridge_name)
+
+    async def proxy_routes(self) -> Set[Tuple[int, str, str]]:
+        """
+        Returns all proxy routes of the running Carrier2 config with a single read
+        """
+        pod_config = await self._current_config()
+        if pod_config is None:
+            return set()
+        return {
+            (proxy.port, bridge.endpoint, name)
+            for proxy in pod_config.proxy
+            for name, bridge in proxy.bridges.items()
+        }
+
+    async def _current_config(self) -> Optional[Carrier2Config]:
+        """
+        The config of the first Carrier2 Pod, None if there is no Pod (anymore)
+        """
+        try:
+            pods = await self.pods
+            pod: V1Pod = pods.items[0]
+        except Exception as e:
+            # if the deployment, pod, etc. does not exist anymore
+            self.logger.error(e)
+            return None
+        # a config committed by this operator does not need to be read back
+        pod_config = committed_configs.get(pod, self.container)
+        if pod_config is None:
+            config_str_list = await asyncio.to_thread(
+                read_carrier2_config,
+                self.logger,
+                pod.metadata.name,
+                pod.metadata.namespace,
+            )
+            config_str = "\n".join(config_str_list)
+            pod_config = Carrier2Config.from_string(config_str)
+        return pod_config
 
     async def proxy_route_exists(
         self,
@@ -420,21 +540,9 @@ class Carrier2(AbstractGefyraBridgeProvider):
         # 1. Call self.ready() (retry)
         # 2. Retrive actual config to running Carrier2 instance, raise TemporaryError on error (retry)
         # 3. Check this brige (client-id) is in the config, return the result
-        try:
-            pods = await self.pods
-            pod: V1Pod = pods.items[0]
-        except Exception as e:
-            # if the deployment, pod, etc. does not exist anymore
-            self.logger.error(e)
+        pod_config = await self._current_config()
+        if pod_config is None:
             return False
-        config_str_list = await asyncio.to_thread(
-            read_carrier2_config,
-            self.logger,
-            pod.metadata.name,
-            pod.metadata.namespace,
-        )
-        config_str = "\n".join(config_str_list)
-        pod_config = Carrier2Config.from_string(config_str)
         if not any([bool(proxy.bridges) for proxy in pod_config.proxy]):
             return False
 
@@ -490,17 +598,21 @@ class Carrier2(AbstractGefyraBridgeProvider):
             ) from None
 
         try:
-            bridges = await asyncio.to_thread(
-                custom_object_api.list_namespaced_custom_object,
-                group="gefyra.dev",
-                version="v1",
-                plural="gefyrabridges",
-                namespace=self.configuration.NAMESPACE,
-            )
+            bridges = cache.cached_bridges(self.configuration.NAMESPACE)
+            if bridges is None:
+                bridges = (
+                    await asyncio.to_thread(
+                        custom_object_api.list_namespaced_custom_object,
+                        group="gefyra.dev",
+                        version="v1",
+                        plural="gefyrabridges",
+                        namespace=self.configuration.NAMESPACE,
+                    )
+                ).get("items")
         except Exception as e:
             raise kopf.AdmissionError(f"Cannot read GefyraBridges: {e}")
 
-        for existing_bridge in bridges.get("items"):
+        for existing_bridge in bridges:
             if (
                 existing_bridge["target"] == bridge_request["target"]
                 and existing_bridge["metadata"]["labels"]
@@ -1,10 +1,12 @@
 import asyncio
+from collections import OrderedDict
 from enum import StrEnum
 from functools import partial
+import hashlib
 import logging
 import yaml
 
-from typing import List, Optional
+from typing import Hashable, List, Optional, Tuple
 from pydantic import ConfigDict, Field, BaseModel
 
 import kubernetes as k8s
@@ -12,6 +14,10 @@ import kubernetes as k8s
 from gefyra.bridge.carrier2.utils import (
     stream_exec_retries,
 )
+from gefyra import cache
+from gefyra.bridge.carrier2.delivery import config_store, source_commands
+from gefyra.configuration import configuration
+from gefyra.metrics import timed
 from gefyra.utils import wait_until_condition
 from gefyra.bridge.carrier2.const import RELOAD_CARRIER2_DEBUG, RELOAD_CARRIER2_INFO
 from gefyra.bridge.exceptions import BridgeInstallException
@@ -20,6 +26,99 @@ from gefyra.bridge.exceptions import BridgeInstallException
 logger = logging.getLogger(__name__)
 
 ERROR_LOG_PATH = "/tmp/carrier.log"
+COMMITTED_CONFIGS_MAX_SIZE = 4096
+RENDERED_CONFIGS_MAX_SIZE = 256
+
+
+core_v1_api = k8s.client.CoreV1Api()
+custom_object_api = k8s.client.CustomObjectsApi()
+
+
+class CommittedConfigs:
+    """
+    The Carrier2 configs committed by this operator, keyed by pod UID, container
+    and the container's restart count (a restarted container lost its config).
+    Commits of an unchanged config and read-backs of a known config are skipped.
+    """
+
+    def __init__(self, max_size: int = COMMITTED_CONFIGS_MAX_SIZE):
+        self.max_size = max_size
+        self._configs: OrderedDict[Tuple[str, str, int], Tuple[str, str]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def key(
+        pod: k8s.client.V1Pod, container_name: str
+    ) -> Optional[Tuple[str, str, int]]:
+        if not pod.metadata or not pod.metadata.uid:
+            return None
+        restart_count = next(
+            (
+                status.restart_count
+                for status in (pod.status and pod.status.container_statuses) or []
+                if status.name == container_name
+            ),
+            0,
+        )
+        return pod.metadata.uid, container_name, restart_count
+
+    def get_hash(self, pod: k8s.client.V1Pod, container_name: str) -> Optional[str]:
+        key = self.key(pod, container_name)
+        if key is None or key not in self._configs:
+            return None
+        return self._configs[key][0]
+
+    def get(
+        self, pod: k8s.client.V1Pod, container_name: str
+    ) -> Optional["Carrier2Config"]:
+        key = self.key(pod, container_name)
+        if key is None or key not in self._configs:
+            return None
+        self._configs.move_to_end(key)
+        return Carrier2Config.from_string(self._configs[key][1])
+
+    def set(self, pod: k8s.client.V1Pod, container_name: str, config_str: str):
+        key = self.key(pod, container_name)
+        if key is None:
+            return
+        self._configs[key] = (_hash_config(config_str), config_str)
+        self._configs.move_to_end(key)
+        while len(self._configs) > self.max_size:
+            self._configs.popitem(last=False)
+
+    def discard(self, pod: k8s.client.V1Pod, container_name: str):
+        key = self.key(pod, container_name)
+        if key is not None:
+            self._configs.pop(key, None)
+
+
+class RenderedConfigs:
+    """
+    The Carrier2 configs rendered for a GefyraBridgeMount, keyed by the resourceVersions
+    of the mount and its GefyraBridges, the spec of the pods and the bridge being added
+    or removed. All pods of a workload share one rendered config, it is not modified.
+    """
+
+    def __init__(self, max_size: int = RENDERED_CONFIGS_MAX_SIZE):
+        self.max_size = max_size
+        self._configs: OrderedDict[Hashable, "Carrier2Config"] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional["Carrier2Config"]:
+        if key not in self._configs:
+            return None
+        self._configs.move_to_end(key)
+        return self._configs[key]
+
+    def set(self, key: Hashable, config: "Carrier2Config"):
+        self._configs[key] = config
+        self._configs.move_to_end(key)
+        while len(self._configs) > self.max_size:
+            self._configs.popitem(last=False)
+
+
+def _hash_config(config_str: str) -> str:
+    return hashlib.sha256(config_str.encode()).hexdigest()
 
 
 class CarrierMatchType(StrEnum):
@@ -105,6 +204,10 @@ class Carrier2Config(BaseModel):
             self.model_dump(by_alias=True, exclude_none=True), sort_keys=False
         )
 
+    def config_hash(self) -> str:
+        return _hash_config(self.model_dump_yaml())
+
+    @timed("carrier2_config_commit")
     async def commit(
         self,
         logger,
@@ -112,16 +215,18 @@ class Carrier2Config(BaseModel):
         container_name: str,
         namespace: str,
         debug: bool = False,
+        force: bool = False,
+        bridge_mount: Optional[str] = None,
     ):
-        core_v1 = k8s.client.CoreV1Api()
-        read_func = partial(core_v1.read_namespaced_pod_status, pod_name, namespace)
-
-        # busy wait for pod to get ready, raises RuntimeError on timeout
-        # TODO raise TemporaryError to handle longer pulls via async
-        await asyncio.to_thread(
-            wait_until_condition,
-            read_func,
-            lambda s: all(
+        """
+        Write this config to the Carrier2 container and reload Carrier2
+        :param force: reload even if this config is known to be active already
+        :param bridge_mount: the GefyraBridgeMount of the pod, required to deliver the
+            config through the operator (see gefyra.bridge.carrier2.delivery)
+        """
+
+        def _containers_started(s):
+            return all(
                 [
                     bool(
                         container.state
@@ -130,22 +235,60 @@ class Carrier2Config(BaseModel):
                     )
                     for container in s.status.container_statuses
                 ]
-            ),
-            timeout=120,
-            backoff=2,
+            )
+
+        # wait for the pod to get ready, raises RuntimeError on timeout
+        # TODO raise TemporaryError to handle longer pulls via async
+        pod = await cache.wait_for_pod(
+            namespace, pod_name, _containers_started, timeout=120
         )
+        if pod is None:
+            # busy wait without the pod watch
+            read_func = partial(
+                core_v1_api.read_namespaced_pod_status, pod_name, namespace
+            )
+            pod = await asyncio.to_thread(
+                wait_until_condition,
+                read_func,
+                _containers_started,
+                timeout=120,
+                backoff=2,
+            )
 
         config_str = self.model_dump_yaml()
+        config_hash = _hash_config(config_str)
+        if not force and committed_configs.get_hash(pod, container_name) == config_hash:
+            logger.info(
+                f"Carrier2 config of Pod {pod_name} is unchanged, skipping commit"
+            )
+            return
 
+        # the config in the container is unknown until the commit succeeded
+        committed_configs.discard(pod, container_name)
+        deliver = (
+            bridge_mount is not None
+            and configuration.CARRIER2_CONFIG_DELIVERY == "configmap"
+        )
+        if deliver:
+            await config_store.publish(bridge_mount, config_str, config_hash)
+            if not force and config_store.loaded(bridge_mount, pod_name) is not None:
+                # the container fetches the config and reloads by itself
+                await config_store.wait_for(bridge_mount, pod_name, config_hash)
+                committed_configs.set(pod, container_name, config_str)
+                return
+
+        # the heredoc adds the final newline, the file equals the delivered config
+        config_body = config_str.rstrip("\n")
         config_commands = [
             # 1. write new config
-            f"cat <<'EOF' > /tmp/config.yaml\n{config_str}",
+            f"cat <<'EOF' > /tmp/config.yaml\n{config_body}",
             "EOF",
-            # 2. graceful upgrade of the process
-            RELOAD_CARRIER2_DEBUG if debug else RELOAD_CARRIER2_INFO,
-            # 3. read current log
-            f"cat {ERROR_LOG_PATH}",
         ]
+        if deliver:
+            # let the container poll its config from now on
+            config_commands.extend(source_commands(bridge_mount, pod_name, debug))
+        # 2. graceful upgrade of the process
+        config_commands.append(RELOAD_CARRIER2_DEBUG if debug else RELOAD_CARRIER2_INFO)
 
         def _check_carrier2_output(s):
             return (
@@ -154,7 +297,8 @@ class Carrier2Config(BaseModel):
                 and "thread 'main' panicked" not in s
             )
 
-        read_func = partial(
+        # the commands are sent through the pooled exec session of this container
+        await asyncio.to_thread(
             stream_exec_retries,
             logger,
             pod_name,
@@ -162,17 +306,26 @@ class Carrier2Config(BaseModel):
             container_name,
             config_commands,
             10,
-            _check_carrier2_output,
         )
-
+        # 3. read the current log until the new process reports its start
+        read_func = partial(
+            stream_exec_retries,
+            logger,
+            pod_name,
+            namespace,
+            container_name,
+            [f"cat {ERROR_LOG_PATH}"],
+            10,
+        )
         # TODO raise TemporaryError to handle longer Carrier2 pulls via async
         await asyncio.to_thread(
             wait_until_condition,
             read_func,
             _check_carrier2_output,
             timeout=30,
-            backoff=2,
+            backoff=0.2,
         )
+        committed_configs.set(pod, container_name, config_str)
 
     @classmethod
     def from_string(cls, content_str: str):
@@ -185,19 +338,21 @@ class Carrier2Config(BaseModel):
         current_bridge_add: str | None,
         current_bridge_rm: str | None,
     ) -> "Carrier2Config":
-        custom_object_api = k8s.client.CustomObjectsApi()
-        bridges = await asyncio.to_thread(
-            custom_object_api.list_namespaced_custom_object,
-            "gefyra.dev",
-            "v1",
-            namespace,
-            "gefyrabridges",
-            label_selector=f"gefyra.dev/bridge-mount={bridge_mount_name}",
+        items = await list_bridges_for_mount(
+            bridge_mount_name, namespace, current_bridge_add
         )
         logger.debug(f"gefyra.dev/bridge-mount={bridge_mount_name}")
-        logger.debug(f"BRIDGES {bridges}")
+        return self.add_bridge_rules(items, current_bridge_add, current_bridge_rm)
+
+    def add_bridge_rules(
+        self,
+        items: List[dict],
+        current_bridge_add: str | None,
+        current_bridge_rm: str | None,
+    ) -> "Carrier2Config":
+        logger.debug(f"BRIDGES {items}")
 
-        for bridge in bridges["items"]:
+        for bridge in items:
             logger.debug(f"BRIDGE State {bridge['state']}")
             bridge_name = bridge["metadata"]["name"]
             if bridge_name == current_bridge_rm:
@@ -253,3 +408,46 @@ class Carrier2Config(BaseModel):
             if "match" in rule:
                 rules.append(CarrierRule(**rule))
         return rules
+
+
+async def list_bridges_for_mount(
+    bridge_mount_name: str, namespace: str, current_bridge_add: str | None = None
+) -> List[dict]:
+    """
+    The GefyraBridges of that GefyraBridgeMount, the bridge being added is read from
+    the API
+    """
+    items = cache.cached_bridges(namespace, bridge_mount=bridge_mount_name)
+    if items is None:
+        items = (
+            await asyncio.to_thread(
+                custom_object_api.list_namespaced_custom_object,
+                "gefyra.dev",
+                "v1",
+                namespace,
+                "gefyrabridges",
+                label_selector=f"gefyra.dev/bridge-mount={bridge_mount_name}",
+            )
+        )["items"]
+    elif current_bridge_add:
+        # the cache may lag behind the latest changes to the bridge being installed
+        items = [
+            bridge
+            for bridge in items
+            if bridge["metadata"]["name"] != current_bridge_add
+        ]
+        items.append(
+            await asyncio.to_thread(
+                custom_object_api.get_namespaced_custom_object,
+                "gefyra.dev",
+                "v1",
+                namespace,
+                "gefyrabridges",
+                current_bridge_add,
+            )
+        )
+    return items
+
+
+committed_configs = CommittedConfigs()
+rendered_configs = RenderedConfigs()
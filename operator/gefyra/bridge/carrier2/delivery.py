@@ -0,0 +1,280 @@
+"""
+Delivery of Carrier2 configs through the operator instead of exec sessions.
+
+With GEFYRA_CARRIER2_CONFIG_DELIVERY=configmap the config of a GefyraBridgeMount is
+stored once in a ConfigMap and served by the operator. The Carrier2 containers poll
+it (carrier2-sync.sh of the Carrier2 image), reload on changes and report the hash of
+the config they loaded, hence updating the config of N pods is one API write.
+
+The operator starts the polling with the exec session that installs the config. Each
+container authenticates with a token of its pod, handed over in the same session.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import kubernetes as k8s
+from kubernetes.client import ApiException
+
+from gefyra.configuration import configuration
+
+logger = logging.getLogger(__name__)
+
+CONFIG_SERVICE_NAME = "gefyra-carrier2-config"
+# the config source of a Carrier2 container, written once by the operator
+SOURCE_PATH = "/tmp/carrier2-source"
+SYNC_PID_PATH = "/tmp/carrier2-sync.pid"
+OPERATOR_LABELS = {"gefyra.dev/app": "gefyra-operator", "gefyra.dev/role": "operator"}
+# a container reporting less recently is not considered to poll its config
+REPORT_TTL = 5
+
+core_v1_api = k8s.client.CoreV1Api()
+
+# signs the pod tokens, tokens of a previous operator process are rejected and the
+# next commit hands over a new one
+_token_key = secrets.token_bytes(32)
+
+
+def config_map_name(bridge_mount: str) -> str:
+    return f"gefyra-carrier2-config-{bridge_mount}"
+
+
+def config_url(bridge_mount: str) -> str:
+    return (
+        f"http://{CONFIG_SERVICE_NAME}.{configuration.NAMESPACE}.svc.cluster.local:"
+        f"{configuration.CARRIER2_CONFIG_PORT}/carrier2/{bridge_mount}"
+    )
+
+
+def pod_token(bridge_mount: str, pod_name: str) -> str:
+    """
+    The token a Carrier2 container authenticates its requests for the config of
+    bridge_mount with
+    """
+    return hmac.new(
+        _token_key, f"{bridge_mount}/{pod_name}".encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def verify_token(bridge_mount: str, pod_name: str, token: str) -> bool:
+    return hmac.compare_digest(pod_token(bridge_mount, pod_name), token)
+
+
+def source_commands(bridge_mount: str, pod_name: str, debug: bool) -> List[str]:
+    """
+    The commands making a Carrier2 container poll the config of its GefyraBridgeMount,
+    the polling is started unless it runs already
+    """
+    return [
+        f"echo 'CARRIER2_CONFIG_URL={config_url(bridge_mount)}' > {SOURCE_PATH}.new",
+        f"echo 'CARRIER2_POD={pod_name}' >> {SOURCE_PATH}.new",
+        f"echo 'CARRIER2_TOKEN={pod_token(bridge_mount, pod_name)}' >> {SOURCE_PATH}.new",
+        f"echo 'RUST_LOG={'debug' if debug else 'info'}' >> {SOURCE_PATH}.new",
+        f"mv {SOURCE_PATH}.new {SOURCE_PATH}",
+        f'kill -0 "$(cat {SYNC_PID_PATH} 2>/dev/null)" 2>/dev/null'
+        " || setsid /carrier2-sync.sh > /dev/null 2>&1 < /dev/null &",
+    ]
+
+
+class ConfigStore:
+    """
+    The Carrier2 configs by GefyraBridgeMount and the configs the Carrier2 containers
+    reported to have loaded. The ConfigMaps keep the configs across operator restarts.
+    """
+
+    def __init__(self):
+        # bridge mount -> (hash, config)
+        self._configs: Dict[str, Tuple[str, str]] = {}
+        # (bridge mount, pod) -> (hash, time of the report)
+        self._reports: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        # (bridge mount, pod) -> set on the next report
+        self._report_events: Dict[Tuple[str, str], asyncio.Event] = {}
+
+    async def get(self, bridge_mount: str) -> Optional[Tuple[str, str]]:
+        if bridge_mount not in self._configs:
+            try:
+                configmap = await asyncio.to_thread(
+                    core_v1_api.read_namespaced_config_map,
+                    name=config_map_name(bridge_mount),
+                    namespace=configuration.NAMESPACE,
+                )
+            except ApiException as e:
+                if e.status == 404:
+                    return None
+                raise e
+            data = configmap.data or {}
+            if "config.yaml" not in data or "hash" not in data:
+                return None
+            self._configs.setdefault(bridge_mount, (data["hash"], data["config.yaml"]))
+        return self._configs[bridge_mount]
+
+    async def publish(self, bridge_mount: str, config_str: str, config_hash: str):
+        """
+        Store the config of a GefyraBridgeMount unless it is stored already
+        """
+        if self._configs.get(bridge_mount, (None,))[0] == config_hash:
+            return
+        # served right away, concurrent commits of the same config do not write again
+        self._configs[bridge_mount] = (config_hash, config_str)
+        body = k8s.client.V1ConfigMap(
+            metadata=k8s.client.V1ObjectMeta(
+                name=config_map_name(bridge_mount),
+                labels={
+                    "gefyra.dev/app": "carrier2",
+                    "gefyra.dev/role": "config",
+                    "gefyra.dev/bridge-mount": bridge_mount,
+                },
+            ),
+            data={"config.yaml": config_str, "hash": config_hash},
+        )
+        try:
+            try:
+                await asyncio.to_thread(
+                    core_v1_api.replace_namespaced_config_map,
+                    name=config_map_name(bridge_mount),
+                    namespace=configuration.NAMESPACE,
+                    body=body,
+                )
+            except ApiException as e:
+                if e.status != 404:
+                    raise e
+                await asyncio.to_thread(
+                    core_v1_api.create_namespaced_config_map,
+                    namespace=configuration.NAMESPACE,
+                    body=body,
+                )
+        except ApiException:
+            if self._configs.get(bridge_mount, (None,))[0] == config_hash:
+                self._configs.pop(bridge_mount)
+            raise
+
+    def report(self, bridge_mount: str, pod_name: str, config_hash: str):
+        self._reports[(bridge_mount, pod_name)] = (config_hash, time.monotonic())
+        event = self._report_events.pop((bridge_mount, pod_name), None)
+        if event is not None:
+            event.set()
+
+    def loaded(self, bridge_mount: str, pod_name: str) -> Optional[str]:
+        """
+        The hash of the config a polling Carrier2 container loaded, None if it does not
+        poll (anymore)
+        """
+        config_hash, reported = self._reports.get((bridge_mount, pod_name), (None, 0))
+        if time.monotonic() - reported > REPORT_TTL:
+            return None
+        return config_hash
+
+    async def wait_for(
+        self, bridge_mount: str, pod_name: str, config_hash: str, timeout: int = 30
+    ):
+        """
+        Wait until the Carrier2 container of that pod loaded the config
+        :raises RuntimeError: on timeout
+        """
+        key = (bridge_mount, pod_name)
+        deadline = time.monotonic() + timeout
+        while self._reports.get(key, (None,))[0] != config_hash:
+            event = self._report_events.setdefault(key, asyncio.Event())
+            try:
+                await asyncio.wait_for(
+                    event.wait(), max(deadline - time.monotonic(), 0)
+                )
+            except asyncio.TimeoutError:
+                raise RuntimeError(
+                    f"Carrier2 in Pod {pod_name} did not load the config of"
+                    f" {bridge_mount} within {timeout} seconds"
+                ) from None
+
+    async def delete(self, bridge_mount: str):
+        self._configs.pop(bridge_mount, None)
+        for key in [key for key in self._reports if key[0] == bridge_mount]:
+            self._reports.pop(key)
+        for key in [key for key in self._report_events if key[0] == bridge_mount]:
+            self._report_events.pop(key).set()
+        try:
+            await asyncio.to_thread(
+                core_v1_api.delete_namespaced_config_map,
+                name=config_map_name(bridge_mount),
+                namespace=configuration.NAMESPACE,
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise e
+
+
+config_store = ConfigStore()
+
+
+async def ensure_config_service() -> None:
+    """
+    Create the Service the Carrier2 containers reach the operator with
+    """
+    service = k8s.client.V1Service(
+        metadata=k8s.client.V1ObjectMeta(
+            name=CONFIG_SERVICE_NAME,
+            labels={"gefyra.dev/app": "gefyra-operator"},
+        ),
+        spec=k8s.client.V1ServiceSpec(
+            type="ClusterIP",
+            selector=OPERATOR_LABELS,
+            ports=[
+                k8s.client.V1ServicePort(
+                    name="carrier2-config",
+                    protocol="TCP",
+                    port=configuration.CARRIER2_CONFIG_PORT,
+                    target_port=configuration.CARRIER2_CONFIG_PORT,
+                )
+            ],
+        ),
+    )
+    try:
+        await asyncio.to_thread(
+            core_v1_api.create_namespaced_service,
+            namespace=configuration.NAMESPACE,
+            body=service,
+        )
+    except ApiException as e:
+        if e.status != 409:
+            raise e
+
+
+async def start_config_server(port: int) -> Callable:
+    """
+    Serve the Carrier2 configs on http://0.0.0.0:<port>/carrier2/<bridge mount>; the
+    polling containers pass their pod and its token, the hash of their current config
+    file and the hash of the config they loaded
+    :return: a coroutine function stopping the server
+    """
+    from aiohttp import web
+
+    async def carrier2_config(request):
+        bridge_mount = request.match_info["bridge_mount"]
+        pod_name = request.query.get("pod", "")
+        if not verify_token(bridge_mount, pod_name, request.query.get("token", "")):
+            return web.Response(status=403)
+        if request.query.get("loaded"):
+            config_store.report(bridge_mount, pod_name, request.query["loaded"])
+        stored = await config_store.get(bridge_mount)
+        if stored is None:
+            return web.Response(status=404)
+        config_hash, config_str = stored
+        if request.query.get("current") == config_hash:
+            return web.Response(status=204)
+        return web.Response(
+            text=config_str,
+            content_type="application/yaml",
+            headers={"ETag": config_hash},
+        )
+
+    app = web.Application()
+    app.router.add_get("/carrier2/{bridge_mount}", carrier2_config)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info(f"Serving Carrier2 configs on port {port}")
+    return runner.cleanup
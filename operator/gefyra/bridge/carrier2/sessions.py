@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import kubernetes as k8s
+from ssl import SSLEOFError
+from websocket import WebSocketConnectionClosedException
+
+from gefyra.configuration import configuration
+from gefyra.metrics import exec_sessions_open, exec_sessions_opened
+
+logger = logging.getLogger(__name__)
+
+EXEC_SHELL = ["busybox", "sh"]
+CONNECTION_ERRORS = (
+    WebSocketConnectionClosedException,
+    ConnectionResetError,
+    BrokenPipeError,
+    SSLEOFError,
+)
+
+
+@dataclass
+class ExecResult:
+    output: str
+    exit_code: int
+
+
+class ExecSession:
+    """
+    A shell kept open in a container. Commands are written to its stdin, followed
+    by a sentinel marker echoing the exit code; the output is read until that
+    marker appears, hence no fixed waiting times are required.
+    """
+
+    def __init__(self, name: str, namespace: str, container: Optional[str]):
+        from kubernetes.stream import stream
+
+        core_v1_api = k8s.client.CoreV1Api()
+        self.name = name
+        self.namespace = namespace
+        self.container = container
+        self.lock = threading.Lock()
+        self._resp = stream(
+            core_v1_api.connect_get_namespaced_pod_exec,
+            name,
+            namespace,
+            command=EXEC_SHELL,
+            container=container,
+            stderr=True,
+            stdin=True,
+            stdout=True,
+            tty=False,
+            _preload_content=False,
+        )
+        # stderr is interleaved with stdout in the order it was written
+        self._resp.write_stdin("exec 2>&1\n")
+        self.last_used = time.monotonic()
+
+    def is_open(self) -> bool:
+        return self._resp.is_open()
+
+    def run(self, commands: List[str], timeout: float = 30) -> ExecResult:
+        marker = f"__gefyra_{uuid.uuid4().hex}__"
+        pattern = re.compile(rf"{marker} (\d+)\n")
+        script = "\n".join(commands)
+        self._resp.write_stdin(f"{script}\necho {marker} $?\n")
+        output = ""
+        deadline = time.monotonic() + timeout
+        while (match := pattern.search(output)) is None:
+            if not self._resp.is_open():
+                raise ConnectionResetError(
+                    f"Exec session to pod {self.name} in namespace {self.namespace} closed"
+                )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # the shell state is unknown from now on, the session must not be reused
+                self.close()
+                raise TimeoutError(
+                    f"No response from pod {self.name} in namespace {self.namespace} "
+                    f"within {timeout} seconds"
+                )
+            self._resp.update(timeout=min(remaining, 1))
+            if self._resp.peek_stdout():
+                output += self._resp.read_stdout()
+            if self._resp.peek_stderr():
+                output += self._resp.read_stderr()
+        self.last_used = time.monotonic()
+        return ExecResult(
+            output=output[: match.start()].strip("\n"), exit_code=int(match.group(1))
+        )
+
+    def close(self) -> None:
+        if self._resp.is_open():
+            self._resp.close()
+
+
+class ExecSessionPool:
+    """
+    Exec sessions to containers, keyed by pod, namespace and container. Commands to
+    the same container are sent one after another, different containers are served
+    in parallel. Sessions unused for longer than the idle timeout are closed.
+    """
+
+    def __init__(self, idle_timeout: float):
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[Tuple[str, str, Optional[str]], ExecSession] = {}
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        name: str,
+        namespace: str,
+        container: Optional[str],
+        commands: List[str],
+        timeout: float = 30,
+    ) -> ExecResult:
+        key = (name, namespace, container)
+        session, reused = self._acquire(key)
+        with session.lock:
+            try:
+                return session.run(commands, timeout)
+            except CONNECTION_ERRORS:
+                self._discard(key, session)
+                if not reused:
+                    raise
+            except Exception:
+                self._discard(key, session)
+                raise
+        # a kept session may have been closed meanwhile (e.g. container restart)
+        session, _ = self._acquire(key)
+        with session.lock:
+            try:
+                return session.run(commands, timeout)
+            except Exception:
+                self._discard(key, session)
+                raise
+
+    async def arun(
+        self,
+        name: str,
+        namespace: str,
+        container: Optional[str],
+        commands: List[str],
+        timeout: float = 30,
+    ) -> ExecResult:
+        return await asyncio.to_thread(
+            self.run, name, namespace, container, commands, timeout
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+        exec_sessions_open.set(0)
+        for session in sessions:
+            session.close()
+
+    def _acquire(self, key: Tuple[str, str, Optional[str]]) -> Tuple[ExecSession, bool]:
+        """
+        :return: the session for this key and whether it was already open before
+        """
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions.get(key)
+            if session is not None and session.is_open():
+                session.last_used = time.monotonic()
+                return session, True
+        # open the websocket outside the lock, other containers are not blocked
+        new_session = ExecSession(*key)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and session.is_open():
+                new_session.close()
+                session.last_used = time.monotonic()
+                return session, True
+            self._sessions[key] = new_session
+            exec_sessions_opened.inc()
+            exec_sessions_open.set(len(self._sessions))
+            return new_session, False
+
+    def _discard(self, key: Tuple[str, str, Optional[str]], session: ExecSession):
+        session.close()
+        with self._lock:
+            if self._sessions.get(key) is session:
+                del self._sessions[key]
+            exec_sessions_open.set(len(self._sessions))
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, session in list(self._sessions.items()):
+            if session.lock.locked():
+                continue
+            if not session.is_open() or now - session.last_used > self.idle_timeout:
+                logger.debug(f"Closing exec session to {key}")
+                session.close()
+                del self._sessions[key]
+        exec_sessions_open.set(len(self._sessions))
+
+
+exec_sessions = ExecSessionPool(configuration.CARRIER2_EXEC_SESSION_IDLE_TIMEOUT)
@@ -3,9 +3,10 @@ import time
 from ssl import SSLEOFError
 
 from kopf import TemporaryError
-import kubernetes as k8s
 from websocket import WebSocketConnectionClosedException
 
+from gefyra.bridge.carrier2.sessions import exec_sessions
+
 
 def stream_exec_retries(
     logger,
@@ -21,7 +22,7 @@ def stream_exec_retries(
     while retries > 0:
         try:
             return stream_exec(logger, name, namespace, container, commands, stop_cb)
-        except (ApiException, SSLEOFError, ConnectionResetError) as e:
+        except (ApiException, SSLEOFError, ConnectionResetError, TimeoutError) as e:
             logger.error(
                 f"Failed to exec commands on pod {name} in namespace {namespace} with container {container}: {e}"
             )
@@ -43,58 +44,16 @@ def stream_exec(
     commands: List[str],
     stop_cb: Optional[callable] = None,
 ):
-    from kubernetes.stream import stream
-
-    core_v1_api = k8s.client.CoreV1Api()
-
     logger.info(
         f"Executing commands on pod {name} in namespace {namespace} with container {container}"
     )
-    exec_command = ["busybox", "sh"]
-    resp = None
-    try:
-        resp = stream(
-            core_v1_api.connect_get_namespaced_pod_exec,
-            name,
-            namespace,
-            command=exec_command,
-            container=container,
-            stderr=True,
-            stdin=True,
-            stdout=True,
-            tty=False,
-            _preload_content=False,
-        )
-        temp_commands = commands[:]
-        last_ouput = None
-        while resp.is_open():
-            resp.update(timeout=0.2)
-            if resp.peek_stdout():
-                last_ouput = resp.read_stdout()
-                logger.debug(f"[carrier2] {last_ouput}")
-                if stop_cb and stop_cb(last_ouput):
-                    break
-            if resp.peek_stderr():
-                last_ouput = resp.read_stderr()
-                logger.debug(f"[carrier2] {last_ouput}")
-                if stop_cb and stop_cb(last_ouput):
-                    break
-                continue
-            if temp_commands:
-                c = temp_commands.pop(0)
-                logger.debug(f"Sending command: {c}")
-                resp.write_stdin(c + "\n")
-                time.sleep(0.5)
-            else:
-                break
-            logger.debug(f"Last output: {last_ouput}")
-
-        resp.close()
-    except Exception as e:
-        if resp and resp.is_open():
-            resp.close()
-        raise e
-    return last_ouput
+    # the commands run in a pooled shell session, the call returns once all of
+    # them completed
+    result = exec_sessions.run(name, namespace, container, commands)
+    logger.debug(f"[carrier2] {result.output}")
+    if stop_cb and not stop_cb(result.output):
+        logger.debug(f"Unexpected output: {result.output}")
+    return result.output
 
 
 def read_carrier2_config(
@@ -113,67 +72,33 @@ def read_carrier2_file(
     container: str | None = None,
     retries: int = 30,
 ) -> List[str]:
-    from kubernetes.stream import stream
     from kubernetes.client.rest import ApiException
 
-    core_v1_api = k8s.client.CoreV1Api()
-
     logger.debug(f"Reading carrier2 file from pod {name} in namespace {namespace}")
 
-    exec_command = ["busybox", "sh"]
-    res = []
     while retries > 0:
-        resp = None
         try:
-            resp = stream(
-                core_v1_api.connect_get_namespaced_pod_exec,
-                name,
-                namespace,
-                command=exec_command,
-                container=container,
-                stderr=True,
-                stdin=True,
-                stdout=True,
-                tty=False,
-                _preload_content=False,
-            )
-
-            commands = []
-            commands.append(f"cat {filename} \n")
-            res = []
-            while resp.is_open():
-                resp.update(timeout=0.5)
-                if resp.peek_stdout():
-                    res.append(resp.read_stdout())
-                if resp.peek_stderr():
-                    res.append(resp.read_stdout())
-
-                if commands:
-                    c = commands.pop(0)
-                    resp.write_stdin(c)
-                else:
-                    break
-
-            resp.close()
-            if res == []:
-                raise TemporaryError(
-                    f"Failed to read carrier2 config on pod {name} in namespace {namespace}",
-                    delay=10,
-                )
-            return res
-
-        except (ApiException, SSLEOFError, ConnectionResetError) as e:
+            result = exec_sessions.run(name, namespace, container, [f"cat {filename}"])
+        except (
+            ApiException,
+            SSLEOFError,
+            ConnectionResetError,
+            WebSocketConnectionClosedException,
+            TimeoutError,
+        ) as e:
             logger.error(
                 f"Failed to read carrier2 config on pod {name} in namespace {namespace}: {e}"
             )
             retries -= 1
             time.sleep(1)
-            if resp and resp.is_open():
-                resp.close()
             continue
-    if not res:
-        raise TemporaryError(
-            f"No lines when reading carrier 2 config on pod {name} in namespace {namespace} with {retries} retries",
-            delay=10,
-        )
-    return res
+        if result.exit_code != 0 or not result.output:
+            raise TemporaryError(
+                f"Failed to read carrier2 config on pod {name} in namespace {namespace}",
+                delay=10,
+            )
+        return [result.output]
+    raise TemporaryError(
+        f"No lines when reading carrier 2 config on pod {name} in namespace {namespace} with {retries} retries",
+        delay=10,
+    )
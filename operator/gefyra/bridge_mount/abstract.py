@@ -13,6 +13,15 @@ class AbstractGefyraBridgeMountProvider(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def install_pod(self, pod) -> bool:
+        """
+        Install this Gefyra bridgemount provider to a single Pod of the Kubernetes Resource,
+        e.g. one that was scheduled after the installation
+        :return: False if the Pod does not belong to the Kubernetes Resource
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def prepare(self) -> None:
         """
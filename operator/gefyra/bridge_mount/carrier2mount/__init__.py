@@ -23,10 +23,18 @@ from kubernetes.client import (
 )
 import asyncio  # Added asyncio import
 
+from gefyra import cache
 from gefyra.bridge_mount.abstract import AbstractGefyraBridgeMountProvider
 from gefyra.configuration import OperatorConfiguration
-
-from gefyra.bridge.carrier2.config import Carrier2Config, Carrier2Proxy, CarrierProbe
+from gefyra.metrics import timed
+
+from gefyra.bridge.carrier2.delivery import config_store
+from gefyra.bridge.carrier2.config import (
+    Carrier2Config,
+    Carrier2Proxy,
+    CarrierProbe,
+    committed_configs,
+)
 from gefyra.bridge_mount.utils import (
     _get_tls_from_provider_parameters,
     inject_tls_file,
@@ -54,6 +62,9 @@ core_v1_api = k8s.client.CoreV1Api()
 custom_object_api = k8s.client.CustomObjectsApi()
 autoscaling_api = AutoscalingV2Api()
 
+# the original config of a patched container is kept in an annotation of its pod
+CARRIER2_ORIGINAL_CONFIG_ANNOTATION = "gefyra.dev/carrier2-original-config"
+# shared store of the original configs written by former operator versions
 CARRIER2_ORIGINAL_CONFIGMAP = "gefyra-carrier2-restore-configmap"
 
 
@@ -172,8 +183,9 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
             )
         return func
 
+    @staticmethod
     def _split_target_type_name(
-        self, target
+        target,
     ) -> Tuple[str, Union["V1Deployment", "V1StatefulSet", "V1Pod"]]:
         parts = target.split("/", 1)
         if len(parts) == 2:
@@ -195,6 +207,27 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
             )
         return name, type_
 
+    @classmethod
+    def is_target_pod(cls, target: str, pod: V1Pod) -> bool:
+        """
+        Whether pod belongs to the target workload, judged by its owner without an API
+        call. The pods of the -gefyra duplicate do not belong to it.
+        """
+        try:
+            name, type_ = cls._split_target_type_name(target)
+        except BridgeMountException:
+            return False
+        if type_ is V1Pod:
+            return pod.metadata.name == name
+        for owner in pod.metadata.owner_references or []:
+            if type_ is V1StatefulSet and owner.kind == "StatefulSet":
+                return owner.name == name
+            if type_ is V1Deployment and owner.kind == "ReplicaSet":
+                # the ReplicaSets of a Deployment are named <deployment>-<template hash>
+                template_hash = (pod.metadata.labels or {}).get("pod-template-hash")
+                return owner.name == f"{name}-{template_hash}"
+        return False
+
     def _clone_workload_structure(
         self, workload: V1Deployment | V1StatefulSet | V1Pod
     ) -> V1Deployment | V1StatefulSet | V1Pod:
@@ -432,11 +465,13 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
         if not label_selector:
             # TODO better exception typing here
             raise Exception(f"No label selector set for {self.target}.")
-        pods = await asyncio.to_thread(
-            core_v1_api.list_namespaced_pod,
-            namespace=namespace,
-            label_selector=label_selector,
-        )
+        pods = cache.cached_pods(namespace, v1_label_selector)
+        if pods is None:
+            pods = await asyncio.to_thread(
+                core_v1_api.list_namespaced_pod,
+                namespace=namespace,
+                label_selector=label_selector,
+            )
         return pods
 
     async def _default_upstream(self, rport: int) -> List[str]:
@@ -509,8 +544,8 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
         else:
             return True
 
+    @timed("carrier2_bridge_mount_install")
     async def install(self):
-        upstream_ports = []
         pods = await self._original_pods
         if (
             len(
@@ -527,142 +562,249 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
                 "Cannot install Gefyra Carrier2 on pods controlled by more than one controller.",
                 delay=10,
             )
-        for idx, pod in enumerate(pods.items):
-            if pod.status.phase == "Terminating":
-                continue
-            for container in pod.spec.containers:
-                patch_required = True
-                if container.name == self.container:
-                    upstream_ports = [port.container_port for port in container.ports]
-                    probes = get_all_probes(container)
-                    if not all(
-                        map(
-                            self._check_probe_compatibility,
-                            probes,
-                        )
-                    ):
-                        self.logger.error(
-                            "Not all of the probes to be handled are currently"
-                            " supported by Gefyra"
-                        )
-                        # Returning False, pod is not possible in async, either raise or return None and handle it
-                        raise BridgeInstallException("Probes not compatible")
-                    if container.image == self._carrier_image:
-                        # this pod/container is already running Carrier
-                        patch_required = False
-                        self.logger.info(
-                            f"The container {self.container} in Pod {pod.metadata.name} is already"
-                            " running Carrier2"
-                        )
-                    await self._store_pod_original_config(container, pod.metadata.name)
-                    container.image = self._carrier_image
-                    break
-            else:
-                raise BridgeInstallException(
-                    f"Container {self.container} not found in Pod {pod}"
-                )
+        pods = [pod for pod in pods.items if pod.status.phase != "Terminating"]
+        await self._report_pods_progress(
+            {pod.metadata.name: "Pending" for pod in pods}, reset=True
+        )
+        semaphore = asyncio.Semaphore(
+            max(1, self.configuration.CARRIER2_INSTALL_PARALLELISM)
+        )
 
-            if patch_required:
-                await self.post_event(
-                    "Patching target pod",
-                    f"Now patching Pod {pod.metadata.name} ({idx + 1} of {len(pods.items)} Pod(s)); container {self.container} with Carrier2",
-                    "Normal",
-                )
+        async def _install_bounded(idx: int, pod: V1Pod) -> None:
+            async with semaphore:
                 try:
-                    await asyncio.to_thread(
-                        core_v1_api.patch_namespaced_pod,
-                        name=pod.metadata.name,
-                        namespace=self.namespace,
-                        body=pod,
+                    await self._install_pod(idx, len(pods), pod)
+                except Exception:
+                    await self._report_pods_progress({pod.metadata.name: "Failed"})
+                    raise
+                await self._report_pods_progress({pod.metadata.name: "Installed"})
+
+        tasks = [
+            asyncio.create_task(_install_bounded(idx, pod))
+            for idx, pod in enumerate(pods)
+        ]
+        if self.configuration.CARRIER2_INSTALL_POLICY == "continue":
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                self.logger.error(
+                    f"Carrier2 could not be installed into {len(errors)} of"
+                    f" {len(pods)} Pod(s): {', '.join(str(e) for e in errors)}"
+                )
+                raise errors[0]
+        else:
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # fail fast, do not patch any further pods
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+    @timed("carrier2_bridge_mount_install_pod")
+    async def install_pod(self, pod: V1Pod) -> bool:
+        pods = await self._original_pods
+        if pod.metadata.name not in {p.metadata.name for p in pods.items}:
+            return False
+        # the pod is modified for the patch
+        pod = deepcopy(pod)
+        await self._report_pods_progress({pod.metadata.name: "Pending"})
+        try:
+            await self._install_pod(0, 1, pod)
+        except Exception:
+            await self._report_pods_progress({pod.metadata.name: "Failed"})
+            raise
+        await self._report_pods_progress({pod.metadata.name: "Installed"})
+        return True
+
+    async def _install_pod(self, idx: int, total: int, pod: V1Pod) -> None:
+        upstream_ports = []
+        for container in pod.spec.containers:
+            patch_required = True
+            if container.name == self.container:
+                upstream_ports = [port.container_port for port in container.ports]
+                probes = get_all_probes(container)
+                if not all(
+                    map(
+                        self._check_probe_compatibility,
+                        probes,
                     )
-                except ApiException as e:
-                    self.logger.warning(
-                        f"Failed to patch Pod {pod.metadata.name} with Carrier2: {e.reason} (status {e.status})"
+                ):
+                    self.logger.error(
+                        "Not all of the probes to be handled are currently"
+                        " supported by Gefyra"
                     )
-                    raise TemporaryError(
-                        f"Failed to patch Pod {pod.metadata.name} with Carrier2: {e.reason} (status {e.status})",
-                        delay=10,
+                    # Returning False, pod is not possible in async, either raise or return None and handle it
+                    raise BridgeInstallException("Probes not compatible")
+                if container.image == self._carrier_image:
+                    # this pod/container is already running Carrier
+                    patch_required = False
+                    self.logger.info(
+                        f"The container {self.container} in Pod {pod.metadata.name} is already"
+                        " running Carrier2"
                     )
+                else:
+                    # a retried rollout must not store Carrier2 as the original
+                    self._store_pod_original_config(container, pod)
+                container.image = self._carrier_image
+                break
+        else:
+            raise BridgeInstallException(
+                f"Container {self.container} not found in Pod {pod}"
+            )
 
-            # wait for the container restart to become effective
-            read_func = partial(
-                core_v1_api.read_namespaced_pod_status,
-                pod.metadata.name,
-                self.namespace,
+        if patch_required:
+            await self._report_pods_progress({pod.metadata.name: "Patching"})
+            await self.post_event(
+                "Patching target pod",
+                f"Now patching Pod {pod.metadata.name} ({idx + 1} of {total} Pod(s)); container {self.container} with Carrier2",
+                "Normal",
             )
             try:
+                await asyncio.to_thread(
+                    core_v1_api.patch_namespaced_pod,
+                    name=pod.metadata.name,
+                    namespace=self.namespace,
+                    body=pod,
+                )
+            except ApiException as e:
+                self.logger.warning(
+                    f"Failed to patch Pod {pod.metadata.name} with Carrier2: {e.reason} (status {e.status})"
+                )
+                raise TemporaryError(
+                    f"Failed to patch Pod {pod.metadata.name} with Carrier2: {e.reason} (status {e.status})",
+                    delay=10,
+                )
+
+        def _container_restarted(s):
+            return (
+                next(
+                    filter(
+                        lambda c: c.name == self.container,
+                        s.status.container_statuses,
+                    )
+                ).restart_count
+                > 0
+            )
+
+        # wait for the container restart to become effective
+        try:
+            if (
+                await cache.wait_for_pod(
+                    self.namespace,
+                    pod.metadata.name,
+                    _container_restarted,
+                    timeout=120,
+                )
+                is None
+            ):
+                # busy wait without the pod watch
+                read_func = partial(
+                    core_v1_api.read_namespaced_pod_status,
+                    pod.metadata.name,
+                    self.namespace,
+                )
                 await asyncio.to_thread(
                     wait_until_condition,
                     read_func,
-                    lambda s: (
-                        next(
-                            filter(
-                                lambda c: c.name == self.container,
-                                s.status.container_statuses,
-                            )
-                        ).restart_count
-                        > 0
-                    ),
+                    _container_restarted,
                     timeout=120,
                     backoff=0.2,
                 )
-            except RuntimeError:
-                raise BridgeInstallException(
-                    f"Timeout waiting for condition: container '{self.container}' in  Pod '{pod.metadata.name}' took too long to restart after patch."
-                )
-
-            carrier_config = await self._set_carrier_upstream(upstream_ports, probes)
-            await carrier_config.add_bridge_rules_for_mount(
-                self.name, self.configuration.NAMESPACE, None, None
-            )
-            await self.post_event(
-                "Update Carrier2",
-                f"Commiting Carrier2 config to Pod {pod.metadata.name} ({idx + 1} of {len(pods.items)} Pod(s))",
-                "Normal",
+        except RuntimeError:
+            raise BridgeInstallException(
+                f"Timeout waiting for condition: container '{self.container}' in  Pod '{pod.metadata.name}' took too long to restart after patch."
             )
 
-            # injected TLS files if requested
-            for upstream_port in upstream_ports:
-                if self.params and _tls_cert_from_k8s_secret(
-                    self.params, upstream_port
-                ):
-                    # inject certificate from k8s secret
-                    await inject_tls_file(
-                        self.logger,
-                        pod.metadata.name,
-                        container.name,
-                        self.namespace,
-                        "certificate",
-                        self.params,
-                        upstream_port,
-                    )
-                if self.params and _tls_key_from_k8s_secret(self.params, upstream_port):
-                    # inject key from k8s secret
-                    await inject_tls_file(
-                        self.logger,
-                        pod.metadata.name,
-                        container.name,
-                        self.namespace,
-                        "key",
-                        self.params,
-                        upstream_port,
-                    )
+        await self._report_pods_progress({pod.metadata.name: "Configuring"})
+        carrier_config = await self._set_carrier_upstream(upstream_ports, probes)
+        await carrier_config.add_bridge_rules_for_mount(
+            self.name, self.configuration.NAMESPACE, None, None
+        )
+        await self.post_event(
+            "Update Carrier2",
+            f"Commiting Carrier2 config to Pod {pod.metadata.name} ({idx + 1} of {total} Pod(s))",
+            "Normal",
+        )
 
-            self.logger.debug(f"Carrier2 config: {carrier_config}")
-            try:
-                await carrier_config.commit(
+        # injected TLS files if requested
+        for upstream_port in upstream_ports:
+            if self.params and _tls_cert_from_k8s_secret(self.params, upstream_port):
+                # inject certificate from k8s secret
+                await inject_tls_file(
                     self.logger,
                     pod.metadata.name,
-                    self.container,
+                    container.name,
                     self.namespace,
-                    debug=self.configuration.CARRIER2_DEBUG,
+                    "certificate",
+                    self.params,
+                    upstream_port,
                 )
-            except RuntimeError:
-                raise BridgeInstallException(
-                    f"Timeout waiting for condition: could not commit GefyraBridgeMount config successfully. Please check the log of the patched Pod '{pod.metadata.name}'"
-                    f" and container '{self.container}' in namespace '{self.namespace}' for more information."
+            if self.params and _tls_key_from_k8s_secret(self.params, upstream_port):
+                # inject key from k8s secret
+                await inject_tls_file(
+                    self.logger,
+                    pod.metadata.name,
+                    container.name,
+                    self.namespace,
+                    "key",
+                    self.params,
+                    upstream_port,
                 )
 
+        self.logger.debug(f"Carrier2 config: {carrier_config}")
+        try:
+            # the TLS files may have been replaced, always reload
+            await carrier_config.commit(
+                self.logger,
+                pod.metadata.name,
+                self.container,
+                self.namespace,
+                debug=self.configuration.CARRIER2_DEBUG,
+                force=True,
+                bridge_mount=self.name,
+            )
+        except RuntimeError:
+            raise BridgeInstallException(
+                f"Timeout waiting for condition: could not commit GefyraBridgeMount config successfully. Please check the log of the patched Pod '{pod.metadata.name}'"
+                f" and container '{self.container}' in namespace '{self.namespace}' for more information."
+            )
+
+    async def _report_pods_progress(
+        self, progress: dict[str, str], reset: bool = False
+    ) -> None:
+        """
+        Report the Carrier2 installation progress per pod in the GefyraBridgeMount status
+        :param progress: the progress by pod name, e.g. "Patching" or "Installed"
+        :param reset: drop the progress of pods from an earlier installation
+        """
+        try:
+            if reset:
+                await asyncio.to_thread(
+                    custom_object_api.patch_namespaced_custom_object,
+                    group="gefyra.dev",
+                    version="v1",
+                    namespace=self.configuration.NAMESPACE,
+                    plural="gefyrabridgemounts",
+                    name=self.name,
+                    body={"status": {"pods": None}},
+                )
+            await asyncio.to_thread(
+                custom_object_api.patch_namespaced_custom_object,
+                group="gefyra.dev",
+                version="v1",
+                namespace=self.configuration.NAMESPACE,
+                plural="gefyrabridgemounts",
+                name=self.name,
+                body={"status": {"pods": progress}},
+            )
+        except ApiException as e:
+            # the progress is informational, it must not fail the installation
+            self.logger.warning(
+                f"Could not report the progress of GefyraBridgeMount {self.name}: {e.reason}"
+            )
+
     @property
     async def _carrier_installed(self):
         res = True
@@ -719,15 +861,18 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
                 if container.name == self.container:
                     upstream_ports = [port.container_port for port in container.ports]
 
-                    config_str_list = await asyncio.to_thread(
-                        read_carrier2_config,
-                        self.logger,
-                        pod.metadata.name,
-                        self.namespace,
-                        container.name,
-                    )
-                    config_str = "\n".join(config_str_list)
-                    pod_config = Carrier2Config.from_string(config_str)
+                    # a config committed by this operator does not need to be read back
+                    pod_config = committed_configs.get(pod, container.name)
+                    if pod_config is None:
+                        config_str_list = await asyncio.to_thread(
+                            read_carrier2_config,
+                            self.logger,
+                            pod.metadata.name,
+                            self.namespace,
+                            container.name,
+                        )
+                        config_str = "\n".join(config_str_list)
+                        pod_config = Carrier2Config.from_string(config_str)
                     if not any(p.clusterUpstream for p in pod_config.proxy):
                         return False
 
@@ -761,12 +906,15 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
                             )
                     if updated:
                         try:
+                            # reload for the new TLS files, the config is unchanged
                             await pod_config.commit(
                                 self.logger,
                                 pod.metadata.name,
                                 self.container,
                                 self.namespace,
                                 debug=self.configuration.CARRIER2_DEBUG,
+                                force=True,
+                                bridge_mount=self.name,
                             )
                         except RuntimeError:
                             raise BridgeInstallException(
@@ -851,16 +999,22 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
             self._split_target_type_name(target)  # expect RuntimeError if malformed
             target_namespace = bridge_request["targetNamespace"]
 
-            bridge_mounts = await asyncio.to_thread(
-                custom_object_api.list_namespaced_custom_object,
-                group="gefyra.dev",
-                version="v1",
-                plural="gefyrabridgemounts",
-                namespace=self.configuration.NAMESPACE,
+            bridge_mounts = cache.cached_bridge_mounts(
+                self.configuration.NAMESPACE, target, target_namespace
             )
+            if bridge_mounts is None:
+                bridge_mounts = (
+                    await asyncio.to_thread(
+                        custom_object_api.list_namespaced_custom_object,
+                        group="gefyra.dev",
+                        version="v1",
+                        plural="gefyrabridgemounts",
+                        namespace=self.configuration.NAMESPACE,
+                    )
+                ).get("items")
         except Exception as e:
             raise kopf.AdmissionError(f"Cannot read GefyraBridgeMounts: {e}")
-        for bridge_mount in bridge_mounts.get("items"):
+        for bridge_mount in bridge_mounts:
             if (
                 bridge_mount["target"] == target
                 and bridge_mount["targetNamespace"] == target_namespace
@@ -919,16 +1073,19 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
                 )
                 raise e
 
-    async def _store_pod_original_config(
-        self, container: k8s.client.V1Container, pod_name: str
+    def _store_pod_original_config(
+        self, container: k8s.client.V1Container, pod: V1Pod
     ) -> None:
         """
-        Store the original configuration of that Container in order to restore it once the intercept request is ended
+        Store the original configuration of that Container in an annotation of the Pod in order to restore it
+        once the GefyraBridgeMount is removed; it is written with the patch installing Carrier2
         :param container: V1Container of the Pod in question
-        :param ireq_object: the InterceptRequest object
+        :param pod: the V1Pod to be patched
         :return: None
         """
-        data = json.dumps(
+        if pod.metadata.annotations is None:
+            pod.metadata.annotations = {}
+        pod.metadata.annotations[CARRIER2_ORIGINAL_CONFIG_ANNOTATION] = json.dumps(
             {
                 "originalConfig": {
                     "image": container.image,
@@ -937,50 +1094,72 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
                 }
             }
         )
-        config = [
-            {"op": "add", "path": f"/data/{self.namespace}-{pod_name}", "value": data}
-        ]
+
+    async def _read_legacy_original_configs(self) -> dict:
         try:
-            await asyncio.to_thread(
-                core_v1_api.patch_namespaced_config_map,
+            configmap = await asyncio.to_thread(
+                core_v1_api.read_namespaced_config_map,
                 name=CARRIER2_ORIGINAL_CONFIGMAP,
                 namespace=self.configuration.NAMESPACE,
-                body=config,
             )
-        except k8s.client.exceptions.ApiException as e:
+        except ApiException as e:
             if e.status == 404:
+                return {}
+            raise e
+        return configmap.data or {}
+
+    async def _remove_legacy_original_configs(self, pod_names: List[str]) -> None:
+        """
+        Remove the entries of these Pods from the ConfigMap written by former operator versions
+        """
+        data = await self._read_legacy_original_configs()
+        keys = [
+            key
+            for key in (f"{self.namespace}-{name}" for name in pod_names)
+            if key in data
+        ]
+        if not keys:
+            return
+        try:
+            if len(keys) == len(data):
                 await asyncio.to_thread(
-                    core_v1_api.create_namespaced_config_map,
+                    core_v1_api.delete_namespaced_config_map,
+                    name=CARRIER2_ORIGINAL_CONFIGMAP,
                     namespace=self.configuration.NAMESPACE,
-                    body=k8s.client.V1ConfigMap(
-                        metadata=k8s.client.V1ObjectMeta(
-                            name=CARRIER2_ORIGINAL_CONFIGMAP
-                        ),
-                        data={
-                            f"{self.namespace}-{pod_name}": data,
-                        },
-                    ),
                 )
             else:
+                await asyncio.to_thread(
+                    core_v1_api.patch_namespaced_config_map,
+                    name=CARRIER2_ORIGINAL_CONFIGMAP,
+                    namespace=self.configuration.NAMESPACE,
+                    body={"data": {key: None for key in keys}},
+                )
+        except ApiException as e:
+            if e.status != 404:
                 raise e
 
     async def _patch_pod_with_original_config(self, pod_name: str) -> V1Pod:
         pod = await asyncio.to_thread(
             core_v1_api.read_namespaced_pod, name=pod_name, namespace=self.namespace
         )
-        configmap = await asyncio.to_thread(
-            core_v1_api.read_namespaced_config_map,
-            name=CARRIER2_ORIGINAL_CONFIGMAP,
-            namespace=self.configuration.NAMESPACE,
+        original = (pod.metadata.annotations or {}).get(
+            CARRIER2_ORIGINAL_CONFIG_ANNOTATION
         )
-        data = json.loads(configmap.data.get(f"{self.namespace}-{pod_name}"))
+        if original is None:
+            # patched by a former operator version
+            original = (await self._read_legacy_original_configs()).get(
+                f"{self.namespace}-{pod_name}"
+            )
+        if original is None:
+            raise RuntimeError(
+                f"Could not find the original state of Pod {pod_name}: cannot patch"
+                " with original state"
+            )
+        data = json.loads(original)
 
-        for container in pod.spec.containers:
-            if container.name == self.container:
-                for k, v in data.get("originalConfig").items():
-                    setattr(container, k, v)
-                break
-        else:
+        if not any(
+            container.name == self.container for container in pod.spec.containers
+        ):
             raise RuntimeError(
                 f"Could not find container {self.container} in Pod {pod_name}: cannot"
                 " patch with original state"
@@ -990,11 +1169,19 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
             f"Now patching Pod {pod_name}; container {self.container} with original"
             " state"
         )
+        container = {
+            k: v for k, v in data.get("originalConfig").items() if v is not None
+        }
         return await asyncio.to_thread(
             core_v1_api.patch_namespaced_pod,
             name=pod_name,
             namespace=self.namespace,
-            body=pod,
+            body={
+                "metadata": {
+                    "annotations": {CARRIER2_ORIGINAL_CONFIG_ANNOTATION: None}
+                },
+                "spec": {"containers": [{"name": self.container, **container}]},
+            },
         )
 
     async def target_exists(self) -> bool:
@@ -1013,9 +1200,20 @@ class Carrier2BridgeMount(AbstractGefyraBridgeMountProvider):
     async def uninstall(self):
         await self.uninstall_duplicated_workload()
         await self.uninstall_service()
+        if self.configuration.CARRIER2_CONFIG_DELIVERY == "configmap":
+            await config_store.delete(self.name)
         try:
+            pod_names = [pod.metadata.name for pod in (await self._original_pods).items]
             await self.restore_original_workload()
         except Exception as e:
             self.logger.error(
                 f"Could not restore original workload for {self.name} due to: {e}"
             )
+            return
+        try:
+            await self._remove_legacy_original_configs(pod_names)
+        except ApiException as e:
+            self.logger.warning(
+                f"Could not remove the original state of {self.name} from"
+                f" {CARRIER2_ORIGINAL_CONFIGMAP}: {e.reason}"
+            )
@@ -285,7 +285,9 @@ async def inject_tls_file(
         f"cat <<'EOF' > {file_name}\n{content}",
         "EOF",
     ]
-    stream_exec_retries(logger, pod_name, namespace, container, write_command)
+    await asyncio.to_thread(
+        stream_exec_retries, logger, pod_name, namespace, container, write_command
+    )
 
 
 def _get_tls_from_provider_parameters(params: dict, rport: int | None = None):
@@ -3,11 +3,15 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import kopf
-import kubernetes as k8s
 from statemachine import State, StateChart
 
 
-from gefyra.base import GefyraStateObject, StateControllerMixin
+from gefyra.base import (
+    GefyraStateObject,
+    StateControllerMixin,
+    custom_api,
+    events_api,
+)
 from gefyra.configuration import OperatorConfiguration
 from gefyra.bridge_mount.abstract import AbstractGefyraBridgeMountProvider
 from gefyra.bridge_mount.factory import (
@@ -101,8 +105,8 @@ class GefyraBridgeMount(StateChart, StateControllerMixin):  # Reverted to StateM
         self.data = model.data
         self.operator_configuration = configuration
         self.logger = logger
-        self.custom_api = k8s.client.CustomObjectsApi()
-        self.events_api = k8s.client.EventsV1Api()
+        self.custom_api = custom_api
+        self.events_api = events_api
         self._bridge_mount_provider: Optional[AbstractGefyraBridgeMountProvider] = None
 
     @property
@@ -1,13 +1,17 @@
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Set, Tuple
 from gefyra.bridge.abstract import AbstractGefyraBridgeProvider
 from gefyra.bridge.factory import BridgeProviderType, bridge_provider_factory
 
 import kopf
-import kubernetes as k8s
 from statemachine import State, StateChart
 
-from gefyra.base import GefyraStateObject, StateControllerMixin
+from gefyra.base import (
+    GefyraStateObject,
+    StateControllerMixin,
+    custom_api,
+    events_api,
+)
 from gefyra.configuration import OperatorConfiguration
 
 from gefyra.bridge.exceptions import BridgeException, BridgeInstallException
@@ -85,8 +89,8 @@ class GefyraBridge(StateChart, StateControllerMixin):  # Reverted to StateMachin
         self.data = model.data
         self.operator_configuration = configuration
         self.logger = logger
-        self.custom_api = k8s.client.CustomObjectsApi()
-        self.events_api = k8s.client.EventsV1Api()
+        self.custom_api = custom_api
+        self.events_api = events_api
         self._bridge_provider = None
 
     @property
@@ -171,28 +175,37 @@ class GefyraBridge(StateChart, StateControllerMixin):  # Reverted to StateMachin
 
     @property
     async def is_intact(self) -> bool:
-        # TODO check if bridge is in Carrier2 config
+        destinations = await self.connection_provider.get_destinations(
+            self.data["client"]
+        )
+        proxy_routes = await (await self.bridge_provider).proxy_routes()
+        return self.is_intact_in(destinations, proxy_routes)
 
+    def is_intact_in(
+        self,
+        destinations: Dict[Tuple[str, str, int], str],
+        proxy_routes: Set[Tuple[int, str, str]],
+    ) -> bool:
+        """
+        Check this bridge against snapshots of the connection provider's destinations
+        and the bridge provider's proxy routes, see get_destinations() and
+        proxy_routes() of the providers
+        """
         destination = self.data["destinationIP"]
         for port_mapping in self.data.get("portMappings"):
             local_port, target_port = port_mapping.split(":")
-            if not await self.connection_provider.destination_exists(
-                self.data["client"], destination, int(local_port)
-            ):
+            proxy_host = destinations.get(
+                (self.data["client"], destination, int(local_port))
+            )
+            if proxy_host is None:
                 self.logger.warning(
                     f"Destination of {self.data['client']} for {destination} port {int(local_port)} does not exist"
                 )
                 return False
 
-            proxy_host = await self.connection_provider.get_destination(
-                self.data["client"], destination, int(local_port)
-            )
-            proxy_host, proxy_port = proxy_host.split(":", 1)
-            if not await (await self.bridge_provider).proxy_route_exists(
-                target_port, proxy_host, proxy_port, self.object_name
-            ):
+            if (int(target_port), proxy_host, self.object_name) not in proxy_routes:
                 self.logger.warning(
-                    f"Proxy route of {self.data['client']}/{self.object_name} for {target_port}, {proxy_host}, {proxy_port} {self.object_name} does not exist"
+                    f"Proxy route of {self.data['client']}/{self.object_name} for {target_port}, {proxy_host} does not exist"
                 )
                 return False
         return True
@@ -0,0 +1,549 @@
+"""
+Informer-style local caches of the resources the operator reads on its hot paths.
+
+Each cache lists its kind once, then follows a watch to stay up to date. Read paths
+query the memory instead of the API server. As long as a cache is not synced, e.g. in
+unit tests or while its watch is being reestablished, readers ask the API server.
+
+Pods are not watched cluster-wide, that would keep every pod of the cluster in memory.
+A namespace is watched from the first read of its pods (the targets of the
+GefyraBridgeMounts and the operator namespace) until it is released.
+"""
+
+import asyncio
+import logging
+import threading
+from copy import deepcopy
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import kubernetes as k8s
+
+from gefyra.configuration import configuration
+
+logger = logging.getLogger(__name__)
+
+# seconds a single watch request is kept open before it is renewed
+WATCH_TIMEOUT = 60
+# seconds to wait before listing again after an error
+RELIST_BACKOFF = 5
+
+Indexer = Callable[[Any], Iterable[str]]
+ObjectKey = Tuple[Optional[str], str]
+Waiter = Tuple[asyncio.AbstractEventLoop, asyncio.Future, Callable[[Any], bool]]
+Listener = Tuple[asyncio.AbstractEventLoop, Callable[[str, Any], None]]
+
+
+def _metadata(obj: Any) -> Dict[str, Any]:
+    """
+    The metadata of custom objects (dicts) and Kubernetes models in the same shape
+    """
+    if isinstance(obj, dict):
+        return obj.get("metadata") or {}
+    meta = obj.metadata
+    return {
+        "name": meta.name,
+        "namespace": meta.namespace,
+        "labels": meta.labels or {},
+        "ownerReferences": [{"uid": ref.uid} for ref in meta.owner_references or []],
+    }
+
+
+def label_indexer(label: str) -> Indexer:
+    def _index(obj: Any) -> Iterable[str]:
+        value = (_metadata(obj).get("labels") or {}).get(label)
+        return [value] if value else []
+
+    return _index
+
+
+def owner_indexer(obj: Any) -> Iterable[str]:
+    return [ref["uid"] for ref in _metadata(obj).get("ownerReferences") or []]
+
+
+def destination_indexer(obj: Any) -> Iterable[str]:
+    """
+    "<client-id>/<destination>" of a Stowaway proxy service
+    """
+    labels = _metadata(obj).get("labels") or {}
+    client_id = labels.get("gefyra.dev/client-id")
+    destination = labels.get("gefyra.dev/destination")
+    return [f"{client_id}/{destination}"] if client_id and destination else []
+
+
+class ResourceCache:
+    """
+    The objects returned by a list function, kept up to date by a watch of the
+    same function. Objects are indexed by (namespace, name) and by the values of
+    the given indexers, e.g. label values or owner UIDs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        list_func: Callable,
+        *list_args,
+        list_kwargs: Optional[Dict[str, Any]] = None,
+        indexers: Optional[Dict[str, Indexer]] = None,
+        listeners: Optional[List[Listener]] = None,
+    ):
+        self.name = name
+        self.synced = threading.Event()
+        self._list_func = list_func
+        self._list_args = list_args
+        self._list_kwargs = list_kwargs or {}
+        self._indexers = indexers or {}
+        self._objects: Dict[ObjectKey, Any] = {}
+        self._indexes: Dict[str, Dict[str, Set[ObjectKey]]] = {}
+        self._waiters: Dict[ObjectKey, List[Waiter]] = {}
+        # may be shared with the caches of other namespaces of the same kind
+        self._listeners: List[Listener] = listeners if listeners is not None else []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"cache-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.synced.clear()
+
+    def get(self, namespace: Optional[str], name: str) -> Optional[Any]:
+        with self._lock:
+            return self._objects.get((namespace, name))
+
+    def list(
+        self,
+        namespace: Optional[str] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> List[Any]:
+        """
+        :param labels: only objects carrying all of these labels (like a label selector)
+        """
+        with self._lock:
+            objects = list(self._objects.items())
+        return [
+            obj
+            for (obj_namespace, _), obj in objects
+            if (namespace is None or obj_namespace == namespace)
+            and _match_labels(obj, labels)
+        ]
+
+    def by_index(
+        self, index: str, value: str, namespace: Optional[str] = None
+    ) -> List[Any]:
+        with self._lock:
+            keys = self._indexes.get(index, {}).get(value, set())
+            objects = [(key, self._objects[key]) for key in keys]
+        return [
+            obj
+            for (obj_namespace, _), obj in objects
+            if namespace is None or obj_namespace == namespace
+        ]
+
+    async def wait_for(
+        self,
+        namespace: Optional[str],
+        name: str,
+        condition: Callable[[Any], bool],
+        timeout: float,
+    ) -> Any:
+        """
+        Wait until the object fulfills condition. The condition is evaluated on each
+        change delivered by the watch, all waiters share the watch of this cache.
+        :raises RuntimeError: if the condition is not fulfilled within timeout seconds
+        """
+        loop = asyncio.get_running_loop()
+        waiter: Waiter = (loop, loop.create_future(), condition)
+        key = (namespace, name)
+        with self._lock:
+            obj = self._objects.get(key)
+            if obj is not None and _fulfills(condition, obj):
+                return obj
+            self._waiters.setdefault(key, []).append(waiter)
+        try:
+            return await asyncio.wait_for(waiter[1], timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError("Failed to fulfill wait condition") from None
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(key, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    self._waiters.pop(key, None)
+
+    def add_listener(self, callback: Callable[[str, Any], None]) -> Callable[[], None]:
+        """
+        Call callback(event type, object) for each change delivered by the watch, on
+        the event loop running this call. The objects of a (re)list are not delivered.
+        :return: a function removing the listener
+        """
+        listener: Listener = (asyncio.get_running_loop(), callback)
+        with self._lock:
+            self._listeners.append(listener)
+
+        def remove() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return remove
+
+    def _notify(self, event_type: str, obj: Any) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for loop, callback in listeners:
+            loop.call_soon_threadsafe(callback, event_type, obj)
+
+    def replace(self, objects: Iterable[Any]) -> None:
+        with self._lock:
+            self._objects = {}
+            self._indexes = {index: {} for index in self._indexers}
+            for obj in objects:
+                self._add(obj)
+
+    def upsert(self, obj: Any) -> None:
+        with self._lock:
+            self._remove(_key(obj))
+            self._add(obj)
+
+    def delete(self, obj: Any) -> None:
+        with self._lock:
+            self._remove(_key(obj))
+
+    def _add(self, obj: Any) -> None:
+        key = _key(obj)
+        self._objects[key] = obj
+        for index, indexer in self._indexers.items():
+            for value in indexer(obj):
+                self._indexes.setdefault(index, {}).setdefault(value, set()).add(key)
+        for loop, future, condition in self._waiters.get(key, ()):
+            if _fulfills(condition, obj):
+                # the watch runs in its own thread, waiters on their event loop
+                loop.call_soon_threadsafe(_resolve, future, obj)
+
+    def _remove(self, key: ObjectKey) -> None:
+        obj = self._objects.pop(key, None)
+        if obj is None:
+            return
+        for index, indexer in self._indexers.items():
+            for value in indexer(obj):
+                keys = self._indexes.get(index, {}).get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._indexes[index][value]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                resource_version = self._relist()
+                self._watch(resource_version)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                # the watch expired (410) or the API server cannot be reached
+                logger.warning(f"Resource cache '{self.name}' lost its watch: {e}")
+                self.synced.clear()
+                self._stop.wait(RELIST_BACKOFF)
+
+    def _relist(self) -> str:
+        response = self._list_func(*self._list_args, **self._list_kwargs)
+        if isinstance(response, dict):
+            items = response.get("items") or []
+            resource_version = response["metadata"]["resourceVersion"]
+        else:
+            items = response.items or []
+            resource_version = response.metadata.resource_version
+        self.replace(items)
+        self.synced.set()
+        logger.info(f"Resource cache '{self.name}' synced with {len(items)} objects")
+        return resource_version
+
+    def _watch(self, resource_version: str) -> None:
+        watch = k8s.watch.Watch()
+        while not self._stop.is_set():
+            for event in watch.stream(
+                self._list_func,
+                *self._list_args,
+                **self._list_kwargs,
+                resource_version=resource_version,
+                timeout_seconds=WATCH_TIMEOUT,
+                allow_watch_bookmarks=True,
+            ):
+                if event["type"] == "DELETED":
+                    self.delete(event["object"])
+                    self._notify(event["type"], event["object"])
+                elif event["type"] in ("ADDED", "MODIFIED"):
+                    self.upsert(event["object"])
+                    self._notify(event["type"], event["object"])
+                if self._stop.is_set():
+                    watch.stop()
+            # continue where the last watch request ended, bookmarks included
+            resource_version = watch.resource_version or resource_version
+
+
+class NamespacedResourceCaches:
+    """
+    One ResourceCache per namespace, for kinds too numerous to be watched
+    cluster-wide. A namespace is watched from its first read until it is released.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        list_func: Callable,
+        indexers: Optional[Dict[str, Indexer]] = None,
+    ):
+        self.name = name
+        self._list_func = list_func
+        self._indexers = indexers
+        self._caches: Dict[str, ResourceCache] = {}
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        self._started = True
+
+    def stop(self) -> None:
+        with self._lock:
+            self._started = False
+            caches, self._caches = list(self._caches.values()), {}
+        for cache in caches:
+            cache.stop()
+
+    def cache(self, namespace: str) -> Optional[ResourceCache]:
+        """
+        The synced cache of namespace, its watch is started on the first call
+        :return: None if the cache is not synced (yet)
+        """
+        with self._lock:
+            if not self._started:
+                return None
+            cache = self._caches.get(namespace)
+            if cache is None:
+                cache = ResourceCache(
+                    f"{self.name}-{namespace}",
+                    self._list_func,
+                    namespace,
+                    indexers=self._indexers,
+                    listeners=self._listeners,
+                )
+                self._caches[namespace] = cache
+                cache.start()
+        return cache if cache.synced.is_set() else None
+
+    def release(self, namespace: str) -> None:
+        """
+        Stop watching namespace
+        """
+        with self._lock:
+            cache = self._caches.pop(namespace, None)
+        if cache is not None:
+            cache.stop()
+
+    def namespaces(self) -> List[str]:
+        with self._lock:
+            return list(self._caches)
+
+    def get(self, namespace: str, name: str) -> Optional[Any]:
+        with self._lock:
+            cache = self._caches.get(namespace)
+        return cache.get(namespace, name) if cache is not None else None
+
+    def add_listener(self, callback: Callable[[str, Any], None]) -> Callable[[], None]:
+        """
+        Call callback(event type, object) for each change in any watched namespace,
+        see ResourceCache.add_listener
+        :return: a function removing the listener
+        """
+        listener: Listener = (asyncio.get_running_loop(), callback)
+        # the list is shared with the caches of all namespaces
+        self._listeners.append(listener)
+
+        def remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove
+
+
+def _key(obj: Any) -> ObjectKey:
+    meta = _metadata(obj)
+    return meta.get("namespace"), meta["name"]
+
+
+def _fulfills(condition: Callable[[Any], bool], obj: Any) -> bool:
+    try:
+        return bool(condition(obj))
+    except Exception:
+        # e.g. the status of a pod is not populated yet
+        return False
+
+
+def _resolve(future: asyncio.Future, obj: Any) -> None:
+    if not future.done():
+        future.set_result(obj)
+
+
+def _match_labels(obj: Any, labels: Optional[Dict[str, str]]) -> bool:
+    if not labels:
+        return True
+    obj_labels = _metadata(obj).get("labels") or {}
+    return all(obj_labels.get(key) == value for key, value in labels.items())
+
+
+custom_object_api = k8s.client.CustomObjectsApi()
+core_v1_api = k8s.client.CoreV1Api()
+
+bridges = ResourceCache(
+    "gefyrabridges",
+    custom_object_api.list_namespaced_custom_object,
+    "gefyra.dev",
+    "v1",
+    configuration.NAMESPACE,
+    "gefyrabridges",
+    indexers={
+        "bridge-mount": label_indexer("gefyra.dev/bridge-mount"),
+        "client": label_indexer("gefyra.dev/client"),
+    },
+)
+bridge_mounts = ResourceCache(
+    "gefyrabridgemounts",
+    custom_object_api.list_namespaced_custom_object,
+    "gefyra.dev",
+    "v1",
+    configuration.NAMESPACE,
+    "gefyrabridgemounts",
+    indexers={
+        "target": lambda obj: (
+            [f"{obj.get('targetNamespace')}/{obj.get('target')}"]
+            if obj.get("target")
+            else []
+        )
+    },
+)
+pods = NamespacedResourceCaches(
+    "pods",
+    core_v1_api.list_namespaced_pod,
+    indexers={"owner": owner_indexer},
+)
+proxy_services = ResourceCache(
+    "stowaway-proxy-services",
+    core_v1_api.list_namespaced_service,
+    configuration.NAMESPACE,
+    list_kwargs={"label_selector": "gefyra.dev/app=stowaway,gefyra.dev/role=proxy"},
+    indexers={"destination": destination_indexer},
+)
+RESOURCE_CACHES = (bridges, bridge_mounts, pods, proxy_services)
+
+
+def start_resource_caches(caches: Iterable[ResourceCache] = RESOURCE_CACHES) -> None:
+    if not configuration.RESOURCE_CACHE:
+        return
+    for cache in caches:
+        cache.start()
+
+
+def stop_resource_caches() -> None:
+    for cache in RESOURCE_CACHES:
+        cache.stop()
+
+
+def cached_bridges(
+    namespace: str,
+    bridge_mount: Optional[str] = None,
+    client: Optional[str] = None,
+) -> Optional[List[dict]]:
+    """
+    The GefyraBridges in namespace, optionally only those of a GefyraBridgeMount
+    and/or a GefyraClient (by their labels)
+    :return: None if the cache is not synced, the caller must ask the API server
+    """
+    if not bridges.synced.is_set():
+        return None
+    labels = {}
+    if bridge_mount is not None:
+        labels["gefyra.dev/bridge-mount"] = bridge_mount
+    if client is not None:
+        labels["gefyra.dev/client"] = client
+    if bridge_mount is not None:
+        items = bridges.by_index("bridge-mount", bridge_mount, namespace)
+    elif client is not None:
+        items = bridges.by_index("client", client, namespace)
+    else:
+        items = bridges.list(namespace)
+    return [item for item in items if _match_labels(item, labels)]
+
+
+def cached_bridge_mounts(
+    namespace: str, target: Optional[str] = None, target_namespace: str = ""
+) -> Optional[List[dict]]:
+    """
+    The GefyraBridgeMounts in namespace, optionally only those for a target workload
+    :return: None if the cache is not synced, the caller must ask the API server
+    """
+    if not bridge_mounts.synced.is_set():
+        return None
+    if target is not None:
+        return bridge_mounts.by_index(
+            "target", f"{target_namespace}/{target}", namespace
+        )
+    return bridge_mounts.list(namespace)
+
+
+def cached_pods(
+    namespace: str, labels: Dict[str, str]
+) -> Optional[k8s.client.V1PodList]:
+    """
+    The pods in namespace carrying all of the given labels, copies the caller may
+    modify
+    :return: None if the cache is not synced, the caller must ask the API server
+    """
+    namespace_pods = pods.cache(namespace)
+    if namespace_pods is None:
+        return None
+    return k8s.client.V1PodList(
+        items=[deepcopy(pod) for pod in namespace_pods.list(namespace, labels)]
+    )
+
+
+def cached_proxy_services(
+    namespace: str, client_id: Optional[str] = None, destination: Optional[str] = None
+) -> Optional[List[k8s.client.V1Service]]:
+    """
+    The Stowaway proxy services in namespace, optionally only the one of a client's
+    destination ("<ip>_<port>", requires client_id)
+    :return: None if the cache is not synced, the caller must ask the API server
+    """
+    if not proxy_services.synced.is_set():
+        return None
+    if client_id is not None and destination is not None:
+        return proxy_services.by_index(
+            "destination", f"{client_id}/{destination}", namespace
+        )
+    labels = {"gefyra.dev/client-id": client_id} if client_id is not None else None
+    return proxy_services.list(namespace, labels)
+
+
+async def wait_for_pod(
+    namespace: str, name: str, condition: Callable[[Any], bool], timeout: float
+) -> Optional[k8s.client.V1Pod]:
+    """
+    Wait until the pod fulfills condition, e.g. a container has been restarted
+    :return: None if the cache is not synced, the caller must poll the API server;
+      otherwise a copy of the pod
+    :raises RuntimeError: if the condition is not fulfilled within timeout seconds
+    """
+    namespace_pods = pods.cache(namespace)
+    if namespace_pods is None:
+        return None
+    return deepcopy(await namespace_pods.wait_for(namespace, name, condition, timeout))
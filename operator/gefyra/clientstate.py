@@ -8,7 +8,12 @@ import kopf
 import kubernetes as k8s
 from statemachine import State, StateChart
 
-from gefyra.base import GefyraStateObject, StateControllerMixin
+from gefyra.base import (
+    GefyraStateObject,
+    StateControllerMixin,
+    custom_api,
+    events_api,
+)
 from gefyra.configuration import OperatorConfiguration
 from gefyra.resources.serviceaccounts import (
     get_serviceaccount_data,
@@ -80,8 +85,8 @@ class GefyraClient(StateChart, StateControllerMixin):  # Reverted to StateMachin
         self.data = model.data
         self.operator_configuration = configuration
         self.logger = logger
-        self.custom_api = k8s.client.CustomObjectsApi()
-        self.events_api = k8s.client.EventsV1Api()
+        self.custom_api = custom_api
+        self.events_api = events_api
         self._connection_provider = None
 
     @property
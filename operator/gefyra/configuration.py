@@ -1,4 +1,4 @@
-from decouple import config
+from decouple import Choices, config
 
 
 class OperatorConfiguration:
@@ -26,6 +26,14 @@ class OperatorConfiguration:
         self.STOWAWAY_INTERNAL_SUBNET = config(
             "GEFYRA_INTERNAL_SUBNET", default="192.168.99.0"
         )
+        # add and remove peers on the running wg0 interface instead of restarting Stowaway
+        self.STOWAWAY_LIVE_PEER_MANAGEMENT = config(
+            "GEFYRA_STOWAWAY_LIVE_PEER_MANAGEMENT", default=True, cast=bool
+        )
+        # seconds to collect peer changes into one Stowaway reconfiguration, 0 disables batching
+        self.STOWAWAY_PEER_BATCH_WINDOW = config(
+            "GEFYRA_STOWAWAY_PEER_BATCH_WINDOW", cast=float, default=0.5
+        )
 
         self.STOWAWAY_PROXYROUTE_CONFIGMAPNAME = "gefyra-stowaway-proxyroutes"
         self.STOWAWAY_CONFIGMAPNAME = "gefyra-stowaway-config"
@@ -54,6 +62,43 @@ class OperatorConfiguration:
         self.CARRIER_RUNNING_TIMEOUT = config(
             "GEFYRA_CARRIER_RUNNING_TIMEOUT", cast=int, default=30
         )
+        # seconds an unused exec session to a Carrier2 container is kept open
+        self.CARRIER2_EXEC_SESSION_IDLE_TIMEOUT = config(
+            "GEFYRA_CARRIER2_EXEC_SESSION_IDLE_TIMEOUT", cast=int, default=300
+        )
+        # pods of a GefyraBridgeMount Carrier2 is installed into at the same time
+        self.CARRIER2_INSTALL_PARALLELISM = config(
+            "GEFYRA_CARRIER2_INSTALL_PARALLELISM", cast=int, default=5
+        )
+        # "fail-fast" stops installing Carrier2 at the first failing pod, "continue"
+        # installs into all remaining pods before the failure is raised
+        self.CARRIER2_INSTALL_POLICY = config(
+            "GEFYRA_CARRIER2_INSTALL_POLICY",
+            default="fail-fast",
+            cast=Choices(["fail-fast", "continue"]),
+        )
+        # "exec" writes the Carrier2 config into each container, "configmap" stores it
+        # once per GefyraBridgeMount and the containers fetch it from the operator
+        self.CARRIER2_CONFIG_DELIVERY = config(
+            "GEFYRA_CARRIER2_CONFIG_DELIVERY",
+            default="exec",
+            cast=Choices(["exec", "configmap"]),
+        )
+        # port the operator serves the stored Carrier2 configs on
+        self.CARRIER2_CONFIG_PORT = config(
+            "GEFYRA_CARRIER2_CONFIG_PORT", cast=int, default=8081
+        )
+
+        # threads running Kubernetes API calls, also the connection pool size per API client
+        self.KUBERNETES_API_THREADS = config(
+            "GEFYRA_KUBERNETES_API_THREADS", cast=int, default=64
+        )
+        # answer reads of GefyraBridges, GefyraBridgeMounts and pods from watched caches,
+        # pods are watched only in the namespaces targeted by GefyraBridgeMounts
+        self.RESOURCE_CACHE = config("GEFYRA_RESOURCE_CACHE", default=True, cast=bool)
+
+        # port of the Prometheus metrics endpoint (/metrics), 0 disables it
+        self.METRICS_PORT = config("GEFYRA_METRICS_PORT", cast=int, default=0)
 
         self.BRIDGE_MOUNT_MISSING_GRACE_PERIOD = config(
             "GEFYRA_BRIDGE_MOUNT_MISSING_GRACE_PERIOD", cast=int, default=86400
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 class AbstractGefyraConnectionProvider(ABC):
@@ -102,6 +102,16 @@ class AbstractGefyraConnectionProvider(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_destinations(
+        self, peer_id: Optional[str] = None
+    ) -> Dict[Tuple[str, str, int], str]:
+        """
+        Returns the service URLs of all existing destinations (optionally of one peer)
+        by (peer_id, destination_ip, destination_port)
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def validate(self, gclient: dict, hints: Dict[Any, Any]):
         """
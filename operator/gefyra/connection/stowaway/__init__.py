@@ -1,10 +1,10 @@
 import random
 import re
+import shlex
 import string
 from collections import defaultdict
 from os import path
-import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from gefyra.connection.stowaway.resources.configmaps import (
     create_stowaway_proxyroute_configmap,
 )
@@ -14,10 +14,25 @@ import kopf
 import kubernetes as k8s
 import asyncio
 
-from gefyra.utils import exec_command_pod, get_label_selector, stream_copy_from_pod
+from gefyra import cache
+from gefyra.metrics import stowaway_reloads, timed
+from gefyra.utils import (
+    exec_command_pod,
+    get_label_selector,
+    stream_read_files_from_pod,
+)
 from gefyra.connection.abstract import AbstractGefyraConnectionProvider
 from gefyra.configuration import OperatorConfiguration
 
+from .peers import (
+    PEER_ADD,
+    PEER_REMOVE,
+    PeerChange,
+    PeerChangeQueue,
+    PeerChangeSuperseded,
+    PeerCredentialCache,
+)
+from .routes import ProxyRouteTable
 from .components import (
     check_config_configmap,
     check_proxyroute_configmap,
@@ -38,10 +53,18 @@ from .components import (
 )
 
 
-# Module-level lock to serialize proxyroutes ConfigMap read-modify-write operations.
-# Without this, concurrent bridge activations race on the ConfigMap and overwrite
-# each other's entries, resulting in a partial nginx.conf in Stowaway.
+# Module-level table of the proxy routes. The operator is the only writer of the
+# proxyroutes ConfigMap, hence lookups are served from memory; the table is refreshed
+# by the periodic proxy route reconciliation. The lock serializes writers of this
+# process (one patch each, no re-read), the resourceVersion sent with every patch
+# detects any other writer, upon which the table is rebuilt and the write retried.
+_proxyroute_table = ProxyRouteTable()
 _proxyroutes_configmap_lock = asyncio.Lock()
+PROXYROUTE_WRITE_RETRIES = 10
+# Coalesces peer changes of concurrently connecting clients into one Stowaway reload
+_peer_change_queue = PeerChangeQueue()
+# WireGuard connection details of the peers, read from Stowaway once per key
+_peer_credentials = PeerCredentialCache()
 
 app = k8s.client.AppsV1Api()
 core_v1_api = k8s.client.CoreV1Api()
@@ -59,6 +82,9 @@ PROXY_RELOAD_COMMAND = [
     "/stowaway/proxyroutes/",
 ]
 
+PEER_ADD_COMMAND = ["bash", "/app/add-peer"]
+PEER_REMOVE_COMMAND = ["bash", "/app/remove-peer"]
+
 WIREGUARD_CIDR_PATTERN = re.compile(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\/\d{1,3}$")
 
 
@@ -84,7 +110,7 @@ class Stowaway(AbstractGefyraConnectionProvider):
                 pod.metadata.name,
                 pod.metadata.namespace,
                 "stowaway",
-                ["wg"],
+                ["wg", "show", "all", "dump"],
             )
         except Exception as e:
             self.logger.error(f"Unable to read Wireguard status: {e}")
@@ -130,12 +156,13 @@ class Stowaway(AbstractGefyraConnectionProvider):
 
     async def ready(self) -> bool:
         pod = await self._get_stowaway_pod()
+        return self._pod_ready(pod)
+
+    @staticmethod
+    def _pod_ready(pod: Optional[k8s.client.V1Pod]) -> bool:
         # check if stowaway pod is ready
         if pod and pod.status.container_statuses is not None:
-            if pod.status.container_statuses[0].ready:
-                return True
-            else:
-                return False
+            return bool(pod.status.container_statuses[0].ready)
         else:
             return False
 
@@ -145,11 +172,11 @@ class Stowaway(AbstractGefyraConnectionProvider):
             f"Adding peer {peer_id} to stowaway with parameters: {parameters}"
         )
         try:
-            await self._edit_peer_configmap(
-                add=peer_id, subnet=parameters.get("subnet")
+            await _peer_change_queue.submit(
+                self._apply_peer_changes,
+                PeerChange(peer_id, PEER_ADD, parameters.get("subnet")),
+                self.configuration.STOWAWAY_PEER_BATCH_WINDOW,
             )
-            await self._restart_stowaway()
-            await asyncio.sleep(1)
         except k8s.client.exceptions.ApiException as e:
             self.logger.error(
                 f"Error adding peer {peer_id} to stowaway: Status {e.status} Reason {e.reason} Body {e.body}"
@@ -158,7 +185,50 @@ class Stowaway(AbstractGefyraConnectionProvider):
     async def remove_peer(self, peer_id: str):
         self.logger.info(f"Removing peer {peer_id} from stowaway")
         try:
-            await self._edit_peer_configmap(remove=peer_id)
+            await _peer_change_queue.submit(
+                self._apply_peer_changes,
+                PeerChange(peer_id, PEER_REMOVE),
+                self.configuration.STOWAWAY_PEER_BATCH_WINDOW,
+            )
+            return True
+        except PeerChangeSuperseded as e:
+            self.logger.warning(f"Peer {peer_id} has not been removed: {e}")
+            return False
+        except k8s.client.exceptions.ApiException as e:
+            self.logger.error(
+                f"Error removing peer {peer_id} from stowaway: Status {e.status} Reason {e.reason} Body {e.body}"
+            )
+            return False
+
+    async def _apply_peer_changes(self, changes: List[PeerChange]) -> None:
+        """
+        Apply a batch of peer changes with one ConfigMap write and one reload
+        of Stowaway
+        """
+        self.logger.info(
+            f"Applying {len(changes)} peer change(s) to stowaway: "
+            f"{[(c.action, c.peer_id) for c in changes]}"
+        )
+        try:
+            await self._apply_peer_changes_to_stowaway(changes)
+        finally:
+            # adding or removing a peer creates or drops its keys
+            for change in changes:
+                _peer_credentials.invalidate(change.peer_id)
+
+    async def _apply_peer_changes_to_stowaway(self, changes: List[PeerChange]) -> None:
+        await self._edit_peer_configmap(
+            add={c.peer_id: c.subnet for c in changes if c.action == PEER_ADD},
+            remove=[c.peer_id for c in changes if c.action == PEER_REMOVE],
+        )
+        if await self._live_edit_peers(changes):
+            return
+        removed = [
+            f"/config/peer_{self._translate_peer_name(c.peer_id)}"
+            for c in changes
+            if c.action == PEER_REMOVE
+        ]
+        if removed:
             pod = await self._get_stowaway_pod()
             if pod is None:
                 raise RuntimeError("No Stowaway Pod found for peer removal")
@@ -168,16 +238,10 @@ class Stowaway(AbstractGefyraConnectionProvider):
                 pod.metadata.name,
                 pod.metadata.namespace,
                 "stowaway",
-                ["rm", "-rf", f"/config/peer_{self._translate_peer_name(peer_id)}"],
+                ["rm", "-rf"] + removed,
             )
-            await self._restart_stowaway()
-            await asyncio.sleep(1)
-            return True
-        except k8s.client.exceptions.ApiException as e:
-            self.logger.error(
-                f"Error removing peer {peer_id} from stowaway: Status {e.status} Reason {e.reason} Body {e.body}"
-            )
-            return False
+        await self._restart_stowaway()
+        await asyncio.sleep(1)
 
     async def peer_exists(self, peer_id: str) -> bool:
         _config = create_stowaway_configmap()
@@ -239,25 +303,13 @@ class Stowaway(AbstractGefyraConnectionProvider):
     async def get_destination(
         self, peer_id: str, destination_ip: str, destination_port: int
     ) -> str:
-        svcs = await asyncio.to_thread(
-            core_v1_api.list_namespaced_service,
-            namespace=self.configuration.NAMESPACE,
-            label_selector=get_label_selector(
-                {
-                    "gefyra.dev/app": "stowaway",
-                    "gefyra.dev/role": "proxy",
-                    "gefyra.dev/client-id": peer_id,
-                    "gefyra.dev/destination": f"{destination_ip}_{destination_port}",
-                }
-            ),
-        )
-        if len(svcs.items) == 0:
+        svc = await self._get_proxy_service(peer_id, destination_ip, destination_port)
+        if svc is None:
             raise RuntimeError(
                 f"Error looking up destination {destination_ip}:{destination_port} for"
                 f" client {peer_id}: no proxy service found"
             )
-        _, stowaway_port = svcs.items[0].metadata.name.rsplit("-", 1)
-        return f"{svcs.items[0].metadata.name}.{self.configuration.NAMESPACE}.svc.cluster.local:{stowaway_port}"
+        return self._proxy_service_url(svc)
 
     async def remove_destination(
         self, peer_id: str, destination_ip: str, destination_port: int
@@ -309,35 +361,20 @@ class Stowaway(AbstractGefyraConnectionProvider):
     async def destination_exists(
         self, peer_id: str, destination_ip: str, destination_port: int
     ) -> bool:
-        _config = create_stowaway_proxyroute_configmap()
         try:
             # check if endpoint service exists
-            svcs = await asyncio.to_thread(
-                core_v1_api.list_namespaced_service,
-                namespace=self.configuration.NAMESPACE,
-                label_selector=get_label_selector(
-                    {
-                        "gefyra.dev/app": "stowaway",
-                        "gefyra.dev/role": "proxy",
-                        "gefyra.dev/client-id": peer_id,
-                        "gefyra.dev/destination": f"{destination_ip}_{destination_port}",
-                    }
-                ),
-            )
-            if len(svcs.items) == 0:
+            if (
+                await self._get_proxy_service(peer_id, destination_ip, destination_port)
+                is None
+            ):
                 return False
 
-            configmap = await asyncio.to_thread(
-                core_v1_api.read_namespaced_config_map,
-                _config.metadata.name,
-                _config.metadata.namespace,
+            if not _proxyroute_table.loaded:
+                await self._load_proxyroute_table()
+            return (
+                _proxyroute_table.find(f"{destination_ip}:{destination_port}")
+                is not None
             )
-            if configmap.data is None:
-                return False
-            for k, v in configmap.data.items():
-                if f"{destination_ip}:{destination_port}" in v:
-                    return True
-            return False
         except k8s.client.exceptions.ApiException as e:
             self.logger.error(
                 f"Error looking up destination {destination_ip}:{destination_port} for"
@@ -345,6 +382,76 @@ class Stowaway(AbstractGefyraConnectionProvider):
             )
             return False
 
+    async def get_destinations(
+        self, peer_id: Optional[str] = None
+    ) -> Dict[Tuple[str, str, int], str]:
+        """
+        All existing destinations with one lookup of the proxy services, e.g. to check
+        many GefyraBridges at once
+        :param peer_id: only the destinations of this peer
+        :return: the service URL by (peer_id, destination_ip, destination_port)
+        """
+        svcs = cache.cached_proxy_services(self.configuration.NAMESPACE, peer_id)
+        if svcs is None:
+            labels = {"gefyra.dev/app": "stowaway", "gefyra.dev/role": "proxy"}
+            if peer_id is not None:
+                labels["gefyra.dev/client-id"] = peer_id
+            svcs = (
+                await asyncio.to_thread(
+                    core_v1_api.list_namespaced_service,
+                    namespace=self.configuration.NAMESPACE,
+                    label_selector=get_label_selector(labels),
+                )
+            ).items
+        if not _proxyroute_table.loaded:
+            await self._load_proxyroute_table()
+        destinations = {}
+        for svc in svcs:
+            svc_labels = svc.metadata.labels or {}
+            client_id = svc_labels.get("gefyra.dev/client-id")
+            destination = svc_labels.get("gefyra.dev/destination", "")
+            if not client_id or "_" not in destination:
+                continue
+            destination_ip, destination_port = destination.rsplit("_", 1)
+            if _proxyroute_table.find(f"{destination_ip}:{destination_port}") is None:
+                continue
+            destinations[(client_id, destination_ip, int(destination_port))] = (
+                self._proxy_service_url(svc)
+            )
+        return destinations
+
+    async def _get_proxy_service(
+        self, peer_id: str, destination_ip: str, destination_port: int
+    ) -> Optional[k8s.client.V1Service]:
+        """
+        The proxy service of a destination from the watched cache; a miss is confirmed
+        with the API server, as the watch may lag behind a just created service
+        """
+        destination = f"{destination_ip}_{destination_port}"
+        svcs = cache.cached_proxy_services(
+            self.configuration.NAMESPACE, peer_id, destination
+        )
+        if not svcs:
+            svcs = (
+                await asyncio.to_thread(
+                    core_v1_api.list_namespaced_service,
+                    namespace=self.configuration.NAMESPACE,
+                    label_selector=get_label_selector(
+                        {
+                            "gefyra.dev/app": "stowaway",
+                            "gefyra.dev/role": "proxy",
+                            "gefyra.dev/client-id": peer_id,
+                            "gefyra.dev/destination": destination,
+                        }
+                    ),
+                )
+            ).items
+        return svcs[0] if svcs else None
+
+    def _proxy_service_url(self, svc: k8s.client.V1Service) -> str:
+        _, stowaway_port = svc.metadata.name.rsplit("-", 1)
+        return f"{svc.metadata.name}.{self.configuration.NAMESPACE}.svc.cluster.local:{stowaway_port}"
+
     async def validate(self, gclient: dict, hints: Dict[Any, Any] = {}):
         if wireguard_parameter := gclient.get("providerParameter"):
             if subnet := wireguard_parameter.get("subnet"):
@@ -375,10 +482,56 @@ class Stowaway(AbstractGefyraConnectionProvider):
                 continue
         return False
 
+    async def _live_edit_peers(self, changes: List[PeerChange]) -> bool:
+        """
+        Add or remove peers on the running wg0 interface of Stowaway, other peers
+        are not disturbed. The PEERS ConfigMap remains the persisted state.
+        :return: False if the live mode is disabled or failed, a restart is required
+        """
+        if not self.configuration.STOWAWAY_LIVE_PEER_MANAGEMENT:
+            return False
+        pod = await self._get_stowaway_pod()
+        if not self._pod_ready(pod):
+            return False
+        commands = []
+        for change in changes:
+            command = (
+                PEER_ADD_COMMAND if change.action == PEER_ADD else PEER_REMOVE_COMMAND
+            )
+            args = [self._translate_peer_name(change.peer_id)]
+            if change.subnet:
+                args.append(change.subnet)
+            commands.append(" ".join(shlex.quote(arg) for arg in command + args))
+        try:
+            output = await asyncio.to_thread(
+                exec_command_pod,
+                core_v1_api,
+                pod.metadata.name,
+                pod.metadata.namespace,
+                "stowaway",
+                ["bash", "-c", "; ".join(commands)],
+            )
+        except Exception as e:
+            self.logger.warning(f"Live peer update in Stowaway failed: {e}")
+            return False
+        for change in changes:
+            marker = "ADDED" if change.action == PEER_ADD else "REMOVED"
+            if f"PEER {self._translate_peer_name(change.peer_id)} {marker}" not in (
+                output or ""
+            ):
+                self.logger.warning(
+                    f"Live peer update for {change.peer_id} failed, restarting Stowaway: {output}"
+                )
+                return False
+        stowaway_reloads.inc(mode="live")
+        return True
+
+    @timed("stowaway_restart")
     async def _restart_stowaway(self) -> None:
         pod = await self._get_stowaway_pod()
         if pod is None:
             raise RuntimeError("No Stowaway Pod found for restart")
+        stowaway_reloads.inc(mode="restart")
         await asyncio.to_thread(
             core_v1_api.delete_namespaced_pod,
             pod.metadata.name,
@@ -395,11 +548,13 @@ class Stowaway(AbstractGefyraConnectionProvider):
             _i += 1
 
     async def _get_stowaway_pod(self) -> Optional[k8s.client.V1Pod]:
-        stowaway_pod = await asyncio.to_thread(
-            core_v1_api.list_namespaced_pod,
-            self.configuration.NAMESPACE,
-            label_selector=get_label_selector(STOWAWAY_LABELS),
-        )
+        stowaway_pod = cache.cached_pods(self.configuration.NAMESPACE, STOWAWAY_LABELS)
+        if stowaway_pod is None:
+            stowaway_pod = await asyncio.to_thread(
+                core_v1_api.list_namespaced_pod,
+                self.configuration.NAMESPACE,
+                label_selector=get_label_selector(STOWAWAY_LABELS),
+            )
         if stowaway_pod.items and len(stowaway_pod.items) > 0:
             return stowaway_pod.items[0]
         else:
@@ -424,38 +579,36 @@ class Stowaway(AbstractGefyraConnectionProvider):
 
     async def _edit_peer_configmap(
         self,
-        add: Optional[str] = None,
-        remove: Optional[str] = None,
-        subnet: Optional[str] = None,
+        add: Optional[Dict[str, Optional[str]]] = None,
+        remove: Optional[List[str]] = None,
     ) -> None:
+        """
+        Add and remove peers to/from the PEERS ConfigMap with a single write
+        :param add: the peers to be added, mapped to their optional subnet
+        :param remove: the peers to be removed
+        """
         _config = create_stowaway_configmap()
         configmap = await asyncio.to_thread(
             core_v1_api.read_namespaced_config_map,
             _config.metadata.name,
             _config.metadata.namespace,
         )
-        if add:
-            add = self._translate_peer_name(add)
-        if remove:
-            remove = self._translate_peer_name(remove)
         peers = configmap.data["PEERS"].split(",")
-        if add and add not in peers:
-            peers = [add] + peers
-            data = {"PEERS": ",".join(peers)}
-            if subnet:
-                data[f"SERVER_ALLOWEDIPS_PEER_{add}"] = subnet
-            await asyncio.to_thread(
-                core_v1_api.patch_namespaced_config_map,
-                name=configmap.metadata.name,
-                namespace=configmap.metadata.namespace,
-                body={"data": data},
-            )
-        if remove and remove in peers:
-            peers.remove(remove)
-            try:
-                del configmap.data[f"SERVER_ALLOWEDIPS_PEER_{remove}"]
-            except KeyError:
-                pass
+        changed = False
+        for peer_id, subnet in (add or {}).items():
+            peer = self._translate_peer_name(peer_id)
+            if peer not in peers:
+                peers = [peer] + peers
+                if subnet:
+                    configmap.data[f"SERVER_ALLOWEDIPS_PEER_{peer}"] = subnet
+                changed = True
+        for peer_id in remove or []:
+            peer = self._translate_peer_name(peer_id)
+            if peer in peers:
+                peers.remove(peer)
+                configmap.data.pop(f"SERVER_ALLOWEDIPS_PEER_{peer}", None)
+                changed = True
+        if changed:
             configmap.data["PEERS"] = ",".join(peers)
             await asyncio.to_thread(
                 core_v1_api.replace_namespaced_config_map,
@@ -467,23 +620,33 @@ class Stowaway(AbstractGefyraConnectionProvider):
     def _translate_peer_name(self, peer_id: str) -> str:
         return re.sub(f"[^{string.printable[:62]}]", "000", peer_id)
 
-    async def _get_free_proxyroute_port(self) -> int:
+    async def _load_proxyroute_table(
+        self, configmap: Optional[k8s.client.V1ConfigMap] = None
+    ) -> None:
+        if configmap is None:
+            _config = create_stowaway_proxyroute_configmap()
+            configmap = await asyncio.to_thread(
+                core_v1_api.read_namespaced_config_map,
+                _config.metadata.name,
+                _config.metadata.namespace,
+            )
+        _proxyroute_table.load(configmap)
+
+    async def _refresh_proxyroute_table(self) -> k8s.client.V1ConfigMap:
+        """
+        Rebuild the proxy route table from the ConfigMap, e.g. to pick up changes
+        made outside of this process
+        :return: the read ConfigMap
+        """
         _config = create_stowaway_proxyroute_configmap()
-        configmap = await asyncio.to_thread(
-            core_v1_api.read_namespaced_config_map,
-            _config.metadata.name,
-            _config.metadata.namespace,
-        )
-        routes = configmap.data
-        # the values ar stored as "to_ip:to_port,proxy_port"
-        if routes:
-            taken_ports = [int(v.split(",")[1]) for v in routes.values()]
-        else:
-            taken_ports = []
-        for port in range(10000, 60000):
-            if port not in taken_ports:
-                return port
-        raise RuntimeError("No free port found for proxy route")
+        async with _proxyroutes_configmap_lock:
+            configmap = await asyncio.to_thread(
+                core_v1_api.read_namespaced_config_map,
+                _config.metadata.name,
+                _config.metadata.namespace,
+            )
+            _proxyroute_table.load(configmap)
+        return configmap
 
     async def _edit_proxyroutes_configmap(
         self,
@@ -491,52 +654,60 @@ class Stowaway(AbstractGefyraConnectionProvider):
         add: Optional[str] = None,
         remove: Optional[str] = None,
     ) -> int:
+        if not add and not remove:
+            raise ValueError("Either the add or remove parameter must be set")
+        _config = create_stowaway_proxyroute_configmap()
         async with _proxyroutes_configmap_lock:
-            _config = create_stowaway_proxyroute_configmap()
-            configmap = await asyncio.to_thread(
-                core_v1_api.read_namespaced_config_map,
-                _config.metadata.name,
-                _config.metadata.namespace,
-            )
-            routes = configmap.data
-            if routes is None:
-                routes = {}
-            if add:
-                stowaway_port = await self._get_free_proxyroute_port()
-                routes[
-                    f"{peer_id}-{''.join(random.choices(string.ascii_lowercase, k=10))}"
-                ] = f"{add},{stowaway_port}"
-                await asyncio.to_thread(
-                    core_v1_api.patch_namespaced_config_map,
-                    name=configmap.metadata.name,
-                    namespace=configmap.metadata.namespace,
-                    body={"data": routes},
-                )
-                return int(stowaway_port)
-            elif remove:
-                to_be_deleted = None
-                stowaway_port = 0
-                for k, v in routes.items():
-                    if v.split(",")[0] == remove:
-                        to_be_deleted = k
-                        stowaway_port = v.split(",")[1]
-                if to_be_deleted:
-                    del routes[to_be_deleted]
-                    configmap.data = routes
-                    await asyncio.to_thread(
-                        core_v1_api.replace_namespaced_config_map,
-                        name=configmap.metadata.name,
-                        namespace=configmap.metadata.namespace,
-                        body=configmap,
+            for _ in range(PROXYROUTE_WRITE_RETRIES):
+                if not _proxyroute_table.loaded:
+                    await self._load_proxyroute_table()
+                if add:
+                    key = f"{peer_id}-{''.join(random.choices(string.ascii_lowercase, k=10))}"
+                    stowaway_port = _proxyroute_table.next_free_port()
+                    data = {key: f"{add},{stowaway_port}"}
+                else:
+                    route = _proxyroute_table.find(remove)
+                    if route is None:
+                        return 0
+                    key, stowaway_port = route
+                    # a null value deletes the key
+                    data = {key: None}
+                try:
+                    # only the changed route is sent
+                    configmap = await asyncio.to_thread(
+                        core_v1_api.patch_namespaced_config_map,
+                        name=_config.metadata.name,
+                        namespace=_config.metadata.namespace,
+                        body={
+                            "metadata": {
+                                "resourceVersion": _proxyroute_table.resource_version
+                            },
+                            "data": data,
+                        },
                     )
-                return int(stowaway_port)
-            else:
-                raise ValueError("Either the add or remove parameter must be set")
+                except k8s.client.exceptions.ApiException as e:
+                    _proxyroute_table.invalidate()
+                    if e.status != 409:
+                        raise e
+                    # the routes have been changed by another writer, rebuild and retry
+                    self.logger.info("Proxy routes changed concurrently, retrying")
+                    continue
+                if add:
+                    _proxyroute_table.add(key, add, stowaway_port)
+                else:
+                    _proxyroute_table.remove(remove)
+                _proxyroute_table.resource_version = configmap.metadata.resource_version
+                return stowaway_port
+        raise RuntimeError(
+            f"Could not write proxy routes after {PROXYROUTE_WRITE_RETRIES} attempts"
+        )
 
     async def _get_wireguard_connection_details(self, peer_id: str) -> dict[str, str]:
         pod = await self._get_stowaway_pod()
         if pod is None:
             raise RuntimeError("No Stowaway Pod found for peer lookup")
+        if cached := _peer_credentials.get(peer_id, pod.metadata.uid):
+            return cached
         peer_config_file = path.join(
             self.configuration.STOWAWAY_PEER_CONFIG_PATH,
             f"peer_{self._translate_peer_name(peer_id)}",
@@ -551,35 +722,21 @@ class Stowaway(AbstractGefyraConnectionProvider):
             f"Copy peer {peer_id} connection details from Pod "
             f"{pod.metadata.name}:{peer_config_file}"
         )
-        tmpfile_conf = f"/tmp/peer_{self._translate_peer_name(peer_id)}.conf"
-        tmpfile_pubkey = f"/tmp/peer_{self._translate_peer_name(peer_id)}.pubkey"
-        await asyncio.to_thread(
-            stream_copy_from_pod,
-            pod.metadata.name,
-            self.configuration.NAMESPACE,
-            peer_config_file,
-            tmpfile_conf,
-        )
-        await asyncio.to_thread(
-            stream_copy_from_pod,
+        files = await asyncio.to_thread(
+            stream_read_files_from_pod,
             pod.metadata.name,
             self.configuration.NAMESPACE,
-            peer_public_key,
-            tmpfile_pubkey,
+            [peer_config_file, peer_public_key],
         )
 
         # Wireguard config is unfortunately no valid TOML
-        with open(tmpfile_conf, "r") as f:
-            peer_connection_details_raw = f.read()
-        os.remove(tmpfile_conf)
-        with open(tmpfile_pubkey, "r") as f:
-            peer_connection_pubkey = f.read()
-        os.remove(tmpfile_pubkey)
-
         peer_connection_details = self._read_wireguard_config(
-            peer_connection_details_raw
+            files[peer_config_file].decode()
+        )
+        peer_connection_details["Interface.PublicKey"] = (
+            files[peer_public_key].decode().strip()
         )
-        peer_connection_details["Interface.PublicKey"] = peer_connection_pubkey.strip()
+        _peer_credentials.put(peer_id, pod.metadata.uid, peer_connection_details)
         return peer_connection_details
 
     def _read_wireguard_config(self, raw: str) -> dict[str, str]:
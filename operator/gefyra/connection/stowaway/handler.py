@@ -8,10 +8,7 @@ import kubernetes as k8s
 from gefyra.connection.stowaway import Stowaway
 from gefyra.configuration import configuration
 
-from gefyra.connection.stowaway.utils import parse_wg_output
-from gefyra.connection.stowaway.resources.configmaps import (
-    create_stowaway_proxyroute_configmap,
-)
+from gefyra.connection.stowaway.utils import parse_wg_dump, wireguard_status_patch
 
 
 WIREGUARD_RECONCILIATION = 60
@@ -32,7 +29,8 @@ async def read_wireguard_status(logger):
     from gefyra.clientstate import GefyraClientObject, GefyraClient
 
     try:
-        raw_gefyra_clients = custom_object_api.list_namespaced_custom_object(
+        raw_gefyra_clients = await asyncio.to_thread(
+            custom_object_api.list_namespaced_custom_object,
             group="gefyra.dev",
             version="v1",
             plural="gefyraclients",
@@ -63,65 +61,50 @@ async def read_wireguard_status(logger):
         )
         return
     try:
-        wg_data = parse_wg_output(wg_status)
+        peers = parse_wg_dump(wg_status)
     except Exception as e:
         logger.error(f"Could not parse Wireguard status: {e}")
         return
-    else:
-        peer_data = wg_data["peers"]
-        for body in raw_gefyra_clients["items"]:
-            try:
-                obj = GefyraClientObject(body)
-                client = GefyraClient(obj, configuration, logger)
-                if client.active.is_active:
-                    try:
-                        peer_status = next(
-                            filter(
-                                lambda p: (
-                                    p["public_key"]
-                                    == client.data["providerConfig"][
-                                        "Interface.PublicKey"
-                                    ]
-                                ),
-                                peer_data,
-                            )
-                        )
-                    except StopIteration:
-                        logger.error(
-                            f"Found active GefyraClient '{client.client_name}', which has no Wireguard peer entry. Setting to waiting."
-                        )
-                        client.disable()
-                        continue
-                    except KeyError:
-                        # there is at least one client which has not yet set the "Interface.PublicKey", probably old
-                        pass
-                    else:
-                        if "status" not in client.data:
-                            await client._patch_object({"status": {}})
-                        if (
-                            "wireguard" in client.data["status"]
-                            and peer_status == client.data["status"]["wireguard"]
-                        ):
-                            continue
-                        else:
-                            if not peer_status.get("latest_handshake") and client.data[
-                                "status"
-                            ]["wireguard"].get("latest_handshake"):
-                                await client._patch_object(
-                                    {"status": {"wireguard": {}}}
-                                )
 
-                            await client._patch_object(
-                                {"status": {"wireguard": peer_status}}
-                            )
-                            # client.post_event(
-                            #     reason="GefyraClient connection",
-                            #     message="Updated Wireguard status (see .status.wireguard field)",
-                            # )
-            except Exception as e:
+    patches = []
+    for body in raw_gefyra_clients["items"]:
+        try:
+            obj = GefyraClientObject(body)
+            client = GefyraClient(obj, configuration, logger)
+            if not client.active.is_active:
+                continue
+            try:
+                public_key = client.data["providerConfig"]["Interface.PublicKey"]
+            except KeyError:
+                # there is at least one client which has not yet set the "Interface.PublicKey", probably old
+                continue
+            peer_status = peers.get(public_key)
+            if peer_status is None:
                 logger.error(
-                    f"Error processing Wireguard status for GefyraClient '{body['metadata']['name']}': {e}"
+                    f"Found active GefyraClient '{client.client_name}', which has no Wireguard peer entry. Setting to waiting."
                 )
+                client.disable()
+                continue
+            patch = wireguard_status_patch(
+                (client.data.get("status") or {}).get("wireguard"), peer_status
+            )
+            if patch:
+                patches.append(_patch_wireguard_status(client, patch, logger))
+        except Exception as e:
+            logger.error(
+                f"Error processing Wireguard status for GefyraClient '{body['metadata']['name']}': {e}"
+            )
+    # one patch per changed GefyraClient, all of them sent at once
+    await asyncio.gather(*patches)
+
+
+async def _patch_wireguard_status(client, patch: dict, logger):
+    try:
+        await client._patch_object({"status": {"wireguard": patch}})
+    except Exception as e:
+        logger.error(
+            f"Could not update Wireguard status of GefyraClient '{client.client_name}': {e}"
+        )
 
 
 async def reconcile_proxyroutes(logger):
@@ -130,12 +113,8 @@ async def reconcile_proxyroutes(logger):
         logger.info("Skipping proxy route status on Stowaway: currently not ready")
         return
 
-    _config = create_stowaway_proxyroute_configmap()
-    configmap = await asyncio.to_thread(
-        core_v1_api.read_namespaced_config_map,
-        _config.metadata.name,
-        _config.metadata.namespace,
-    )
+    # this also refreshes the operator's proxy route table
+    configmap = await stowaway._refresh_proxyroute_table()
     routes = configmap.data
     try:
         raw_gefyra_bridges = await asyncio.to_thread(
@@ -165,12 +144,20 @@ async def reconcile_proxyroutes(logger):
                     except Exception:
                         continue
                 configmap.data = {}
-                await asyncio.to_thread(
-                    core_v1_api.replace_namespaced_config_map,
-                    name=configmap.metadata.name,
-                    namespace=configmap.metadata.namespace,
-                    body=configmap,
-                )
+                try:
+                    configmap = await asyncio.to_thread(
+                        core_v1_api.replace_namespaced_config_map,
+                        name=configmap.metadata.name,
+                        namespace=configmap.metadata.namespace,
+                        body=configmap,
+                    )
+                except k8s.client.exceptions.ApiException as e:
+                    if e.status != 409:
+                        raise e
+                    # a route was added or removed meanwhile, check again next time
+                    logger.info("Proxy routes changed during reconciliation, skipping")
+                    return
+                await stowaway._load_proxyroute_table(configmap)
             return
         else:
             final_routes = {}
@@ -211,12 +198,20 @@ async def reconcile_proxyroutes(logger):
             if len(final_routes) != len(routes):
                 logger.warning("Old proxy routes detected, removing them")
                 configmap.data = final_routes
-                await asyncio.to_thread(
-                    core_v1_api.replace_namespaced_config_map,
-                    name=configmap.metadata.name,
-                    namespace=configmap.metadata.namespace,
-                    body=configmap,
-                )
+                try:
+                    configmap = await asyncio.to_thread(
+                        core_v1_api.replace_namespaced_config_map,
+                        name=configmap.metadata.name,
+                        namespace=configmap.metadata.namespace,
+                        body=configmap,
+                    )
+                except k8s.client.exceptions.ApiException as e:
+                    if e.status != 409:
+                        raise e
+                    # a route was added or removed meanwhile, check again next time
+                    logger.info("Proxy routes changed during reconciliation, skipping")
+                    return
+                await stowaway._load_proxyroute_table(configmap)
                 for svc in to_be_removed_svcs:
                     try:
                         logger.info(f"Removing: {svc}")
@@ -0,0 +1,125 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+PEER_ADD = "add"
+PEER_REMOVE = "remove"
+
+
+class PeerChangeSuperseded(RuntimeError):
+    """A queued peer change was replaced by an opposite change of the same peer"""
+
+
+@dataclass
+class PeerChange:
+    peer_id: str
+    action: str
+    subnet: Optional[str] = None
+    waiters: List[asyncio.Future] = field(default_factory=list)
+
+
+class PeerChangeQueue:
+    """
+    Coalesces add/remove operations of Stowaway peers. All changes submitted within
+    the batch window are applied together with one ConfigMap write and one reload
+    of Stowaway. Each submitter is resolved once its batch has been applied.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, PeerChange] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        # batches are applied one after another
+        self._apply_lock = asyncio.Lock()
+
+    async def submit(
+        self,
+        apply_func: Callable[[List[PeerChange]], Awaitable[None]],
+        change: PeerChange,
+        window: float,
+    ) -> None:
+        """
+        Queue a peer change and wait until it has been applied
+        :param apply_func: the coroutine function applying a batch of changes
+        :param change: the requested peer change
+        :param window: the time in seconds to collect further changes, 0 disables batching
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        if window <= 0:
+            change.waiters.append(waiter)
+            await self._apply(apply_func, [change])
+            return await waiter
+
+        if previous := self._pending.get(change.peer_id):
+            # the latest requested change of a peer wins
+            if previous.action == change.action:
+                change.waiters.extend(previous.waiters)
+            else:
+                # an opposite change is never applied, its submitters must not
+                # assume it took effect
+                for previous_waiter in previous.waiters:
+                    if not previous_waiter.done():
+                        previous_waiter.set_exception(
+                            PeerChangeSuperseded(
+                                f"Peer change '{previous.action}' of {change.peer_id} "
+                                f"was superseded by '{change.action}'"
+                            )
+                        )
+        change.waiters.append(waiter)
+        self._pending[change.peer_id] = change
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush(apply_func, window))
+        return await waiter
+
+    async def _flush(
+        self,
+        apply_func: Callable[[List[PeerChange]], Awaitable[None]],
+        window: float,
+    ) -> None:
+        await asyncio.sleep(window)
+        # changes arriving from now on open a new batch
+        batch = list(self._pending.values())
+        self._pending = {}
+        self._flusher = None
+        await self._apply(apply_func, batch)
+
+    async def _apply(
+        self,
+        apply_func: Callable[[List[PeerChange]], Awaitable[None]],
+        batch: List[PeerChange],
+    ) -> None:
+        async with self._apply_lock:
+            try:
+                await apply_func(batch)
+            except Exception as e:
+                for change in batch:
+                    for waiter in change.waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+            else:
+                for change in batch:
+                    for waiter in change.waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+
+
+class PeerCredentialCache:
+    """
+    The WireGuard connection details of peers as read from a Stowaway Pod. An entry
+    is valid until its peer is changed (i.e. re-keyed) or Stowaway's Pod is replaced.
+    """
+
+    def __init__(self):
+        self._credentials: Dict[str, Tuple[str, Dict[str, str]]] = {}
+
+    def get(self, peer_id: str, pod_uid: str) -> Optional[Dict[str, str]]:
+        if entry := self._credentials.get(peer_id):
+            uid, credentials = entry
+            if uid == pod_uid:
+                return dict(credentials)
+        return None
+
+    def put(self, peer_id: str, pod_uid: str, credentials: Dict[str, str]) -> None:
+        self._credentials[peer_id] = (pod_uid, dict(credentials))
+
+    def invalidate(self, peer_id: str) -> None:
+        self._credentials.pop(peer_id, None)
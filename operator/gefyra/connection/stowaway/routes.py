@@ -0,0 +1,83 @@
+from typing import Dict, Optional, Tuple
+
+import kubernetes as k8s
+
+PROXYROUTE_PORT_RANGE = (10000, 60000)
+
+
+class ProxyRouteTable:
+    """
+    In-memory copy of the Stowaway proxy routes ConfigMap. The routes are stored as
+    "<peer>-<random>": "<destination_ip>:<destination_port>,<stowaway_port>".
+    Taken Stowaway ports are tracked in a bitmap, the lowest free port is handed out
+    first. The table is rebuilt from the ConfigMap and remembers its resourceVersion,
+    which writers send along for optimistic concurrency. It is only changed once a
+    write to the ConfigMap succeeded.
+    """
+
+    def __init__(self, port_range: Tuple[int, int] = PROXYROUTE_PORT_RANGE):
+        self._first_port, self._last_port = port_range
+        self._ports = bytearray(self._last_port - self._first_port)
+        self._destinations: Dict[str, str] = {}
+        self.routes: Dict[str, str] = {}
+        self.resource_version: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.resource_version is not None
+
+    def load(self, configmap: k8s.client.V1ConfigMap) -> None:
+        self._ports = bytearray(self._last_port - self._first_port)
+        self._destinations = {}
+        self.routes = {}
+        for key, value in (configmap.data or {}).items():
+            destination, port = value.split(",")
+            self._insert(key, destination, int(port))
+        self.resource_version = configmap.metadata.resource_version
+
+    def invalidate(self) -> None:
+        # the table is rebuilt from the ConfigMap on next use
+        self.resource_version = None
+
+    def next_free_port(self) -> int:
+        """
+        :return: the lowest Stowaway port not taken by any route
+        """
+        idx = self._ports.find(0)
+        if idx == -1:
+            raise RuntimeError("No free port found for proxy route")
+        return self._first_port + idx
+
+    def add(self, key: str, destination: str, port: int) -> None:
+        self._insert(key, destination, port)
+
+    def remove(self, destination: str) -> Optional[Tuple[str, int]]:
+        """
+        Remove the route to a destination from the table
+        :return: the key and Stowaway port of the removed route, None if not found
+        """
+        route = self.find(destination)
+        if route is None:
+            return None
+        key, port = route
+        del self.routes[key]
+        del self._destinations[destination]
+        if self._first_port <= port < self._last_port:
+            self._ports[port - self._first_port] = 0
+        return route
+
+    def find(self, destination: str) -> Optional[Tuple[str, int]]:
+        """
+        Look up the route to a destination ("<ip>:<port>")
+        :return: the key and Stowaway port of this route, None if not found
+        """
+        key = self._destinations.get(destination)
+        if key is None:
+            return None
+        return key, int(self.routes[key].split(",")[1])
+
+    def _insert(self, key: str, destination: str, port: int) -> None:
+        self.routes[key] = f"{destination},{port}"
+        self._destinations[destination] = key
+        if self._first_port <= port < self._last_port:
+            self._ports[port - self._first_port] = 1
@@ -1,4 +1,12 @@
 import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# seconds after which WireGuard considers a handshake stale (REJECT_AFTER_TIME)
+WIREGUARD_HANDSHAKE_FRESHNESS = 180
+# fields of a peer's status that change with every packet, they never trigger a patch
+WIREGUARD_VOLATILE_FIELDS = ("transfer",)
 
 
 # This code was generated by Google Gemini
@@ -123,3 +131,75 @@ def parse_wg_output(output_string: str) -> dict:
                 pass
 
     return wg_data
+
+
+def parse_wg_dump(output_string: str, now: Optional[float] = None) -> Dict[str, dict]:
+    """
+    Parses the output of 'wg show all dump' into the status of each peer, indexed by
+    the peer's public key. Keys of the interface and preshared keys are not included.
+    """
+    now = time.time() if now is None else now
+    peers = {}
+    for line in output_string.strip().splitlines():
+        fields = line.split("\t")
+        # interface lines have 5 fields, peer lines 9
+        if len(fields) != 9:
+            continue
+        (
+            _interface,
+            public_key,
+            _preshared_key,
+            endpoint,
+            allowed_ips,
+            latest_handshake,
+            received,
+            sent,
+            persistent_keepalive,
+        ) = fields
+        peer: dict = {"public_key": public_key}
+        if endpoint != "(none)":
+            host, port = endpoint.rsplit(":", 1)
+            peer["endpoint"] = {"host": host.strip("[]"), "port": int(port)}
+        if allowed_ips != "(none)":
+            peer["allowed_ips"] = [ip.strip() for ip in allowed_ips.split(",")]
+        handshake = int(latest_handshake)
+        if handshake:
+            peer["latest_handshake"] = (
+                datetime.fromtimestamp(handshake, timezone.utc)
+                .isoformat()
+                .replace("+00:00", "Z")
+            )
+        peer["handshake_fresh"] = (
+            bool(handshake) and now - handshake < WIREGUARD_HANDSHAKE_FRESHNESS
+        )
+        peer["transfer"] = {
+            "received": {"value": int(received), "unit": "B"},
+            "sent": {"value": int(sent), "unit": "B"},
+        }
+        if persistent_keepalive != "off":
+            peer["persistent_keepalive"] = {
+                "value": int(persistent_keepalive),
+                "unit": "seconds",
+            }
+        peers[public_key] = peer
+    return peers
+
+
+def wireguard_status_patch(current: Optional[dict], peer: dict) -> Optional[dict]:
+    """
+    The merge patch turning the current Wireguard status of a GefyraClient into the
+    status of its peer, only with the fields that changed
+    :return: None if nothing but the volatile fields (i.e. byte counters) changed
+    """
+    current = current or {}
+    patch = {
+        key: value
+        for key, value in peer.items()
+        if key not in WIREGUARD_VOLATILE_FIELDS and current.get(key) != value
+    }
+    patch.update({key: None for key in current if key not in peer})
+    if not patch:
+        return None
+    # the counters are written along with a relevant change
+    patch.update({key: peer[key] for key in WIREGUARD_VOLATILE_FIELDS if key in peer})
+    return patch
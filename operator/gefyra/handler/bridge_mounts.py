@@ -1,15 +1,32 @@
+import asyncio
+import logging
+from typing import Dict, List, Set, Tuple
+
 import kubernetes as k8s
 import kopf
 from statemachine.exceptions import TransitionNotAllowed
 
+from gefyra import cache
+from gefyra.bridge_mount.carrier2mount import Carrier2BridgeMount
 from gefyra.bridge_mount_state import GefyraBridgeMount, GefyraBridgeMountObject
 from gefyra.configuration import configuration
+from gefyra.handler.bridges import get_lock
+from gefyra.metrics import timed_handler
+
+logger = logging.getLogger(__name__)
 
 RECONCILIATION_INTERVAL = 60
 
+# the restart count of the bridged container by pod UID, as of the last pod event
+_restart_counts: Dict[str, int] = {}
+# pods Carrier2 is being installed into from a pod event, by namespace and name
+_installing_pods: Set[Tuple[str, str]] = set()
+_install_tasks: Set[asyncio.Task] = set()
+
 
 @kopf.on.create("gefyrabridgemounts.gefyra.dev")
 @kopf.on.resume("gefyrabridgemounts.gefyra.dev")
+@timed_handler("GefyraBridgeMount")
 async def bridge_mount_created(body, logger, **kwargs):
     obj = GefyraBridgeMountObject(body)
     bridge_mount = GefyraBridgeMount(
@@ -60,6 +77,7 @@ async def bridge_mount_created(body, logger, **kwargs):
 
 
 @kopf.on.delete("gefyrabridgemounts.gefyra.dev")
+@timed_handler("GefyraBridgeMount")
 async def bridgemount_deleted(body, logger, **kwargs):
     obj = GefyraBridgeMountObject(body)
     bridge_mount = GefyraBridgeMount(obj, configuration, logger, initial=obj.state)
@@ -68,9 +86,27 @@ async def bridgemount_deleted(body, logger, **kwargs):
     logger.info(f"Deleting {bridge_mount}")
     if not bridge_mount.terminated.is_active:
         await bridge_mount.terminate()
+    _release_target_namespace(body)
+
+
+def _release_target_namespace(body) -> None:
+    """
+    Stop watching the pods of the target namespace of a deleted GefyraBridgeMount
+    unless another GefyraBridgeMount targets it
+    """
+    namespace = body.get("targetNamespace")
+    bridge_mounts = cache.cached_bridge_mounts(configuration.NAMESPACE)
+    if bridge_mounts is None or namespace == configuration.NAMESPACE:
+        return
+    if not any(
+        other.get("targetNamespace") == namespace
+        and other["metadata"]["name"] != body["metadata"]["name"]
+        for other in bridge_mounts
+    ):
+        cache.pods.release(namespace)
 
 
-def _try_delete_cr(bridge_mount: GefyraBridgeMount, logger) -> bool:
+async def _try_delete_cr(bridge_mount: GefyraBridgeMount, logger) -> bool:
     """Best-effort deletion of the GefyraBridgeMount CR.
 
     Swallows 404 (already gone) but logs other errors so that the
@@ -79,7 +115,8 @@ def _try_delete_cr(bridge_mount: GefyraBridgeMount, logger) -> bool:
     :return: True if the CR was deleted (or was already gone), False on error.
     """
     try:
-        bridge_mount.custom_api.delete_namespaced_custom_object(
+        await asyncio.to_thread(
+            bridge_mount.custom_api.delete_namespaced_custom_object,
             namespace=bridge_mount.configuration.NAMESPACE,
             name=bridge_mount.object_name,
             group="gefyra.dev",
@@ -101,6 +138,7 @@ def _try_delete_cr(bridge_mount: GefyraBridgeMount, logger) -> bool:
     "gefyrabridgemounts.gefyra.dev",
     interval=RECONCILIATION_INTERVAL,
 )
+@timed_handler("GefyraBridgeMount")
 async def bridge_mount_reconcile(body, logger, **kwargs):
     obj = GefyraBridgeMountObject(body)
     bridge_mount = GefyraBridgeMount(
@@ -117,64 +155,66 @@ async def bridge_mount_reconcile(body, logger, **kwargs):
 
     # TERMINATED objects: retry CR deletion, then skip all other logic.
     if bridge_mount.terminated.is_active:
-        _try_delete_cr(bridge_mount, logger)
+        await _try_delete_cr(bridge_mount, logger)
         return
 
     if await bridge_mount.should_terminate:
         await bridge_mount.terminate()
-        _try_delete_cr(bridge_mount, logger)
+        await _try_delete_cr(bridge_mount, logger)
         return
 
     try:
-        if bridge_mount.missing.is_active:
-            if await bridge_mount.target_exists:
-                logger.info(
-                    f"Target for GefyraBridgeMount '{bridge_mount.object_name}' "
-                    "has reappeared. Recovering."
-                )
-                await bridge_mount.recover()
-            elif bridge_mount.missing_grace_period_expired:
-                logger.warning(
-                    f"Grace period expired for GefyraBridgeMount "
-                    f"'{bridge_mount.object_name}'. Terminating."
-                )
-                await bridge_mount.terminate()
-                _try_delete_cr(bridge_mount, logger)
-            else:
-                logger.info(
-                    f"GefyraBridgeMount '{bridge_mount.object_name}' target still "
-                    f"missing. Waiting for grace period "
-                    f"({bridge_mount.missing_grace_period}s)."
-                )
-        else:
-            # For all operational states, check target existence once.
-            if not await bridge_mount.target_exists:
-                await bridge_mount.mark_missing()
+        # pods installed from pod events never overlap a (re)installation
+        async with await get_lock(bridge_mount.object_name):
+            if bridge_mount.missing.is_active:
+                if await bridge_mount.target_exists:
+                    logger.info(
+                        f"Target for GefyraBridgeMount '{bridge_mount.object_name}' "
+                        "has reappeared. Recovering."
+                    )
+                    await bridge_mount.recover()
+                elif bridge_mount.missing_grace_period_expired:
+                    logger.warning(
+                        f"Grace period expired for GefyraBridgeMount "
+                        f"'{bridge_mount.object_name}'. Terminating."
+                    )
+                    await bridge_mount.terminate()
+                    await _try_delete_cr(bridge_mount, logger)
+                else:
+                    logger.info(
+                        f"GefyraBridgeMount '{bridge_mount.object_name}' target still "
+                        f"missing. Waiting for grace period "
+                        f"({bridge_mount.missing_grace_period}s)."
+                    )
             else:
-                if bridge_mount.requested.is_active:
-                    await bridge_mount.arrange()
-                if bridge_mount.error.is_active:
-                    await bridge_mount.send("restore")
-                if bridge_mount.restoring.is_active:
-                    await bridge_mount.send("restore")
-                if (
-                    bridge_mount.preparing.is_active
-                    or bridge_mount.installing.is_active
-                ):
-                    if not await bridge_mount.bridge_mount_provider.prepared():
-                        logger.info(
-                            "Shadow replica count syncing with original. "
-                            "Will retry on next reconciliation."
-                        )
-                    else:
-                        await bridge_mount.install()
-
-                if bridge_mount.active.is_active:
-                    if not await bridge_mount.is_intact:
-                        logger.warning(
-                            "GefyraBridgeMount is impaired. Transitioning to restoring state."
-                        )
+                # For all operational states, check target existence once.
+                if not await bridge_mount.target_exists:
+                    await bridge_mount.mark_missing()
+                else:
+                    if bridge_mount.requested.is_active:
+                        await bridge_mount.arrange()
+                    if bridge_mount.error.is_active:
                         await bridge_mount.send("restore")
+                    if bridge_mount.restoring.is_active:
+                        await bridge_mount.send("restore")
+                    if (
+                        bridge_mount.preparing.is_active
+                        or bridge_mount.installing.is_active
+                    ):
+                        if not await bridge_mount.bridge_mount_provider.prepared():
+                            logger.info(
+                                "Shadow replica count syncing with original. "
+                                "Will retry on next reconciliation."
+                            )
+                        else:
+                            await bridge_mount.install()
+
+                    if bridge_mount.active.is_active:
+                        if not await bridge_mount.is_intact:
+                            logger.warning(
+                                "GefyraBridgeMount is impaired. Transitioning to restoring state."
+                            )
+                            await bridge_mount.send("restore")
     # this happens when either the transition from x to y is not allowed
     # or when the condition for the transition is not fulfilled.
     except TransitionNotAllowed as e:
@@ -184,3 +224,89 @@ async def bridge_mount_reconcile(body, logger, **kwargs):
             f"Transition not allowed. Retrying in {retry_delay}s.",
             delay=retry_delay,
         )
+
+
+def _on_pod_event(event_type: str, pod: k8s.client.V1Pod) -> None:
+    """
+    Install Carrier2 into a pod of an ACTIVE GefyraBridgeMount that was scheduled
+    (e.g. by a scale-out or an eviction) or whose bridged container restarted after
+    the installation. The other pods of the workload keep serving.
+    """
+    if event_type == "DELETED":
+        _restart_counts.pop(pod.metadata.uid, None)
+        return
+    key = (pod.metadata.namespace, pod.metadata.name)
+    if key in _installing_pods or pod.metadata.deletion_timestamp:
+        return
+    statuses = {
+        status.name: status
+        for status in (pod.status and pod.status.container_statuses) or []
+    }
+    mounts = [
+        body
+        for body in cache.cached_bridge_mounts(configuration.NAMESPACE) or []
+        if body.get("state") == GefyraBridgeMount.active.value
+        and body.get("targetNamespace") == pod.metadata.namespace
+        and body.get("targetContainer") in statuses
+        and Carrier2BridgeMount.is_target_pod(body.get("target", ""), pod)
+    ]
+    if not mounts:
+        return
+    container_name = mounts[0]["targetContainer"]
+    status = statuses[container_name]
+    if not (status.state and status.state.running):
+        # patched once the container runs
+        return
+    restarted = status.restart_count > _restart_counts.get(
+        pod.metadata.uid, status.restart_count
+    )
+    _restart_counts[pod.metadata.uid] = status.restart_count
+    image = next(c.image for c in pod.spec.containers if c.name == container_name)
+    carrier_image = f"{configuration.CARRIER2_IMAGE}:{configuration.CARRIER2_IMAGE_TAG}"
+    if image == carrier_image and not restarted:
+        return
+    _installing_pods.add(key)
+    task = asyncio.create_task(_install_into_pod(mounts, pod))
+    _install_tasks.add(task)
+    task.add_done_callback(_install_tasks.discard)
+
+
+async def _install_into_pod(mounts: List[dict], pod: k8s.client.V1Pod) -> None:
+    key = (pod.metadata.namespace, pod.metadata.name)
+    try:
+        for body in mounts:
+            obj = GefyraBridgeMountObject(body)
+            bridge_mount = GefyraBridgeMount(
+                obj, configuration, logger, initial=obj.state
+            )
+            # serialized with the GefyraBridges (re)configuring this mount
+            async with await get_lock(bridge_mount.object_name):
+                if await bridge_mount.bridge_mount_provider.install_pod(pod):
+                    logger.info(
+                        f"Installed Carrier2 into Pod {pod.metadata.name} of"
+                        f" GefyraBridgeMount '{bridge_mount.object_name}'"
+                    )
+                    return
+    except Exception as e:
+        # the reconciliation restores the GefyraBridgeMount
+        logger.warning(f"Could not install Carrier2 into Pod {pod.metadata.name}: {e}")
+    finally:
+        _installing_pods.discard(key)
+        # the restart caused by the installation is no restart to handle
+        current = cache.pods.get(*key)
+        for status in (current and current.status.container_statuses) or []:
+            if status.name == mounts[0]["targetContainer"]:
+                _restart_counts[pod.metadata.uid] = status.restart_count
+
+
+@kopf.on.startup()
+async def watch_bridged_pods(memo, **_):
+    # pod events are delivered by the pod cache
+    if configuration.RESOURCE_CACHE:
+        memo.stop_watching_bridged_pods = cache.pods.add_listener(_on_pod_event)
+
+
+@kopf.on.cleanup()
+async def stop_watching_bridged_pods(memo, **_):
+    if stop_watching := memo.get("stop_watching_bridged_pods"):
+        stop_watching()
@@ -1,9 +1,15 @@
 import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 import kopf
+import kubernetes as k8s
 
+from gefyra import cache
 from gefyra.bridgestate import GefyraBridge, GefyraBridgeObject
 from gefyra.configuration import configuration
+from gefyra.metrics import InstrumentedLock, timed, timed_handler
+
+custom_object_api = k8s.client.CustomObjectsApi()
 
 
 RECONCILIATION_INTERVAL = 60
@@ -14,12 +20,13 @@ locks = {}
 
 async def get_lock(name):
     if name not in locks:
-        locks[name] = asyncio.Lock()
+        locks[name] = InstrumentedLock("bridges")
     return locks[name]
 
 
 @kopf.on.create("gefyrabridges.gefyra.dev")
 @kopf.on.resume("gefyrabridges.gefyra.dev")
+@timed_handler("GefyraBridge")
 async def bridge_create(body, logger, namespace, name, **kwargs):
     obj = GefyraBridgeObject(body)
     bridge = GefyraBridge(
@@ -40,6 +47,7 @@ async def bridge_create(body, logger, namespace, name, **kwargs):
 
 
 @kopf.on.field("gefyrabridges.gefyra.dev", field="destinationIP")
+@timed_handler("GefyraBridge")
 async def update_bridge_destination(body, logger, namespace, name, old, new, **kwargs):
     obj = GefyraBridgeObject(body)
     bridge = GefyraBridge(
@@ -58,51 +66,111 @@ async def update_bridge_destination(body, logger, namespace, name, old, new, **k
                 await bridge.activate()
 
 
-@kopf.timer(
-    "gefyrabridges.gefyra.dev",
-    interval=RECONCILIATION_INTERVAL,
-)
-async def bridge_reconcile(body, logger, **kwargs):
-    obj = GefyraBridgeObject(body)
-    bridge = GefyraBridge(
-        obj, configuration, logger, initial=obj.state
-    )  # Pass initial state
-    await bridge.activate_initial_state()
+async def _list_bridges(bridge_mount: str) -> List[dict]:
+    bridges = cache.cached_bridges(configuration.NAMESPACE, bridge_mount=bridge_mount)
+    if bridges is None:
+        bridges = (
+            await asyncio.to_thread(
+                custom_object_api.list_namespaced_custom_object,
+                group="gefyra.dev",
+                version="v1",
+                plural="gefyrabridges",
+                namespace=configuration.NAMESPACE,
+                label_selector=f"gefyra.dev/bridge-mount={bridge_mount}",
+            )
+        )["items"]
+    return bridges
+
+
+async def _reconcile_bridge(
+    bridge: GefyraBridge,
+    destinations: Dict[Tuple[str, str, int], str],
+    proxy_routes: Callable[[], Awaitable[Set[Tuple[int, str, str]]]],
+    logger,
+) -> None:
+    try:
+        if bridge.error.is_active:
+            await bridge.restore()
+        if bridge.active.is_active:
+            is_intact = True
+            try:
+                is_intact = bridge.is_intact_in(destinations, await proxy_routes())
+            except Exception as e:
+                logger.error(f"Error probing GefyraBridge '{bridge.object_name}': {e}")
+                # GefryaBridge not intact -> restoring
+                await bridge.send("restore")
+            if not is_intact:
+                logger.error(f"GefyraBridge '{bridge.object_name}' not intact")
+                await bridge.send("restore")
 
-    if not bridge.completed_transition(GefyraBridge.active.value):
-        logger.info(
-            f"Skipping reconciliation for GefyraBridge '{bridge.object_name}' (transition to ACTIVE not completed)"
+        if bridge.installing.is_active:
+            await bridge.install()
+        if bridge.installed.is_active:
+            await bridge.activate()
+    except Exception as e:
+        logger.error(
+            f"Unexpected error reconciling GefyraBridge '{bridge.object_name}': {e}"
         )
-        return
-    logger.info(f"Reconciliation for GefyraBridge: {obj}")
 
-    key = bridge.data["target"]
-    lock = await get_lock(key)
+
+@timed("reconcile_bridges")
+async def reconcile_bridges(bridge_mount: str, logger) -> None:
+    """
+    Reconcile all GefyraBridges of a GefyraBridgeMount in one pass. The destinations
+    of the connection provider and the proxy routes of the bridge provider are looked
+    up once, under the lock of the GefyraBridgeMount, hence no GefyraBridge is checked
+    against a snapshot older than its last change.
+    """
+    lock = await get_lock(bridge_mount)
     async with lock:
-        try:
-            if bridge.error.is_active:
-                await bridge.restore()
-            if bridge.active.is_active:
-                is_intact = True
-                try:
-                    is_intact = await bridge.is_intact
-                except Exception as e:
-                    logger.error(f"Error probing this GefyraBridge: {e}")
-                    # GefryaBridge not intact -> restoring
-                    await bridge.send("restore")
-                if not is_intact:
-                    logger.error("GefyraBridge not intact")
-                    await bridge.send("restore")
-
-            if bridge.installing.is_active:
-                await bridge.install()
-            if bridge.installed.is_active:
-                await bridge.activate()
-        except Exception as e:
-            logger.error(f"Unexpected error reconciling this GefyraBridge: {e}")
+        bridges: List[GefyraBridge] = []
+        for body in await _list_bridges(bridge_mount):
+            obj = GefyraBridgeObject(body)
+            bridge = GefyraBridge(obj, configuration, logger, initial=obj.state)
+            await bridge.activate_initial_state()
+            if not bridge.completed_transition(GefyraBridge.active.value):
+                logger.debug(
+                    f"Skipping reconciliation for GefyraBridge '{bridge.object_name}' (transition to ACTIVE not completed)"
+                )
+                continue
+            bridges.append(bridge)
+        if not bridges:
+            return
+        logger.info(
+            f"Reconciliation for {len(bridges)} GefyraBridge(s) of "
+            f"GefyraBridgeMount '{bridge_mount}'"
+        )
+
+        destinations = await bridges[0].connection_provider.get_destinations()
+        routes: Optional[Set[Tuple[int, str, str]]] = None
+
+        async def proxy_routes() -> Set[Tuple[int, str, str]]:
+            # the proxy routes are read once for all bridges of this GefyraBridgeMount
+            nonlocal routes
+            if routes is None:
+                routes = await (await bridges[0].bridge_provider).proxy_routes()
+            return routes
+
+        for bridge in bridges:
+            await _reconcile_bridge(bridge, destinations, proxy_routes, logger)
+
+
+# one timer per GefyraBridgeMount, as a kopf handler it follows the peering of the
+# operator like all other handlers
+@kopf.timer(
+    "gefyrabridgemounts.gefyra.dev",
+    interval=RECONCILIATION_INTERVAL,
+)
+@timed_handler("GefyraBridge")
+async def bridge_reconcile(name, logger, **kwargs):
+    try:
+        await reconcile_bridges(name, logger)
+    except Exception as e:
+        logger.error(f"Unexpected error reconciling GefyraBridges: {e}")
 
 
 @kopf.on.delete("gefyrabridges.gefyra.dev")
+@timed_handler("GefyraBridge")
 async def bridge_delete(body, logger, namespace, name, **kwargs):
     obj = GefyraBridgeObject(body)
     bridge = GefyraBridge(
@@ -1,5 +1,6 @@
 import asyncio
 import os
+import weakref
 
 import click
 import kopf
@@ -7,20 +8,26 @@ import kubernetes as k8s
 
 from gefyra.clientstate import GefyraClientObject, GefyraClient
 from gefyra.configuration import configuration
+from gefyra.metrics import InstrumentedLock, timed_handler
 from statemachine.exceptions import TransitionNotAllowed
 
-# A simple registry for locks based on resource UID or name
-locks = {}
+# A simple registry for locks based on resource UID or name, a lock is dropped once
+# no handler holds or waits for it (e.g. after the client was deleted)
+locks: "weakref.WeakValueDictionary[str, InstrumentedLock]" = (
+    weakref.WeakValueDictionary()
+)
 
 
 async def get_lock(name):
-    if name not in locks:
-        locks[name] = asyncio.Lock()
-    return locks[name]
+    lock = locks.get(name)
+    if lock is None:
+        lock = locks[name] = InstrumentedLock("clients")
+    return lock
 
 
 @kopf.on.create("gefyraclients.gefyra.dev")
 @kopf.on.resume("gefyraclients.gefyra.dev")
+@timed_handler("GefyraClient")
 async def client_created(body, logger, **kwargs):
     obj = GefyraClientObject(body)
     client = GefyraClient(
@@ -35,6 +42,7 @@ async def client_created(body, logger, **kwargs):
 # 'providerParameter' activates the client, once set to a provider specific value the
 # Gefyra Operator will make the connection available
 @kopf.on.field("gefyraclients.gefyra.dev", field="providerParameter")
+@timed_handler("GefyraClient")
 async def client_connection_changed(new, body, logger, **kwargs):
     obj = GefyraClientObject(body)
     client = GefyraClient(
@@ -42,7 +50,9 @@ async def client_connection_changed(new, body, logger, **kwargs):
     )  # Pass initial state
     await client.activate_initial_state()
     # check if parameters for this connection provider have been added or removed
-    lock = await get_lock("client")
+    # peer changes in Stowaway are serialized (and batched) by the connection provider,
+    # hence concurrently connecting clients do not need to wait for each other here
+    lock = await get_lock(f"client-{obj.name}")
 
     async with lock:
         logger.info(f"Client is: {client.current_state}")
@@ -75,13 +85,14 @@ async def client_connection_changed(new, body, logger, **kwargs):
 
 
 @kopf.on.delete("gefyraclients.gefyra.dev")
+@timed_handler("GefyraClient")
 async def client_deleted(body, logger, **kwargs):
     obj = GefyraClientObject(body)
     client = GefyraClient(
         obj, configuration, logger, initial=obj.state
     )  # Pass initial state
     await client.activate_initial_state()
-    lock = await get_lock("client")
+    lock = await get_lock(f"client-{obj.name}")
 
     async with lock:
         await client.terminate()
@@ -103,25 +114,30 @@ except RuntimeError:
 
 
 @kopf.timer("gefyraclients.gefyra.dev", interval=RECONCILIATION_INTERVAL)
+@timed_handler("GefyraClient")
 async def client_reconcile(body, logger, **kwargs):
     obj = GefyraClientObject(body)
     client = GefyraClient(
         obj, configuration, logger, initial=obj.state
     )  # Pass initial state
     await client.activate_initial_state()
-    if await client.should_terminate():  # Await
-        # terminate this client
-        await client.terminate()  # Await
-        try:
-            await asyncio.to_thread(
-                client.custom_api.delete_namespaced_custom_object,
-                namespace=client.operator_configuration.NAMESPACE,
-                name=client.client_name,
-                group="gefyra.dev",
-                plural="gefyraclients",
-                version="v1",
-            )
-        except k8s.client.ApiException:
-            pass
-    if await client.should_disable():  # Await
-        await client.disable()  # Await
+    # transitions of the same client never overlap, other clients are not blocked
+    lock = await get_lock(f"client-{obj.name}")
+
+    async with lock:
+        if await client.should_terminate():  # Await
+            # terminate this client
+            await client.terminate()  # Await
+            try:
+                await asyncio.to_thread(
+                    client.custom_api.delete_namespaced_custom_object,
+                    namespace=client.operator_configuration.NAMESPACE,
+                    name=client.client_name,
+                    group="gefyra.dev",
+                    plural="gefyraclients",
+                    version="v1",
+                )
+            except k8s.client.ApiException:
+                pass
+        if await client.should_disable():  # Await
+            await client.disable()  # Await
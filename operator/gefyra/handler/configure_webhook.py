@@ -22,6 +22,8 @@ from gefyra.bridge.factory import (
 )
 
 from gefyra.resources.events import create_operator_webhook_ready_event
+from gefyra import cache
+from gefyra.utils import configure_api_executor
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,22 @@ def configure(settings: kopf.OperatorSettings, **_):
     )
 
 
+@kopf.on.startup()
+async def start_api_executor(**_):
+    configure_api_executor(configuration.KUBERNETES_API_THREADS)
+
+
+@kopf.on.startup()
+def start_caches(**_):
+    # the webhook validates against existing GefyraBridges and GefyraBridgeMounts only
+    cache.start_resource_caches([cache.bridges, cache.bridge_mounts])
+
+
+@kopf.on.cleanup()
+def stop_caches(**_):
+    cache.stop_resource_caches()
+
+
 @kopf.on.validate("gefyraclients.gefyra.dev", id="client-parameters")  # type: ignore
 async def check_validate_provider_parameters(body, diff, logger, operation, **_):
     if body.get("check", False):
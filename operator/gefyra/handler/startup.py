@@ -11,6 +11,10 @@ from gefyra.resources.crds import (
     create_bridge_mount_definition,
 )
 from gefyra.resources.events import create_operator_ready_event
+from gefyra.bridge.carrier2.delivery import ensure_config_service, start_config_server
+from gefyra.cache import start_resource_caches, stop_resource_caches
+from gefyra.metrics import instrument_kubernetes_client, start_metrics_server
+from gefyra.utils import configure_api_executor
 from gefyra.connection.factory import (
     ConnectionProviderType,
     connection_provider_factory,
@@ -146,3 +150,54 @@ async def start_connection_providers(logger, retry, **kwargs) -> None:
 @kopf.on.startup()
 def setup_locks(memo, **_):
     memo.locks = collections.defaultdict(threading.Lock)
+
+
+@kopf.on.startup()
+async def start_api_executor(**_):
+    from gefyra.configuration import configuration
+
+    configure_api_executor(configuration.KUBERNETES_API_THREADS)
+
+
+@kopf.on.startup()
+def start_caches(**_):
+    start_resource_caches()
+
+
+@kopf.on.cleanup()
+def stop_caches(**_):
+    stop_resource_caches()
+
+
+@kopf.on.startup()
+async def start_metrics(memo, **_):
+    from gefyra.configuration import configuration
+
+    if configuration.METRICS_PORT:
+        instrument_kubernetes_client()
+        memo.stop_metrics_server = await start_metrics_server(
+            configuration.METRICS_PORT
+        )
+
+
+@kopf.on.cleanup()
+async def stop_metrics(memo, **_):
+    if stop_metrics_server := memo.get("stop_metrics_server"):
+        await stop_metrics_server()
+
+
+@kopf.on.startup()
+async def start_carrier2_config_server(memo, **_):
+    from gefyra.configuration import configuration
+
+    if configuration.CARRIER2_CONFIG_DELIVERY == "configmap":
+        await ensure_config_service()
+        memo.stop_carrier2_config_server = await start_config_server(
+            configuration.CARRIER2_CONFIG_PORT
+        )
+
+
+@kopf.on.cleanup()
+async def stop_carrier2_config_server(memo, **_):
+    if stop_config_server := memo.get("stop_carrier2_config_server"):
+        await stop_config_server()
@@ -0,0 +1,416 @@
+"""
+Metrics of the operator in the Prometheus text exposition format.
+
+Only the small part of the Prometheus data model the operator needs is implemented
+here (counters, gauges and histograms with labels), so no client library is
+required. The metrics are served from the kopf process if GEFYRA_METRICS_PORT is set.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+import kubernetes as k8s
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelValues = Tuple[str, ...]
+Metric = TypeVar("Metric", bound="_Metric")
+
+
+class _Metric:
+    type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} requires the labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, key: LabelValues, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{self._format_labels(key)} {_number(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (count per bucket, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            buckets, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    buckets[i] += 1
+            self._values[key] = (buckets, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            return self._values.get(self._key(labels), ([], 0.0, 0))[2]
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(
+                (key, (list(buckets), total, count))
+                for key, (buckets, total, count) in self._values.items()
+            )
+        lines = []
+        for key, (buckets, total, count) in values:
+            for bound, bucket_count in zip(self.buckets, buckets):
+                le = self._format_labels(key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {bucket_count}")
+            le = self._format_labels(key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+REGISTRY = Registry()
+
+handler_duration = REGISTRY.register(
+    Histogram(
+        "gefyra_handler_duration_seconds",
+        "Duration of the kopf handlers",
+        ["kind", "handler"],
+    )
+)
+handler_retries = REGISTRY.register(
+    Counter(
+        "gefyra_handler_retries_total",
+        "Retries of the kopf handlers after a failed run",
+        ["kind", "handler"],
+    )
+)
+transition_duration = REGISTRY.register(
+    Histogram(
+        "gefyra_transition_duration_seconds",
+        "Duration of the state transitions, including their actions",
+        ["kind", "transition"],
+    )
+)
+operation_duration = REGISTRY.register(
+    Histogram(
+        "gefyra_operation_duration_seconds",
+        "Duration of single operations, e.g. committing a Carrier2 config",
+        ["operation"],
+    )
+)
+operation_failures = REGISTRY.register(
+    Counter(
+        "gefyra_operation_failures_total",
+        "Operations that raised an error",
+        ["operation"],
+    )
+)
+kubernetes_api_duration = REGISTRY.register(
+    Histogram(
+        "gefyra_kubernetes_api_request_duration_seconds",
+        "Duration of the Kubernetes API requests",
+        ["verb", "resource"],
+    )
+)
+kubernetes_api_errors = REGISTRY.register(
+    Counter(
+        "gefyra_kubernetes_api_request_errors_total",
+        "Kubernetes API requests that failed, by HTTP status",
+        ["verb", "resource", "status"],
+    )
+)
+exec_sessions_opened = REGISTRY.register(
+    Counter(
+        "gefyra_exec_sessions_opened_total",
+        "Exec sessions opened to Carrier2 containers",
+    )
+)
+exec_sessions_open = REGISTRY.register(
+    Gauge(
+        "gefyra_exec_sessions_open",
+        "Exec sessions to Carrier2 containers currently kept open",
+    )
+)
+stowaway_reloads = REGISTRY.register(
+    Counter(
+        "gefyra_stowaway_reloads_total",
+        "Reconfigurations of Stowaway, live on its wg0 interface or by a restart",
+        ["mode"],
+    )
+)
+lock_wait_duration = REGISTRY.register(
+    Histogram(
+        "gefyra_lock_wait_seconds",
+        "Time spent waiting for a lock of a handler lock registry",
+        ["registry"],
+    )
+)
+lock_waiters = REGISTRY.register(
+    Gauge(
+        "gefyra_lock_waiters",
+        "Handlers currently waiting for a lock of a handler lock registry",
+        ["registry"],
+    )
+)
+
+
+def timed(operation: str) -> Callable:
+    """
+    Record the duration and failures of the decorated function (sync or async)
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    with operation_duration.time(operation=operation):
+                        return await func(*args, **kwargs)
+                except Exception:
+                    operation_failures.inc(operation=operation)
+                    raise
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                with operation_duration.time(operation=operation):
+                    return func(*args, **kwargs)
+            except Exception:
+                operation_failures.inc(operation=operation)
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+def timed_handler(kind: str) -> Callable:
+    """
+    Record the duration and retries of the decorated kopf handler, it must be placed
+    below the kopf decorators
+    """
+
+    def decorator(func: Callable) -> Callable:
+        labels = {"kind": kind, "handler": func.__name__}
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if kwargs.get("retry"):
+                handler_retries.inc(**labels)
+            with handler_duration.time(**labels):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class InstrumentedLock(asyncio.Lock):
+    """
+    An asyncio.Lock recording how long and how many acquirers wait for it
+    """
+
+    def __init__(self, registry: str):
+        super().__init__()
+        self.registry = registry
+
+    async def acquire(self) -> bool:
+        lock_waiters.inc(registry=self.registry)
+        try:
+            with lock_wait_duration.time(registry=self.registry):
+                return await super().acquire()
+        finally:
+            lock_waiters.dec(registry=self.registry)
+
+
+def _api_verb(method: str, path_params: Dict, query_params: List) -> str:
+    if any(name == "watch" and value for name, value in query_params or []):
+        return "watch"
+    named = "name" in (path_params or {})
+    return {
+        "GET": "get" if named else "list",
+        "POST": "create",
+        "PUT": "update",
+        "PATCH": "patch",
+        "DELETE": "delete" if named else "deletecollection",
+    }.get(method.upper(), method.lower())
+
+
+def _api_resource(resource_path: str, path_params: Dict) -> str:
+    """
+    The resource (and subresource) of a request path template, e.g. 'pods/exec' for
+    '/api/v1/namespaces/{namespace}/pods/{name}/exec'
+    """
+    segments = [s for s in resource_path.split("/") if s]
+    # skip /api/{version} and /apis/{group}/{version}
+    segments = segments[2:] if segments[:1] == ["api"] else segments[3:]
+    if segments[:2] == ["namespaces", "{namespace}"] and len(segments) > 2:
+        segments = segments[2:]
+    names = [
+        (path_params or {}).get(s[1:-1], s) if s == "{plural}" else s
+        for s in segments
+        if s == "{plural}" or not s.startswith("{")
+    ]
+    return "/".join(names) or "unknown"
+
+
+_original_call_api: Optional[Callable] = None
+
+
+def instrument_kubernetes_client() -> None:
+    """
+    Record the duration and errors of all requests of the Kubernetes API clients
+    """
+    global _original_call_api
+    if _original_call_api is not None:
+        return
+    _original_call_api = k8s.client.ApiClient.call_api
+    original = _original_call_api
+
+    @functools.wraps(original)
+    def call_api(
+        self, resource_path, method, path_params=None, query_params=None, *args, **kw
+    ):
+        labels = {
+            "verb": _api_verb(method, path_params, query_params),
+            "resource": _api_resource(resource_path, path_params),
+        }
+        try:
+            with kubernetes_api_duration.time(**labels):
+                return original(
+                    self, resource_path, method, path_params, query_params, *args, **kw
+                )
+        except k8s.client.exceptions.ApiException as e:
+            kubernetes_api_errors.inc(status=str(e.status), **labels)
+            raise
+
+    k8s.client.ApiClient.call_api = call_api
+
+
+async def start_metrics_server(port: int) -> Callable:
+    """
+    Serve the metrics on http://0.0.0.0:<port>/metrics
+    :return: a coroutine function stopping the server
+    """
+    from aiohttp import web
+
+    async def metrics(request):
+        return web.Response(
+            body=REGISTRY.render().encode(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info(f"Serving metrics on port {port}")
+    return runner.cleanup
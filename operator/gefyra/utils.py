@@ -1,9 +1,11 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import select
 import tarfile
-from tempfile import TemporaryFile
 import time
-from typing import Any, AsyncIterable, Callable, List
+from typing import Any, AsyncIterable, Callable, Dict, List
 
 import kubernetes as k8s
 
@@ -61,57 +63,53 @@ class WSFileManager:
         return stdout_bytes, stderr_bytes, not self.ws_client._connected
 
 
-def stream_copy_from_pod(pod_name, namespace, source_path, destination_path):
-    # https://stackoverflow.com/questions/59703610/copy-file-from-pod-to-host-by-using-kubernetes-python-client
-
+def stream_read_files_from_pod(
+    pod_name: str, namespace: str, source_paths: List[str]
+) -> Dict[str, bytes]:
     """
-    Copy file from pod to the host.
-
+    Read files from a Pod with a single exec, the tar stream is unpacked in memory
     :param pod_name: String. Pod name
     :param namespace: String. Namespace
-    :param source_path: String. Pod destination file path
-    :param destination_path: Host destination file path
-    :return: bool
+    :param source_paths: absolute paths of the files in the Pod
+    :return: the content of each file by its path
+    :raises tarfile.ReadError: if the Pod returned no archive
+    :raises KeyError: if one of the files is not in the archive
     """
-
     core_v1_api = k8s.client.CoreV1Api()
-
-    command_copy = ["tar", "cf", "-", source_path]
-    with TemporaryFile() as tar_buffer:
-        exec_stream = k8s.stream.stream(
-            core_v1_api.connect_get_namespaced_pod_exec,
-            pod_name,
-            namespace,
-            command=command_copy,
-            stderr=True,
-            stdin=True,
-            stdout=True,
-            tty=False,
-            _preload_content=False,
-        )
-        # Copy file to stream
-        try:
-            reader = WSFileManager(exec_stream)
-            while True:
-                out, err, closed = reader.read_bytes()
-                if out:
-                    tar_buffer.write(out)
-                elif err:
-                    logger.debug(
-                        "Error copying file {0}".format(err.decode("utf-8", "replace"))
-                    )
-                if closed:
-                    break
-            exec_stream.close()
-            tar_buffer.flush()
-            tar_buffer.seek(0)
-            with tarfile.open(fileobj=tar_buffer, mode="r:") as tar:
-                member = tar.getmember(source_path.split("/", 1)[1])
-                tar.makefile(member, destination_path)
-                return True
-        except Exception as e:
-            logger.info(e)
-            raise e
+    exec_stream = k8s.stream.stream(
+        core_v1_api.connect_get_namespaced_pod_exec,
+        pod_name,
+        namespace,
+        command=["tar", "cf", "-", *source_paths],
+        stderr=True,
+        stdin=True,
+        stdout=True,
+        tty=False,
+        _preload_content=False,
+    )
+    tar_buffer = io.BytesIO()
+    try:
+        reader = WSFileManager(exec_stream)
+        while True:
+            out, err, closed = reader.read_bytes()
+            if out:
+                tar_buffer.write(out)
+            elif err:
+                logger.debug(
+                    "Error copying file {0}".format(err.decode("utf-8", "replace"))
+                )
+            if closed:
+                break
+    finally:
+        exec_stream.close()
+    tar_buffer.seek(0)
+    with tarfile.open(fileobj=tar_buffer, mode="r:") as tar:
+        files = {}
+        for source_path in source_paths:
+            # tar strips the leading slash
+            member = tar.extractfile(tar.getmember(source_path.lstrip("/")))
+            files[source_path] = member.read() if member else b""
+        return files
 
 
 def exec_command_pod(
@@ -130,8 +128,13 @@ def exec_command_pod(
     :param command: command as List[str]
     :return: the result output as str
     """
+    # stream() swaps the request function of the API client during the exec, hence
+    # it gets a client of its own, not one shared with concurrent API calls
+    exec_api = k8s.client.CoreV1Api(
+        k8s.client.ApiClient(api_instance.api_client.configuration)
+    )
     resp = k8s.stream.stream(
-        api_instance.connect_get_namespaced_pod_exec,
+        exec_api.connect_get_namespaced_pod_exec,
         pod_name,
         namespace,
         container=container_name,
@@ -144,6 +147,17 @@ def exec_command_pod(
     return resp
 
 
+def configure_api_executor(threads: int) -> None:
+    """
+    Run the blocking Kubernetes API calls (asyncio.to_thread) of the running event loop
+    on up to threads threads, the default executor is too small for many concurrent
+    handlers. The connection pools of the API clients are sized in main.py accordingly.
+    """
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=threads, thread_name_prefix="kubernetes-api")
+    )
+
+
 def wait_until_condition(
     read_func: Callable, cond_func: Callable, timeout: float = 5, backoff: float = 0.5
 ) -> Any:
@@ -13,6 +13,13 @@ except k8s.config.ConfigException:
     k8s.config.load_kube_config()
     logger.info("Loaded KUBECONFIG config")
 
+from gefyra.configuration import configuration  # noqa: E402
+
+# one pooled connection for each thread running API calls (see configure_api_executor)
+k8s_configuration = k8s.client.Configuration.get_default_copy()
+k8s_configuration.connection_pool_maxsize = configuration.KUBERNETES_API_THREADS
+k8s.client.Configuration.set_default(k8s_configuration)
+
 # register all Kopf handler
 mode = os.getenv("OP_MODE", default="Operator").lower()
 if mode == "operator":
@@ -0,0 +1,83 @@
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest_kubernetes.providers import AClusterManager
+
+logger = logging.getLogger(__name__)
+
+NUMBER_OF_CLIENTS = 50
+ACTIVE_TIMEOUT = 300
+
+
+def _custom_object_api(k3d: AClusterManager):
+    import kubernetes
+
+    kubernetes.config.load_kube_config(config_file=str(k3d.kubeconfig))
+    return kubernetes.client.CustomObjectsApi()
+
+
+def _connect_client(custom_object_api, i: int) -> float:
+    name = f"stress{i}"
+    custom_object_api.create_namespaced_custom_object(
+        "gefyra.dev",
+        "v1",
+        "gefyra",
+        "gefyraclients",
+        {
+            "apiVersion": "gefyra.dev/v1",
+            "kind": "gefyraclient",
+            "metadata": {"name": name, "namespace": "gefyra"},
+            "provider": "stowaway",
+        },
+    )
+    while _state(custom_object_api, name) != "WAITING":
+        time.sleep(0.5)
+    start = time.monotonic()
+    custom_object_api.patch_namespaced_custom_object(
+        "gefyra.dev",
+        "v1",
+        "gefyra",
+        "gefyraclients",
+        name,
+        {"providerParameter": {"subnet": f"10.{100 + i}.0.0/24"}},
+    )
+    while _state(custom_object_api, name) != "ACTIVE":
+        if time.monotonic() - start > ACTIVE_TIMEOUT:
+            raise TimeoutError(f"GefyraClient {name} did not become ACTIVE")
+        time.sleep(0.5)
+    return time.monotonic() - start
+
+
+def _state(custom_object_api, name: str) -> str | None:
+    return custom_object_api.get_namespaced_custom_object(
+        "gefyra.dev", "v1", "gefyra", "gefyraclients", name
+    ).get("state")
+
+
+def test_a_connect_clients_concurrently(operator: AClusterManager):
+    custom_object_api = _custom_object_api(operator)
+    with ThreadPoolExecutor(max_workers=NUMBER_OF_CLIENTS) as executor:
+        durations = list(
+            executor.map(
+                lambda i: _connect_client(custom_object_api, i),
+                range(NUMBER_OF_CLIENTS),
+            )
+        )
+
+    percentiles = statistics.quantiles(durations, n=100)
+    p50, p99 = statistics.median(durations), percentiles[98]
+    logger.info(
+        f"{NUMBER_OF_CLIENTS} GefyraClients ACTIVE: p50 {p50:.2f}s, p99 {p99:.2f}s, "
+        f"max {max(durations):.2f}s"
+    )
+
+    assert len(durations) == NUMBER_OF_CLIENTS
+    # connections are not serialized, hence the slowest client does not take as
+    # long as all clients one after another
+    assert max(durations) < sum(durations) / 2
+    peers = operator.kubectl(
+        ["get", "configmap", "gefyra-stowaway-config", "-n", "gefyra"]
+    )["data"]["PEERS"].split(",")
+    assert all(f"stress{i}" in peers for i in range(NUMBER_OF_CLIENTS))
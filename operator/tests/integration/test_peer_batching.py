@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import os
+import time
+from unittest.mock import patch
+
+from pytest_kubernetes.providers import AClusterManager
+
+from gefyra.configuration import OperatorConfiguration
+
+logger = logging.getLogger(__name__)
+
+STOWAWAY_POD_NAME = "pod/gefyra-stowaway-0"
+CONDITION_READY_STR = "condition=ready"
+NUMBER_OF_CLIENTS = 10
+
+
+def _stowaway(k3d: AClusterManager, batch_window: float):
+    import kubernetes
+
+    kubernetes.config.load_kube_config(config_file=str(k3d.kubeconfig))
+    from gefyra.connection.factory import (
+        ConnectionProviderType,
+        connection_provider_factory,
+    )
+
+    configuration = OperatorConfiguration()
+    # measure the restart-based reconfiguration, the one being expensive
+    configuration.STOWAWAY_LIVE_PEER_MANAGEMENT = False
+    configuration.STOWAWAY_PEER_BATCH_WINDOW = batch_window
+    return connection_provider_factory.get(
+        ConnectionProviderType.STOWAWAY,
+        configuration,
+        logger,
+    )
+
+
+async def _connect_clients(k3d: AClusterManager, prefix: str, batch_window: float):
+    from gefyra.connection.stowaway import Stowaway
+
+    stowaway = _stowaway(k3d, batch_window)
+    restarts = []
+    restart = Stowaway._restart_stowaway
+
+    async def _count_restarts(self):
+        restarts.append(time.monotonic())
+        await restart(self)
+
+    with patch.object(Stowaway, "_restart_stowaway", _count_restarts):
+        start = time.monotonic()
+        await asyncio.gather(
+            *[
+                stowaway.add_peer(f"{prefix}{i}", {"subnet": f"192.168.{200 + i}.0/24"})
+                for i in range(NUMBER_OF_CLIENTS)
+            ]
+        )
+        duration = time.monotonic() - start
+    k3d.wait(
+        STOWAWAY_POD_NAME,
+        CONDITION_READY_STR,
+        namespace="gefyra",
+        timeout=120,
+    )
+    for i in range(NUMBER_OF_CLIENTS):
+        assert await stowaway.peer_exists(f"{prefix}{i}") is True
+    logger.info(
+        f"Provisioned {NUMBER_OF_CLIENTS} peers (batch window {batch_window}s) in "
+        f"{duration:.2f}s with {len(restarts)} Stowaway restart(s)"
+    )
+    return duration, len(restarts)
+
+
+class TestPeerBatching:
+    async def test_a_install(self, k3d: AClusterManager, stowaway_image):
+        os.environ["GEFYRA_STOWAWAY_IMAGE"] = stowaway_image.split(":")[0]
+        os.environ["GEFYRA_STOWAWAY_TAG"] = stowaway_image.split(":")[1]
+        os.environ["GEFYRA_STOWAWAY_IMAGE_PULLPOLICY"] = "Never"
+        k3d.load_image(stowaway_image)
+
+        stowaway = _stowaway(k3d, 0)
+        await stowaway.install()
+        k3d.wait(
+            STOWAWAY_POD_NAME,
+            CONDITION_READY_STR,
+            namespace="gefyra",
+            timeout=120,
+        )
+        assert await stowaway.ready() is True
+
+    async def test_b_connect_clients_batched_vs_unbatched(self, k3d: AClusterManager):
+        unbatched, unbatched_restarts = await _connect_clients(k3d, "single", 0)
+        batched, batched_restarts = await _connect_clients(k3d, "batch", 1.0)
+
+        assert unbatched_restarts == NUMBER_OF_CLIENTS
+        assert batched_restarts == 1
+        assert batched < unbatched
+        cm = k3d.kubectl(["get", "configmap", "gefyra-stowaway-config", "-n", "gefyra"])
+        assert len(cm["data"]["PEERS"].split(",")) == 2 * NUMBER_OF_CLIENTS + 1
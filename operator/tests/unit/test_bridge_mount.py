@@ -1,3 +1,4 @@
+import asyncio
 import json
 from unittest import IsolatedAsyncioTestCase, TestCase
 from unittest.mock import AsyncMock, DEFAULT, patch
@@ -184,6 +185,16 @@ class TestBridgeMountObject(IsolatedAsyncioTestCase):
         self.assertEqual(
             args[1]["body"].spec.containers[0].image, "quay.io/gefyra/carrier2:latest"
         )
+        # the original config is stored with the same patch
+        self.assertEqual(
+            json.loads(
+                args[1]["body"].metadata.annotations[
+                    "gefyra.dev/carrier2-original-config"
+                ]
+            )["originalConfig"]["image"],
+            "nginx",
+        )
+        core_v1_api.patch_namespaced_config_map.assert_not_called()
 
         await mount.uninstall()  # Await
         app.patch_namespaced_deployment.assert_called_once()
@@ -194,6 +205,66 @@ class TestBridgeMountObject(IsolatedAsyncioTestCase):
             "kubectl.kubernetes.io/restartedAt"
         ]
 
+    @patch.multiple(
+        "gefyra.bridge_mount.carrier2mount",
+        core_v1_api=DEFAULT,
+    )
+    async def test_pod_original_config(self, core_v1_api):
+        from gefyra.bridge_mount.carrier2mount import (
+            CARRIER2_ORIGINAL_CONFIG_ANNOTATION,
+            Carrier2BridgeMount,
+        )
+        from gefyra.bridge_mount import carrier2mount as mount_mod
+
+        mount = Carrier2BridgeMount(
+            name="test",
+            configuration=OperatorConfiguration(),
+            target_namespace="default",
+            target="pod/nginx-123",
+            target_container="nginx",
+            post_event_function=post_event_noop,
+            logger=logger,
+        )
+        pod = NginxPodFactory()
+        mount._store_pod_original_config(pod.spec.containers[0], pod)
+        pod.spec.containers[0].image = "quay.io/gefyra/carrier2:latest"
+        core_v1_api.read_namespaced_pod.return_value = pod
+
+        # the original config is read from the annotation of the pod only
+        await mount.restore_original_workload()
+        core_v1_api.read_namespaced_config_map.assert_not_called()
+        body = core_v1_api.patch_namespaced_pod.call_args.kwargs["body"]
+        self.assertEqual(
+            body,
+            {
+                "metadata": {
+                    "annotations": {CARRIER2_ORIGINAL_CONFIG_ANNOTATION: None}
+                },
+                "spec": {"containers": [{"name": "nginx", "image": "nginx"}]},
+            },
+        )
+
+        # pods patched by a former operator version are restored from the shared ConfigMap
+        pod.metadata.annotations = None
+        cm = V1ConfigMapFactory()
+        cm.data = {
+            "default-nginx-123": json.dumps({"originalConfig": {"image": "nginx"}}),
+            "other-nginx-456": json.dumps({"originalConfig": {"image": "nginx"}}),
+        }
+        core_v1_api.read_namespaced_config_map.return_value = cm
+        await mount.restore_original_workload()
+        body = core_v1_api.patch_namespaced_pod.call_args.kwargs["body"]
+        self.assertEqual(body["spec"]["containers"][0]["image"], "nginx")
+
+        # only the entries of this mount are removed from it
+        await mount._remove_legacy_original_configs(["nginx-123"])
+        core_v1_api.patch_namespaced_config_map.assert_called_once_with(
+            name=mount_mod.CARRIER2_ORIGINAL_CONFIGMAP,
+            namespace="gefyra",
+            body={"data": {"default-nginx-123": None}},
+        )
+        core_v1_api.delete_namespaced_config_map.assert_not_called()
+
     @patch.multiple(
         "gefyra.bridge_mount.carrier2mount",
         app=DEFAULT,
@@ -395,3 +466,178 @@ class TestBridgeMountObject(IsolatedAsyncioTestCase):
             running=running_state
         )
         assert await mount.pod_ready_and_healthy(healthy_pod, "nginx")  # Await
+
+
+class TestBridgeMountRollout(IsolatedAsyncioTestCase):
+    def _mount(self, parallelism, policy):
+        from gefyra.bridge_mount.carrier2mount import Carrier2BridgeMount
+
+        configuration = OperatorConfiguration()
+        configuration.CARRIER2_INSTALL_PARALLELISM = parallelism
+        configuration.CARRIER2_INSTALL_POLICY = policy
+        return Carrier2BridgeMount(
+            name="test",
+            configuration=configuration,
+            target_namespace="default",
+            target="deploy/nginx",
+            target_container="nginx",
+            post_event_function=post_event_noop,
+            logger=logger,
+        )
+
+    def _pods(self, replicas):
+        pods = []
+        for i in range(replicas):
+            pod = NginxPodFactory()
+            pod.metadata.name = f"nginx-{i}"
+            pods.append(pod)
+        return V1PodListFactory(items=pods)
+
+    @patch.multiple(
+        "gefyra.bridge_mount.carrier2mount",
+        app=DEFAULT,
+        core_v1_api=DEFAULT,
+        custom_object_api=DEFAULT,
+    )
+    async def test_install_is_bounded(self, app, core_v1_api, custom_object_api):
+        app.read_namespaced_deployment.return_value = NginxDeploymentFactory()
+        core_v1_api.list_namespaced_pod.return_value = self._pods(10)
+        mount = self._mount(parallelism=3, policy="fail-fast")
+        running, max_running = 0, 0
+
+        async def _install_pod(idx, total, pod):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        mount._install_pod = _install_pod
+        await mount.install()
+        self.assertEqual(max_running, 3)
+
+        progress = {}
+        for call in custom_object_api.patch_namespaced_custom_object.call_args_list:
+            progress.update(call.kwargs["body"]["status"]["pods"] or {})
+        self.assertEqual(progress, {f"nginx-{i}": "Installed" for i in range(10)})
+
+    @patch.multiple(
+        "gefyra.bridge_mount.carrier2mount",
+        app=DEFAULT,
+        core_v1_api=DEFAULT,
+        custom_object_api=DEFAULT,
+    )
+    async def test_install_policies(self, app, core_v1_api, custom_object_api):
+        from gefyra.bridge.exceptions import BridgeInstallException
+
+        app.read_namespaced_deployment.return_value = NginxDeploymentFactory()
+        core_v1_api.list_namespaced_pod.return_value = self._pods(6)
+
+        for policy, installs in (("fail-fast", 2), ("continue", 6)):
+            mount = self._mount(parallelism=2, policy=policy)
+            installed = []
+
+            async def _install_pod(idx, total, pod):
+                await asyncio.sleep(0.01 * idx)
+                if idx == 1:
+                    raise BridgeInstallException("Probes not compatible")
+                installed.append(pod.metadata.name)
+
+            mount._install_pod = _install_pod
+            with self.assertRaises(BridgeInstallException):
+                await mount.install()
+            # fail-fast cancels the remaining pods, continue installs all others
+            self.assertEqual(len(installed) + 1, installs, policy)
+
+
+class TestBridgeMountPodEvents(IsolatedAsyncioTestCase):
+    def _pod(
+        self, name, image="nginx", restart_count=0, running=True, workload="nginx"
+    ):
+        from kubernetes.client import V1ContainerState, V1ContainerStateRunning
+
+        pod = NginxPodFactory()
+        pod.metadata.name = name
+        pod.metadata.uid = f"{name}-uid"
+        pod.metadata.labels = {"app": "nginx", "pod-template-hash": "5d4f"}
+        pod.metadata.owner_references[0].kind = "ReplicaSet"
+        pod.metadata.owner_references[0].name = f"{workload}-5d4f"
+        pod.spec.containers[0].image = image
+        status = pod.status.container_statuses[0]
+        status.restart_count = restart_count
+        status.state = V1ContainerState(
+            running=V1ContainerStateRunning() if running else None
+        )
+        return pod
+
+    async def test_new_and_restarted_pods_are_installed(self):
+        from gefyra.bridge_mount.carrier2mount import Carrier2BridgeMount
+        from gefyra.handler import bridge_mounts as handler
+
+        body = {
+            "apiVersion": "gefyra.dev/v1",
+            "kind": "gefyrabridgemount",
+            "metadata": {"name": "test-mount", "namespace": "gefyra"},
+            "state": "ACTIVE",
+            "targetNamespace": "default",
+            "target": "deploy/nginx",
+            "targetContainer": "nginx",
+            "provider": "carrier2mount",
+        }
+        carrier_image = (
+            f"{handler.configuration.CARRIER2_IMAGE}:"
+            f"{handler.configuration.CARRIER2_IMAGE_TAG}"
+        )
+        patched = self._pod("nginx-new", image=carrier_image, restart_count=1)
+
+        async def events(*events):
+            for event in events:
+                handler._on_pod_event(*event)
+            await asyncio.gather(*handler._install_tasks)
+
+        with (
+            patch("gefyra.cache.cached_bridge_mounts", return_value=[body]),
+            patch("gefyra.cache.pods.get", return_value=patched),
+            patch.object(
+                Carrier2BridgeMount, "install_pod", AsyncMock(return_value=True)
+            ) as install_pod,
+        ):
+            # a scheduled replica is installed once its container runs
+            await events(
+                ("ADDED", self._pod("nginx-new", running=False)),
+                ("MODIFIED", self._pod("nginx-new")),
+                ("MODIFIED", self._pod("nginx-new")),
+            )
+            install_pod.assert_awaited_once()
+            self.assertEqual(install_pod.await_args.args[0].metadata.name, "nginx-new")
+
+            # the restart of the installation and pods installed before are skipped
+            await events(
+                ("MODIFIED", patched),
+                ("MODIFIED", self._pod("nginx-old", image=carrier_image)),
+            )
+            install_pod.assert_awaited_once()
+
+            # a restart of the Carrier2 container loses its config
+            await events(
+                (
+                    "MODIFIED",
+                    self._pod("nginx-old", image=carrier_image, restart_count=1),
+                )
+            )
+            self.assertEqual(install_pod.await_count, 2)
+
+            await events(("DELETED", patched))
+            self.assertNotIn("nginx-new-uid", handler._restart_counts)
+
+            # pods of other workloads in the namespace, e.g. the duplicate, are ignored
+            await events(
+                ("MODIFIED", self._pod("nginx-gefyra-1", workload="nginx-gefyra")),
+                ("MODIFIED", self._pod("other-1", workload="other")),
+            )
+            self.assertEqual(install_pod.await_count, 2)
+
+            # pods of mounts which are not ACTIVE are left to the reconciliation
+            body["state"] = "RESTORING"
+            await events(("MODIFIED", self._pod("nginx-other")))
+            self.assertEqual(install_pod.await_count, 2)
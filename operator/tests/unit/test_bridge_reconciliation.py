@@ -0,0 +1,153 @@
+import logging
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from kubernetes.client import (
+    V1ConfigMap,
+    V1ObjectMeta,
+    V1Service,
+    V1ServiceList,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _bridge(name, bridge_mount, client, destination_ip):
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "gefyra",
+            "labels": {
+                "gefyra.dev/bridge-mount": bridge_mount,
+                "gefyra.dev/client": client,
+            },
+        },
+        "state": "ACTIVE",
+        "stateTransitions": {"ACTIVE": "2026-01-01T00:00:00Z"},
+        "provider": "carrier2",
+        "connectionProvider": "stowaway",
+        "client": client,
+        "target": bridge_mount,
+        "targetNamespace": "default",
+        "targetContainer": "app",
+        "destinationIP": destination_ip,
+        "portMappings": ["8000:80"],
+    }
+
+
+def _proxy_service(client, destination, port):
+    return V1Service(
+        metadata=V1ObjectMeta(
+            name=f"gefyra-stowaway-proxy-{port}",
+            labels={
+                "gefyra.dev/app": "stowaway",
+                "gefyra.dev/role": "proxy",
+                "gefyra.dev/client-id": client,
+                "gefyra.dev/destination": destination,
+            },
+        )
+    )
+
+
+def _endpoint(port):
+    return f"gefyra-stowaway-proxy-{port}.gefyra.svc.cluster.local:{port}"
+
+
+class TestBridgeReconciliation(IsolatedAsyncioTestCase):
+    async def test_bridges_are_checked_against_snapshots(self):
+        from gefyra.bridgestate import GefyraBridge
+        from gefyra.connection.stowaway import _proxyroute_table
+        from gefyra.handler import bridges as handler
+
+        _proxyroute_table.load(
+            V1ConfigMap(
+                metadata=V1ObjectMeta(resource_version="1"),
+                data={
+                    "client-a-abc": "192.168.101.1:8000,10000",
+                    "client-b-abc": "192.168.102.1:8000,10001",
+                    "client-c-abc": "192.168.103.1:8000,10002",
+                },
+            )
+        )
+        bodies = [
+            _bridge("bridge-a", "mount-1", "client-a", "192.168.101.1"),
+            _bridge("bridge-b", "mount-1", "client-b", "192.168.102.1"),
+            _bridge("bridge-c", "mount-2", "client-c", "192.168.103.1"),
+            # not yet ACTIVE, hence not reconciled
+            dict(
+                _bridge("bridge-d", "mount-2", "client-d", "192.168.104.1"),
+                state="REQUESTED",
+                stateTransitions={},
+            ),
+        ]
+        routes = {
+            "mount-1": {
+                (80, _endpoint(10000), "bridge-a"),
+                (80, _endpoint(10001), "bridge-b"),
+            },
+            # the route of bridge-c is missing in the Carrier2 config
+            "mount-2": set(),
+        }
+        providers = {}
+
+        async def bridge_provider(provider_type, configuration, name, ns, target, *a):
+            if target not in providers:
+                providers[target] = MagicMock()
+                providers[target].proxy_routes = AsyncMock(return_value=routes[target])
+            return providers[target]
+
+        with (
+            patch(
+                "gefyra.cache.cached_bridges",
+                side_effect=lambda namespace, bridge_mount: [
+                    body for body in bodies if body["target"] == bridge_mount
+                ],
+            ),
+            patch("gefyra.connection.stowaway.core_v1_api") as core_v1_api,
+            patch(
+                "gefyra.bridgestate.bridge_provider_factory.get",
+                side_effect=bridge_provider,
+            ),
+            patch.object(GefyraBridge, "send", AsyncMock()) as send,
+        ):
+            core_v1_api.list_namespaced_service.return_value = V1ServiceList(
+                items=[
+                    _proxy_service("client-a", "192.168.101.1_8000", 10000),
+                    _proxy_service("client-b", "192.168.102.1_8000", 10001),
+                    _proxy_service("client-c", "192.168.103.1_8000", 10002),
+                ]
+            )
+            for bridge_mount in ("mount-1", "mount-2"):
+                await handler.reconcile_bridges(bridge_mount, logger)
+
+        # one lookup of the destinations and one read of the routes per mount
+        self.assertEqual(core_v1_api.list_namespaced_service.call_count, 2)
+        core_v1_api.read_namespaced_config_map.assert_not_called()
+        self.assertEqual(sorted(providers), ["mount-1", "mount-2"])
+        for provider in providers.values():
+            provider.proxy_routes.assert_awaited_once()
+        # only the bridge without proxy route is restored
+        send.assert_awaited_once_with("restore")
+
+    def test_is_intact_in(self):
+        from gefyra.bridgestate import GefyraBridge, GefyraBridgeObject
+        from gefyra.configuration import OperatorConfiguration
+
+        obj = GefyraBridgeObject(
+            _bridge("bridge-a", "mount-1", "client-a", "192.168.101.1")
+        )
+        bridge = GefyraBridge(obj, OperatorConfiguration(), logger, initial=obj.state)
+        destinations = {("client-a", "192.168.101.1", 8000): _endpoint(10000)}
+
+        self.assertTrue(
+            bridge.is_intact_in(destinations, {(80, _endpoint(10000), "bridge-a")})
+        )
+        # the route points to another destination or belongs to another bridge
+        self.assertFalse(
+            bridge.is_intact_in(destinations, {(80, _endpoint(10001), "bridge-a")})
+        )
+        self.assertFalse(
+            bridge.is_intact_in(destinations, {(80, _endpoint(10000), "bridge-b")})
+        )
+        # the destination does not exist
+        self.assertFalse(bridge.is_intact_in({}, {(80, _endpoint(10000), "bridge-a")}))
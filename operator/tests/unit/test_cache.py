@@ -0,0 +1,187 @@
+import asyncio
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+
+from ..factories import NginxPodFactory
+
+
+def _bridge(name, mount, client, namespace="gefyra"):
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "labels": {"gefyra.dev/bridge-mount": mount, "gefyra.dev/client": client},
+        }
+    }
+
+
+class TestResourceCache(TestCase):
+    def test_indexes_follow_changes(self):
+        from gefyra.cache import ResourceCache, label_indexer
+
+        cache = ResourceCache(
+            "gefyrabridges",
+            MagicMock(),
+            indexers={
+                "bridge-mount": label_indexer("gefyra.dev/bridge-mount"),
+                "client": label_indexer("gefyra.dev/client"),
+            },
+        )
+        cache.replace(
+            [_bridge("a", "mount-1", "client-1"), _bridge("b", "mount-1", "client-2")]
+        )
+        self.assertEqual(len(cache.by_index("bridge-mount", "mount-1")), 2)
+
+        # a bridge moved to another mount
+        cache.upsert(_bridge("b", "mount-2", "client-2"))
+        self.assertEqual(
+            [b["metadata"]["name"] for b in cache.by_index("bridge-mount", "mount-1")],
+            ["a"],
+        )
+        self.assertEqual(len(cache.by_index("bridge-mount", "mount-2")), 1)
+
+        cache.delete(_bridge("a", "mount-1", "client-1"))
+        self.assertEqual(cache.by_index("bridge-mount", "mount-1"), [])
+        self.assertEqual(cache.by_index("client", "client-1"), [])
+        self.assertIsNotNone(cache.get("gefyra", "b"))
+        self.assertEqual(cache.by_index("client", "client-2", namespace="other"), [])
+
+    def test_list_then_watch(self):
+        from gefyra import cache as cache_module
+        from gefyra.cache import ResourceCache, owner_indexer
+
+        pod = NginxPodFactory()
+        pod.metadata.owner_references = [MagicMock(uid="rs-uid")]
+        list_func = MagicMock()
+        list_func.return_value = MagicMock(
+            items=[pod], metadata=MagicMock(resource_version="1")
+        )
+        cache = ResourceCache("pods", list_func, indexers={"owner": owner_indexer})
+
+        def stream(func, *args, resource_version, **kwargs):
+            self.assertEqual(resource_version, "1")
+            self.assertTrue(cache.synced.is_set())
+            self.assertEqual(cache.by_index("owner", "rs-uid"), [pod])
+            # the pod is gone, then the cache stops watching
+            yield {"type": "DELETED", "object": pod}
+            cache.stop()
+
+        with patch.object(cache_module.k8s.watch, "Watch") as watch:
+            watch.return_value.stream.side_effect = stream
+            watch.return_value.resource_version = "2"
+            cache._run()
+
+        list_func.assert_called_once()
+        self.assertEqual(cache.list(), [])
+        self.assertEqual(cache.by_index("owner", "rs-uid"), [])
+        self.assertFalse(cache.synced.is_set())
+
+    def test_cached_pods_match_labels(self):
+        from gefyra import cache as cache_module
+
+        pod = NginxPodFactory()
+        pod.metadata.labels = {"app": "nginx", "tier": "web"}
+        namespace = pod.metadata.namespace
+        self.assertIsNone(cache_module.cached_pods(namespace, {"app": "nginx"}))
+
+        with patch.object(cache_module.ResourceCache, "start") as start:
+            cache_module.pods.start()
+            try:
+                # the first read starts watching the namespace
+                self.assertIsNone(cache_module.cached_pods(namespace, {"app": "nginx"}))
+                start.assert_called_once()
+                self.assertEqual(cache_module.pods.namespaces(), [namespace])
+                namespace_pods = cache_module.pods._caches[namespace]
+                namespace_pods.replace([pod])
+                namespace_pods.synced.set()
+
+                pods = cache_module.cached_pods(namespace, {"app": "nginx"}).items
+                self.assertEqual(pods, [pod])
+                self.assertEqual(
+                    cache_module.cached_pods(
+                        namespace, {"app": "nginx", "tier": "db"}
+                    ).items,
+                    [],
+                )
+                # callers get copies, e.g. patching the image leaves the cache intact
+                pods[0].spec.containers[0].image = "carrier2"
+                self.assertEqual(
+                    cache_module.pods.get(namespace, pod.metadata.name)
+                    .spec.containers[0]
+                    .image,
+                    "nginx",
+                )
+                start.assert_called_once()
+
+                cache_module.pods.release(namespace)
+                self.assertEqual(cache_module.pods.namespaces(), [])
+                self.assertFalse(namespace_pods.synced.is_set())
+            finally:
+                cache_module.pods.stop()
+
+
+class TestResourceCacheWaiters(IsolatedAsyncioTestCase):
+    async def test_waiters_share_the_watch(self):
+        from gefyra.cache import ResourceCache
+
+        pod = NginxPodFactory()
+        cache = ResourceCache("pods", MagicMock())
+        cache.replace([pod])
+
+        def restarted(p):
+            return p.status.container_statuses[0].restart_count > 1
+
+        waiters = [
+            asyncio.create_task(
+                cache.wait_for(pod.metadata.namespace, pod.metadata.name, restarted, 5)
+            )
+            for _ in range(10)
+        ]
+        await asyncio.sleep(0)
+        self.assertFalse(any(waiter.done() for waiter in waiters))
+
+        restarted_pod = NginxPodFactory()
+        restarted_pod.status.container_statuses[0].restart_count = 2
+        # the watch delivers the change from its own thread
+        watch = threading.Thread(target=cache.upsert, args=(restarted_pod,))
+        watch.start()
+        watch.join()
+
+        self.assertEqual(await asyncio.gather(*waiters), [restarted_pod] * 10)
+        self.assertEqual(cache._waiters, {})
+        # an already fulfilled condition returns right away
+        self.assertIs(
+            await cache.wait_for(
+                pod.metadata.namespace, pod.metadata.name, restarted, 0
+            ),
+            restarted_pod,
+        )
+
+    async def test_wait_timeout(self):
+        from gefyra.cache import ResourceCache
+
+        cache = ResourceCache("pods", MagicMock())
+        with self.assertRaises(RuntimeError):
+            await cache.wait_for("default", "missing", lambda p: True, 0.05)
+        self.assertEqual(cache._waiters, {})
+
+    async def test_listeners(self):
+        from gefyra.cache import ResourceCache
+
+        pod = NginxPodFactory()
+        cache = ResourceCache("pods", MagicMock())
+        events = []
+        remove = cache.add_listener(lambda *event: events.append(event))
+
+        # the watch notifies from its own thread, listeners run on their loop
+        watch = threading.Thread(target=cache._notify, args=("ADDED", pod))
+        watch.start()
+        watch.join()
+        await asyncio.sleep(0)
+        self.assertEqual(events, [("ADDED", pod)])
+
+        remove()
+        cache._notify("DELETED", pod)
+        await asyncio.sleep(0)
+        self.assertEqual(len(events), 1)
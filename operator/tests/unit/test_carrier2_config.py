@@ -0,0 +1,304 @@
+import logging
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from tests.utils import post_event_noop
+
+from ..factories import NginxPodFactory, V1PodListFactory, V1ServiceFactory
+
+logger = logging.getLogger(__name__)
+
+
+class TestCarrier2ConfigCommit(IsolatedAsyncioTestCase):
+    async def _commit(self, config, pod, **kwargs):
+        core_v1 = MagicMock()
+        core_v1.read_namespaced_pod_status.return_value = pod
+        with (
+            patch("gefyra.bridge.carrier2.config.core_v1_api", core_v1),
+            patch(
+                "gefyra.bridge.carrier2.config.wait_until_condition",
+                side_effect=lambda read_func, cond_func, **_: read_func(),
+            ),
+            patch(
+                "gefyra.bridge.carrier2.config.stream_exec_retries",
+                return_value="Bootstrap starting",
+            ) as stream_exec_retries,
+        ):
+            await config.commit(logger, "nginx-123", "nginx", "default", **kwargs)
+        return stream_exec_retries
+
+    async def test_unchanged_config_is_not_committed_again(self):
+        from gefyra.bridge.carrier2.config import (
+            Carrier2Config,
+            Carrier2Proxy,
+            committed_configs,
+        )
+
+        pod = NginxPodFactory()
+        pod.metadata.uid = "pod-uid-1"
+        config = Carrier2Config(proxy=[Carrier2Proxy(port=80)])
+
+        stream_exec_retries = await self._commit(config, pod)
+        # write + reload, then the log read
+        self.assertEqual(stream_exec_retries.call_count, 2)
+        self.assertEqual(committed_configs.get(pod, "nginx"), config)
+
+        stream_exec_retries = await self._commit(
+            Carrier2Config(proxy=[Carrier2Proxy(port=80)]), pod
+        )
+        stream_exec_retries.assert_not_called()
+
+        stream_exec_retries = await self._commit(config, pod, force=True)
+        self.assertEqual(stream_exec_retries.call_count, 2)
+
+        # a restarted container has lost its config
+        pod.status.container_statuses[0].restart_count += 1
+        self.assertIsNone(committed_configs.get(pod, "nginx"))
+        stream_exec_retries = await self._commit(config, pod)
+        self.assertEqual(stream_exec_retries.call_count, 2)
+
+        config.proxy[0].port = 8080
+        stream_exec_retries = await self._commit(config, pod)
+        self.assertEqual(stream_exec_retries.call_count, 2)
+
+    async def test_configmap_delivery(self):
+        import asyncio
+
+        from gefyra.bridge.carrier2.config import Carrier2Config, Carrier2Proxy
+        from gefyra.bridge.carrier2.delivery import config_store, pod_token
+        from gefyra.configuration import configuration
+
+        pods = []
+        for i in range(3):
+            pod = NginxPodFactory()
+            pod.metadata.name = f"nginx-{i}"
+            pod.metadata.uid = f"pod-uid-{i}"
+            pods.append(pod)
+
+        async def commit(config, pod, **kwargs):
+            core_v1 = MagicMock()
+            core_v1.read_namespaced_pod_status.return_value = pod
+            with (
+                patch("gefyra.bridge.carrier2.config.core_v1_api", core_v1),
+                patch(
+                    "gefyra.bridge.carrier2.config.wait_until_condition",
+                    side_effect=lambda read_func, cond_func, **_: read_func(),
+                ),
+            ):
+                await config.commit(
+                    logger,
+                    pod.metadata.name,
+                    "nginx",
+                    "default",
+                    bridge_mount="nginx-mount",
+                    **kwargs,
+                )
+
+        with (
+            patch.object(configuration, "CARRIER2_CONFIG_DELIVERY", "configmap"),
+            patch("gefyra.bridge.carrier2.delivery.core_v1_api") as delivery_core_v1,
+            patch(
+                "gefyra.bridge.carrier2.config.stream_exec_retries",
+                return_value="Bootstrap starting",
+            ) as stream_exec_retries,
+        ):
+            # the installation writes the config and its source into the container
+            config = Carrier2Config(proxy=[Carrier2Proxy(port=80)])
+            for pod in pods:
+                await commit(config, pod, force=True)
+            commands = stream_exec_retries.call_args_list[0].args[4]
+            self.assertIn(
+                "echo 'CARRIER2_CONFIG_URL=http://gefyra-carrier2-config.gefyra.svc"
+                ".cluster.local:8081/carrier2/nginx-mount' > /tmp/carrier2-source.new",
+                commands,
+            )
+            self.assertIn(
+                f"echo 'CARRIER2_TOKEN={pod_token('nginx-mount', 'nginx-0')}'"
+                " >> /tmp/carrier2-source.new",
+                commands,
+            )
+            delivery_core_v1.replace_namespaced_config_map.assert_called_once()
+            for pod in pods:
+                config_store.report("nginx-mount", pod.metadata.name, "old-hash")
+
+            # the containers poll the new config, it is stored once for all of them
+            stream_exec_retries.reset_mock()
+            config = Carrier2Config(
+                proxy=[Carrier2Proxy(port=80, clusterUpstream=["a"])]
+            )
+
+            async def load():
+                await asyncio.sleep(0.3)
+                for pod in pods:
+                    config_store.report(
+                        "nginx-mount", pod.metadata.name, config.config_hash()
+                    )
+
+            await asyncio.gather(load(), *(commit(config, pod) for pod in pods))
+            stream_exec_retries.assert_not_called()
+            self.assertEqual(
+                delivery_core_v1.replace_namespaced_config_map.call_count, 2
+            )
+            body = delivery_core_v1.replace_namespaced_config_map.call_args.kwargs[
+                "body"
+            ]
+            self.assertEqual(body.data["config.yaml"], config.model_dump_yaml())
+
+            await config_store.delete("nginx-mount")
+            self.assertIsNone(config_store.loaded("nginx-mount", "nginx-0"))
+
+    async def test_config_server_authenticates_pods(self):
+        import socket
+
+        from aiohttp import ClientSession
+
+        from gefyra.bridge.carrier2.delivery import (
+            config_store,
+            pod_token,
+            start_config_server,
+        )
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        config_store._configs["nginx-mount"] = ("hash", "config")
+        stop = await start_config_server(port)
+        url = f"http://127.0.0.1:{port}/carrier2/nginx-mount"
+        try:
+            async with ClientSession() as session:
+                # a token of another pod does not allow to fetch or to report
+                params = {
+                    "pod": "nginx-0",
+                    "token": pod_token("nginx-mount", "nginx-1"),
+                    "loaded": "hash",
+                }
+                async with session.get(url, params=params) as response:
+                    self.assertEqual(response.status, 403)
+                self.assertIsNone(config_store.loaded("nginx-mount", "nginx-0"))
+
+                params["token"] = pod_token("nginx-mount", "nginx-0")
+                async with session.get(url, params=params) as response:
+                    self.assertEqual(response.status, 200)
+                    self.assertEqual(await response.text(), "config")
+                self.assertEqual(config_store.loaded("nginx-mount", "nginx-0"), "hash")
+                # the waiting commit is woken up by the report
+                await config_store.wait_for("nginx-mount", "nginx-0", "hash", 0)
+        finally:
+            await stop()
+            config_store._configs.pop("nginx-mount")
+            config_store._reports.clear()
+
+
+class TestCarrier2ConfigRender(IsolatedAsyncioTestCase):
+    def _bridge(self, name, resource_version):
+        return {
+            "metadata": {"name": name, "resourceVersion": resource_version},
+            "state": "ACTIVE",
+            "portMappings": ["8000:80"],
+            "clusterEndpoint": {"80": f"{name}.gefyra.svc.cluster.local:10000"},
+            "providerParameter": {
+                "rules": [
+                    {"match": [{"matchHeader": {"name": "x-gefyra", "value": name}}]}
+                ]
+            },
+        }
+
+    async def test_config_is_rendered_once_per_mount(self):
+        from gefyra import cache
+        from gefyra.bridge.carrier2 import Carrier2
+        from gefyra.configuration import OperatorConfiguration
+
+        provider = Carrier2(
+            OperatorConfiguration(),
+            "bridge-a",
+            "default",
+            "nginx-mount",
+            "nginx",
+            post_event_noop,
+            logger,
+        )
+        provider._get_bridge_mount_resource_cache = {
+            "metadata": {"name": "nginx-mount", "resourceVersion": "1"},
+        }
+        provider.namespace = "default"
+        provider.container = "nginx"
+        provider.bridge_mount = MagicMock()
+        pods = []
+        for i in range(3):
+            pod = NginxPodFactory()
+            pod.metadata.name = f"nginx-{i}"
+            pods.append(pod)
+        provider._get_pods_from_bridge_mount = AsyncMock(
+            return_value=V1PodListFactory(items=pods)
+        )
+        bridges = [self._bridge("bridge-a", "10"), self._bridge("bridge-b", "11")]
+        committed = []
+
+        async def commit(config, **kwargs):
+            committed.append((config, kwargs["pod_name"]))
+
+        with (
+            patch("gefyra.bridge.carrier2.core_v1_api") as core_v1_api,
+            patch(
+                "gefyra.bridge.carrier2.list_bridges_for_mount",
+                AsyncMock(return_value=bridges),
+            ) as list_bridges,
+            patch("gefyra.bridge.carrier2.config.Carrier2Config.commit", commit),
+        ):
+            core_v1_api.read_namespaced_service.return_value = V1ServiceFactory()
+            await provider.update_carrier_configs("bridge-a", None)
+            # the shadow service and the bridges are read once for all pods
+            core_v1_api.read_namespaced_service.assert_called_once()
+            list_bridges.assert_awaited_once()
+            self.assertEqual(
+                [name for _, name in committed], [p.metadata.name for p in pods]
+            )
+            config = committed[0][0]
+            self.assertTrue(all(c is config for c, _ in committed))
+            self.assertEqual(sorted(config.proxy[0].bridges), ["bridge-a", "bridge-b"])
+
+            # an unchanged mount, shadow service and bridge set is not rendered again
+            committed.clear()
+            await provider.update_carrier_configs("bridge-a", None)
+            self.assertEqual(core_v1_api.read_namespaced_service.call_count, 2)
+            self.assertIs(committed[0][0], config)
+
+            # a changed bridge is
+            bridges[1] = self._bridge("bridge-b", "12")
+            committed.clear()
+            await provider.update_carrier_configs("bridge-a", None)
+            self.assertIsNot(committed[0][0], config)
+            config = committed[0][0]
+
+            # so is a changed shadow service
+            svc = V1ServiceFactory()
+            svc.metadata.resource_version = "2"
+            core_v1_api.read_namespaced_service.return_value = svc
+            committed.clear()
+            await provider.update_carrier_configs("bridge-a", None)
+            self.assertIsNot(committed[0][0], config)
+            config = committed[0][0]
+
+            # and the current GefyraBridgeMount of the watch
+            bridge_mount = dict(
+                provider._get_bridge_mount_resource_cache,
+                metadata={"name": "nginx-mount", "resourceVersion": "2"},
+                targetNamespace="default",
+                targetContainer="nginx",
+                target="deploy/nginx",
+            )
+            cache.bridge_mounts.synced.set()
+            try:
+                with patch.object(
+                    cache.bridge_mounts, "get", return_value=bridge_mount
+                ):
+                    committed.clear()
+                    await provider.update_carrier_configs("bridge-a", None)
+            finally:
+                cache.bridge_mounts.synced.clear()
+            self.assertIsNot(committed[0][0], config)
+
+            # the bridge being removed is excluded
+            committed.clear()
+            await provider.update_carrier_configs(None, "bridge-b")
+            self.assertEqual(sorted(committed[0][0].proxy[0].bridges), ["bridge-a"])
@@ -0,0 +1,82 @@
+import re
+from unittest import TestCase
+from unittest.mock import patch
+
+from gefyra.bridge.carrier2.sessions import ExecSessionPool
+
+
+class FakeExecStream:
+    """Answers every script written to stdin with some output and its marker"""
+
+    def __init__(self, output="hello", exit_code=0, split=False):
+        self.output = output
+        self.exit_code = exit_code
+        self.split = split
+        self.written = []
+        self._stdout = []
+        self.open = True
+
+    def write_stdin(self, data):
+        self.written.append(data)
+        if marker := re.search(r"echo (__gefyra_\w+__) \$\?", data):
+            answer = f"{self.output}\n{marker.group(1)} {self.exit_code}\n"
+            if self.split:
+                # the marker and the exit code arrive in different frames
+                idx = answer.index(marker.group(1)) + len(marker.group(1))
+                self._stdout += [answer[:idx], answer[idx:]]
+            else:
+                self._stdout.append(answer)
+
+    def update(self, timeout=0):
+        pass
+
+    def peek_stdout(self):
+        return bool(self._stdout)
+
+    def read_stdout(self):
+        return self._stdout.pop(0)
+
+    def peek_stderr(self):
+        return False
+
+    def is_open(self):
+        return self.open
+
+    def close(self):
+        self.open = False
+
+
+class TestExecSessionPool(TestCase):
+    @patch("kubernetes.stream.stream")
+    def test_session_is_reused(self, stream):
+        fake = FakeExecStream(split=True)
+        stream.return_value = fake
+        pool = ExecSessionPool(idle_timeout=60)
+
+        first = pool.run("pod", "default", "carrier2", ["cat /tmp/config.yaml"])
+        second = pool.run("pod", "default", "carrier2", ["cat /tmp/carrier.log"])
+
+        self.assertEqual(first.output, "hello")
+        self.assertEqual(first.exit_code, 0)
+        self.assertEqual(second.output, "hello")
+        # one websocket for both commands
+        stream.assert_called_once()
+        self.assertEqual(fake.written[0], "exec 2>&1\n")
+
+    @patch("kubernetes.stream.stream")
+    def test_closed_and_idle_sessions_are_replaced(self, stream):
+        stream.side_effect = lambda *args, **kwargs: FakeExecStream(exit_code=1)
+        pool = ExecSessionPool(idle_timeout=60)
+
+        result = pool.run("pod", "default", "carrier2", ["cat /missing"])
+        self.assertEqual(result.exit_code, 1)
+        # e.g. the container has been restarted
+        pool._sessions[("pod", "default", "carrier2")]._resp.close()
+        pool.run("pod", "default", "carrier2", ["cat /missing"])
+        self.assertEqual(stream.call_count, 2)
+
+        pool.idle_timeout = 0
+        pool.run("other-pod", "default", "carrier2", ["true"])
+        self.assertNotIn(("pod", "default", "carrier2"), pool._sessions)
+        pool.close()
+        self.assertEqual(pool._sessions, {})
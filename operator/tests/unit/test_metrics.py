@@ -0,0 +1,127 @@
+import asyncio
+import socket
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+
+
+class TestMetrics(TestCase):
+    def test_render_text_format(self):
+        from gefyra.metrics import Counter, Histogram, Registry
+
+        registry = Registry()
+        counter = registry.register(Counter("test_total", "A counter", ["mode"]))
+        histogram = registry.register(
+            Histogram("test_seconds", "A histogram", ["kind"], buckets=(0.1, 1))
+        )
+        counter.inc(mode="live")
+        counter.inc(2, mode="live")
+        histogram.observe(0.5, kind='a"b')
+
+        self.assertEqual(
+            registry.render(),
+            "# HELP test_total A counter\n"
+            "# TYPE test_total counter\n"
+            'test_total{mode="live"} 3\n'
+            "# HELP test_seconds A histogram\n"
+            "# TYPE test_seconds histogram\n"
+            'test_seconds_bucket{kind="a\\"b",le="0.1"} 0\n'
+            'test_seconds_bucket{kind="a\\"b",le="1"} 1\n'
+            'test_seconds_bucket{kind="a\\"b",le="+Inf"} 1\n'
+            'test_seconds_sum{kind="a\\"b"} 0.5\n'
+            'test_seconds_count{kind="a\\"b"} 1\n',
+        )
+        with self.assertRaises(ValueError):
+            counter.inc(kind="live")
+
+    def test_kubernetes_api_labels(self):
+        from gefyra.metrics import _api_resource, _api_verb
+
+        self.assertEqual(
+            _api_resource("/api/v1/namespaces/{namespace}/pods/{name}/exec", {}),
+            "pods/exec",
+        )
+        self.assertEqual(
+            _api_resource(
+                "/apis/{group}/{version}/namespaces/{namespace}/{plural}/{name}",
+                {"plural": "gefyrabridges"},
+            ),
+            "gefyrabridges",
+        )
+        self.assertEqual(_api_resource("/api/v1/namespaces", {}), "namespaces")
+        self.assertEqual(_api_verb("GET", {"name": "a"}, []), "get")
+        self.assertEqual(_api_verb("GET", {}, [("watch", True)]), "watch")
+        self.assertEqual(_api_verb("DELETE", {}, []), "deletecollection")
+
+    def test_kubernetes_api_calls_are_recorded(self):
+        import kubernetes as k8s
+
+        from gefyra import metrics
+
+        original = k8s.client.ApiClient.call_api
+        call_api = MagicMock(side_effect=k8s.client.ApiException(status=409))
+        try:
+            with patch.object(k8s.client.ApiClient, "call_api", call_api):
+                metrics.instrument_kubernetes_client()
+                with self.assertRaises(k8s.client.ApiException):
+                    k8s.client.CoreV1Api().create_namespaced_config_map(
+                        "gefyra", k8s.client.V1ConfigMap()
+                    )
+        finally:
+            k8s.client.ApiClient.call_api = original
+            metrics._original_call_api = None
+
+        labels = {"verb": "create", "resource": "configmaps"}
+        self.assertEqual(metrics.kubernetes_api_duration.count(**labels), 1)
+        self.assertEqual(metrics.kubernetes_api_errors.value(status="409", **labels), 1)
+
+
+class TestMetricsAsync(IsolatedAsyncioTestCase):
+    async def test_timed_operation(self):
+        from gefyra.metrics import operation_duration, operation_failures, timed
+
+        @timed("test_operation")
+        async def operation(fail):
+            if fail:
+                raise RuntimeError("failed")
+            return "done"
+
+        self.assertEqual(await operation(False), "done")
+        with self.assertRaises(RuntimeError):
+            await operation(True)
+        self.assertEqual(operation_duration.count(operation="test_operation"), 2)
+        self.assertEqual(operation_failures.value(operation="test_operation"), 1)
+
+    async def test_lock_waiters(self):
+        from gefyra.metrics import InstrumentedLock, lock_wait_duration, lock_waiters
+
+        lock = InstrumentedLock("test")
+        async with lock:
+            waiter = asyncio.create_task(lock.acquire())
+            await asyncio.sleep(0)
+            self.assertEqual(lock_waiters.value(registry="test"), 1)
+        await waiter
+        lock.release()
+        self.assertEqual(lock_waiters.value(registry="test"), 0)
+        self.assertEqual(lock_wait_duration.count(registry="test"), 2)
+
+    async def test_metrics_endpoint(self):
+        import aiohttp
+
+        from gefyra.metrics import start_metrics_server, stowaway_reloads
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        stowaway_reloads.inc(mode="restart")
+        stop = await start_metrics_server(port)
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as resp:
+                    self.assertEqual(resp.status, 200)
+                    self.assertTrue(
+                        resp.headers["Content-Type"].startswith("text/plain")
+                    )
+                    body = await resp.text()
+        finally:
+            await stop()
+        self.assertIn('gefyra_stowaway_reloads_total{mode="restart"} 1', body)
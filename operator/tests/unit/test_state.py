@@ -0,0 +1,30 @@
+import logging
+import threading
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock
+
+logger = logging.getLogger(__name__)
+
+
+class TestStateWrites(IsolatedAsyncioTestCase):
+    async def test_state_is_written_off_the_event_loop(self):
+        from gefyra.clientstate import GefyraClient, GefyraClientObject
+        from gefyra.configuration import OperatorConfiguration
+
+        obj = GefyraClientObject(
+            {"metadata": {"name": "client-a", "namespace": "gefyra"}, "state": "ACTIVE"}
+        )
+        writes = []
+        obj._write_state = lambda state: writes.append(
+            (state, threading.current_thread())
+        )
+        client = GefyraClient(obj, OperatorConfiguration(), logger, initial=obj.state)
+        client.post_event = AsyncMock()
+        await client.activate_initial_state()
+        # the state of an existing object is not written again
+        self.assertEqual(writes, [])
+
+        await client.impair()
+        # written before the transition returns, but not on the event loop's thread
+        self.assertEqual([state for state, _ in writes], ["ERROR"])
+        self.assertIsNot(writes[0][1], threading.main_thread())
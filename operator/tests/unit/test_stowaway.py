@@ -1,5 +1,15 @@
+import logging
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, DEFAULT, patch
+
+from kubernetes.client import V1ConfigMap, V1ObjectMeta
+
 from gefyra.connection.stowaway.utils import parse_wg_output
 
+from ..factories import NginxPodFactory
+
+logger = logging.getLogger(__name__)
+
 
 def test_wg_output():
     wg_output = """
@@ -86,3 +96,587 @@ peer: fc1N/s3c/jDsx+ACYfrC2WOUVs=
             },
         ],
     }
+
+
+class TestStowawayLivePeers(IsolatedAsyncioTestCase):
+    @patch.multiple(
+        "gefyra.connection.stowaway",
+        core_v1_api=DEFAULT,
+        exec_command_pod=DEFAULT,
+    )
+    async def test_add_peer_without_restart(self, core_v1_api, exec_command_pod):
+        from gefyra.configuration import OperatorConfiguration
+        from gefyra.connection.stowaway import Stowaway
+
+        core_v1_api.read_namespaced_config_map.return_value = V1ConfigMap(
+            metadata=V1ObjectMeta(name="gefyra-stowaway-config", namespace="gefyra"),
+            data={"PEERS": "0"},
+        )
+        exec_command_pod.return_value = "PEER test1 ADDED"
+        configuration = OperatorConfiguration()
+        configuration.STOWAWAY_PEER_BATCH_WINDOW = 0
+        stowaway = Stowaway(configuration, logger)
+        stowaway._get_stowaway_pod = AsyncMock(return_value=NginxPodFactory())
+        stowaway._restart_stowaway = AsyncMock()
+
+        await stowaway.add_peer("test1", {"subnet": "192.168.100.0/24"})
+
+        exec_command_pod.assert_called_once()
+        self.assertEqual(
+            exec_command_pod.call_args[0][-1],
+            ["bash", "-c", "bash /app/add-peer test1 192.168.100.0/24"],
+        )
+        stowaway._restart_stowaway.assert_not_called()
+        body = core_v1_api.replace_namespaced_config_map.call_args[1]["body"]
+        self.assertEqual(body.data["PEERS"], "test1,0")
+        self.assertEqual(body.data["SERVER_ALLOWEDIPS_PEER_test1"], "192.168.100.0/24")
+
+    @patch.multiple(
+        "gefyra.connection.stowaway",
+        core_v1_api=DEFAULT,
+        exec_command_pod=DEFAULT,
+    )
+    async def test_add_peer_falls_back_to_restart(self, core_v1_api, exec_command_pod):
+        from gefyra.configuration import OperatorConfiguration
+        from gefyra.connection.stowaway import Stowaway
+
+        core_v1_api.read_namespaced_config_map.return_value = V1ConfigMap(
+            metadata=V1ObjectMeta(name="gefyra-stowaway-config", namespace="gefyra"),
+            data={"PEERS": "0"},
+        )
+        exec_command_pod.return_value = "bash: /app/add-peer: No such file or directory"
+        configuration = OperatorConfiguration()
+        configuration.STOWAWAY_PEER_BATCH_WINDOW = 0
+        stowaway = Stowaway(configuration, logger)
+        stowaway._get_stowaway_pod = AsyncMock(return_value=NginxPodFactory())
+        stowaway._restart_stowaway = AsyncMock()
+
+        with patch("gefyra.connection.stowaway.asyncio.sleep", AsyncMock()):
+            await stowaway.add_peer("test1")
+
+        stowaway._restart_stowaway.assert_called_once()
+
+    @patch.multiple(
+        "gefyra.connection.stowaway",
+        core_v1_api=DEFAULT,
+        exec_command_pod=DEFAULT,
+    )
+    async def test_concurrent_peer_changes_are_batched(
+        self, core_v1_api, exec_command_pod
+    ):
+        import asyncio
+
+        from gefyra.configuration import OperatorConfiguration
+        from gefyra.connection.stowaway import Stowaway
+
+        core_v1_api.read_namespaced_config_map.return_value = V1ConfigMap(
+            metadata=V1ObjectMeta(name="gefyra-stowaway-config", namespace="gefyra"),
+            data={"PEERS": "0,test3", "SERVER_ALLOWEDIPS_PEER_test3": "10.0.0.0/8"},
+        )
+        exec_command_pod.return_value = (
+            "PEER test1 ADDED\nPEER test2 ADDED\nPEER test3 REMOVED"
+        )
+        configuration = OperatorConfiguration()
+        configuration.STOWAWAY_PEER_BATCH_WINDOW = 0.1
+        stowaway = Stowaway(configuration, logger)
+        stowaway._get_stowaway_pod = AsyncMock(return_value=NginxPodFactory())
+        stowaway._restart_stowaway = AsyncMock()
+
+        results = await asyncio.gather(
+            stowaway.add_peer("test1"),
+            stowaway.add_peer("test2"),
+            stowaway.remove_peer("test3"),
+        )
+
+        self.assertEqual(results, [None, None, True])
+        # one ConfigMap write and one exec in Stowaway for all three changes
+        core_v1_api.read_namespaced_config_map.assert_called_once()
+        core_v1_api.replace_namespaced_config_map.assert_called_once()
+        body = core_v1_api.replace_namespaced_config_map.call_args[1]["body"]
+        self.assertEqual(body.data["PEERS"], "test2,test1,0")
+        self.assertNotIn("SERVER_ALLOWEDIPS_PEER_test3", body.data)
+        exec_command_pod.assert_called_once()
+        self.assertEqual(
+            exec_command_pod.call_args[0][-1],
+            [
+                "bash",
+                "-c",
+                "bash /app/add-peer test1; bash /app/add-peer test2; "
+                "bash /app/remove-peer test3",
+            ],
+        )
+        stowaway._restart_stowaway.assert_not_called()
+
+    async def test_peer_change_queue_coalesces_by_peer(self):
+        import asyncio
+
+        from gefyra.connection.stowaway.peers import (
+            PEER_ADD,
+            PEER_REMOVE,
+            PeerChange,
+            PeerChangeQueue,
+            PeerChangeSuperseded,
+        )
+
+        batches = []
+
+        async def apply(changes):
+            batches.append([(c.action, c.peer_id) for c in changes])
+
+        queue = PeerChangeQueue()
+        results = await asyncio.gather(
+            queue.submit(apply, PeerChange("test1", PEER_ADD), 0.05),
+            queue.submit(apply, PeerChange("test1", PEER_REMOVE), 0.05),
+            queue.submit(apply, PeerChange("test2", PEER_ADD), 0.05),
+            queue.submit(apply, PeerChange("test2", PEER_ADD), 0.05),
+            return_exceptions=True,
+        )
+        self.assertEqual(batches, [[(PEER_REMOVE, "test1"), (PEER_ADD, "test2")]])
+        # the add of test1 never happened, its submitter must not see a success
+        self.assertIsInstance(results[0], PeerChangeSuperseded)
+        self.assertEqual(results[1:], [None, None, None])
+
+        async def fail(changes):
+            raise RuntimeError("Stowaway not reachable")
+
+        with self.assertRaises(RuntimeError):
+            await queue.submit(fail, PeerChange("test3", PEER_ADD), 0.05)
+
+    @patch.multiple(
+        "gefyra.connection.stowaway",
+        core_v1_api=DEFAULT,
+        exec_command_pod=DEFAULT,
+    )
+    async def test_add_peer_superseded_by_remove(self, core_v1_api, exec_command_pod):
+        import asyncio
+
+        from gefyra.configuration import OperatorConfiguration
+        from gefyra.connection.stowaway import Stowaway
+        from gefyra.connection.stowaway.peers import PeerChangeSuperseded
+
+        core_v1_api.read_namespaced_config_map.return_value = V1ConfigMap(
+            metadata=V1ObjectMeta(name="gefyra-stowaway-config", namespace="gefyra"),
+            data={"PEERS": "0,test1"},
+        )
+        exec_command_pod.return_value = "PEER test1 REMOVED"
+        configuration = OperatorConfiguration()
+        configuration.STOWAWAY_PEER_BATCH_WINDOW = 0.1
+        stowaway = Stowaway(configuration, logger)
+        stowaway._get_stowaway_pod = AsyncMock(return_value=NginxPodFactory())
+        stowaway._restart_stowaway = AsyncMock()
+
+        add, remove = await asyncio.gather(
+            stowaway.add_peer("test1"),
+            stowaway.remove_peer("test1"),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(add, PeerChangeSuperseded)
+        self.assertTrue(remove)
+        body = core_v1_api.replace_namespaced_config_map.call_args[1]["body"]
+        self.assertEqual(body.data["PEERS"], "0")
+
+
+class TestStowawayProxyRoutes(IsolatedAsyncioTestCase):
+    def setUp(self):
+        from gefyra.connection.stowaway import _proxyroute_table
+
+        _proxyroute_table.invalidate()
+
+    def test_route_table_allocates_lowest_free_port(self):
+        from gefyra.connection.stowaway.routes import ProxyRouteTable
+
+        table = ProxyRouteTable()
+        table.load(
+            V1ConfigMap(
+                metadata=V1ObjectMeta(resource_version="1"),
+                data={
+                    "client1-abc": "10.0.0.1:80,10000",
+                    "client1-def": "10.0.0.2:80,10002",
+                },
+            )
+        )
+        self.assertEqual(table.next_free_port(), 10001)
+        table.add("client2-abc", "10.0.0.3:80", 10001)
+        self.assertEqual(table.next_free_port(), 10003)
+        self.assertEqual(table.remove("10.0.0.1:80"), ("client1-abc", 10000))
+        self.assertIsNone(table.find("10.0.0.1:80"))
+        self.assertEqual(table.next_free_port(), 10000)
+        self.assertEqual(table.find("10.0.0.2:80"), ("client1-def", 10002))
+
+        full = ProxyRouteTable(port_range=(10000, 10001))
+        full.add("client1-abc", "10.0.0.1:80", full.next_free_port())
+        with self.assertRaises(RuntimeError):
+            full.next_free_port()
+
+    @patch.multiple("gefyra.connection.stowaway", core_v1_api=DEFAULT)
+    async def test_edit_proxyroutes_retries_on_conflict(self, core_v1_api):
+        from kubernetes.client.exceptions import ApiException
+
+        from gefyra.configuration import OperatorConfiguration
+        from gefyra.connection.stowaway import Stowaway, _proxyroute_table
+
+        core_v1_api.read_namespaced_config_map.side_effect = [
+            V1ConfigMap(metadata=V1ObjectMeta(resource_version="1"), data={}),
+            # another writer took port 10000 in the meantime
+            V1ConfigMap(
+                metadata=V1ObjectMeta(resource_version="2"),
+                data={"client1-abc": "10.0.0.1:80,10000"},
+            ),
+        ]
+        core_v1_api.patch_namespaced_config_map.side_effect = [
+            ApiException(status=409),
+            V1ConfigMap(metadata=V1ObjectMeta(resource_version="3")),
+            V1ConfigMap(metadata=V1ObjectMeta(resource_version="4")),
+        ]
+        stowaway = Stowaway(OperatorConfiguration(), logger)
+
+        port = await stowaway._edit_proxyroutes_configmap(
+            "client2", add="10.0.0.2:8080"
+        )
+
+        self.assertEqual(port, 10001)
+        bodies = [
+            c[1]["body"] for c in core_v1_api.patch_namespaced_config_map.call_args_list
+        ]
+        self.assertEqual(bodies[0]["metadata"]["resourceVersion"], "1")
+        self.assertEqual(bodies[1]["metadata"]["resourceVersion"], "2")
+        # only the new route is written
+        self.assertEqual(list(bodies[1]["data"].values()), ["10.0.0.2:8080,10001"])
+        self.assertEqual(_proxyroute_table.resource_version, "3")
+
+        port = await stowaway._edit_proxyroutes_configmap(
+            "client2", remove="10.0.0.2:8080"
+        )
+        self.assertEqual(port, 10001)
+        body = core_v1_api.patch_namespaced_config_map.call_args[1]["body"]
+        self.assertEqual(body["metadata"]["resourceVersion"], "3")
+        self.assertEqual(list(body["data"].values()), [None])
+        self.assertIsNone(_proxyroute_table.find("10.0.0.2:8080"))
+        self.assertEqual(_proxyroute_table.resource_version, "4")
+
+    @patch.multiple("gefyra.connection.stowaway", core_v1_api=DEFAULT)
+    async def test_concurrent_proxyroutes_all_succeed(self, core_v1_api):
+        import asyncio
+        import threading
+
+        from kubernetes.client.exceptions import ApiException
+
+        from gefyra.configuration import OperatorConfiguration
+        from gefyra.connection.stowaway import Stowaway
+
+        # a ConfigMap enforcing the resourceVersion precondition
+        stored = {"data": {}, "resource_version": 1}
+        mutex = threading.Lock()
+
+        def read(*args, **kwargs):
+            with mutex:
+                return V1ConfigMap(
+                    metadata=V1ObjectMeta(
+                        resource_version=str(stored["resource_version"])
+                    ),
+                    data=dict(stored["data"]),
+                )
+
+        def patch_configmap(name, namespace, body):
+            with mutex:
+                if body["metadata"]["resourceVersion"] != str(
+                    stored["resource_version"]
+                ):
+                    raise ApiException(status=409)
+                stored["data"].update(body["data"])
+                stored["resource_version"] += 1
+                return V1ConfigMap(
+                    metadata=V1ObjectMeta(
+                        resource_version=str(stored["resource_version"])
+                    )
+                )
+
+        core_v1_api.read_namespaced_config_map.side_effect = read
+        core_v1_api.patch_namespaced_config_map.side_effect = patch_configmap
+        stowaway = Stowaway(OperatorConfiguration(), logger)
+
+        ports = await asyncio.gather(
+            *[
+                stowaway._edit_proxyroutes_configmap(
+                    f"client{i}", add=f"10.0.0.{i}:8080"
+                )
+                for i in range(20)
+            ]
+        )
+
+        self.assertEqual(sorted(ports), list(range(10000, 10020)))
+        self.assertEqual(len(stored["data"]), 20)
+        core_v1_api.read_namespaced_config_map.assert_called_once()
+
+    @patch.multiple("gefyra.connection.stowaway", core_v1_api=DEFAULT)
+    async def test_destinations_are_looked_up_in_cache(self, core_v1_api):
+        from kubernetes.client import V1Service, V1ServiceList
+
+        from gefyra import cache
+        from gefyra.configuration import OperatorConfiguration
+        from gefyra.connection.stowaway import Stowaway, _proxyroute_table
+
+        def proxy_service(client_id, destination, port):
+            return V1Service(
+                metadata=V1ObjectMeta(
+                    name=f"gefyra-stowaway-proxy-{port}",
+                    namespace="gefyra",
+                    labels={
+                        "gefyra.dev/app": "stowaway",
+                        "gefyra.dev/role": "proxy",
+                        "gefyra.dev/client-id": client_id,
+                        "gefyra.dev/destination": destination,
+                    },
+                )
+            )
+
+        _proxyroute_table.load(
+            V1ConfigMap(
+                metadata=V1ObjectMeta(resource_version="1"),
+                data={
+                    "client1-abc": "10.0.0.1:8000,10000",
+                    "client2-abc": "10.0.0.2:8000,10001",
+                },
+            )
+        )
+        cache.proxy_services.replace([proxy_service("client1", "10.0.0.1_8000", 10000)])
+        cache.proxy_services.synced.set()
+        stowaway = Stowaway(OperatorConfiguration(), logger)
+        try:
+            self.assertTrue(
+                await stowaway.destination_exists("client1", "10.0.0.1", 8000)
+            )
+            self.assertEqual(
+                await stowaway.get_destination("client1", "10.0.0.1", 8000),
+                "gefyra-stowaway-proxy-10000.gefyra.svc.cluster.local:10000",
+            )
+            self.assertEqual(
+                list(await stowaway.get_destinations()),
+                [("client1", "10.0.0.1", 8000)],
+            )
+            core_v1_api.list_namespaced_service.assert_not_called()
+
+            # a service the watch has not delivered yet is asked for
+            core_v1_api.list_namespaced_service.return_value = V1ServiceList(
+                items=[proxy_service("client2", "10.0.0.2_8000", 10001)]
+            )
+            self.assertTrue(
+                await stowaway.destination_exists("client2", "10.0.0.2", 8000)
+            )
+            core_v1_api.list_namespaced_service.assert_called_once()
+        finally:
+            cache.proxy_services.stop()
+
+
+WG_DUMP = (
+    "wg0\tprivate-key\tbY+CWLteoQhw4gsjstTyt7xM4Vozlo1OvOQvnFSdK4iU=\t51820\toff\n"
+    "wg0\teqBvqFkdKlR55/XVwp4o8mYnJN9Gnp0jAn0=\tpsk\t10.132.0.12:33416\t"
+    "192.168.99.3/32,172.22.0.0/16\t1760000000\t1300234\t1237319\toff\n"
+    "wg0\tfc1N/s3c/jDsx+ACYfrC2WOUVs=\t(none)\t(none)\t192.168.99.7/32\t0\t0\t0\t25\n"
+)
+
+
+def test_wg_dump():
+    from gefyra.connection.stowaway.utils import parse_wg_dump
+
+    peers = parse_wg_dump(WG_DUMP, now=1760000024)
+    assert peers == {
+        "eqBvqFkdKlR55/XVwp4o8mYnJN9Gnp0jAn0=": {
+            "public_key": "eqBvqFkdKlR55/XVwp4o8mYnJN9Gnp0jAn0=",
+            "endpoint": {"host": "10.132.0.12", "port": 33416},
+            "allowed_ips": ["192.168.99.3/32", "172.22.0.0/16"],
+            "latest_handshake": "2025-10-09T08:53:20Z",
+            "handshake_fresh": True,
+            "transfer": {
+                "received": {"value": 1300234, "unit": "B"},
+                "sent": {"value": 1237319, "unit": "B"},
+            },
+        },
+        "fc1N/s3c/jDsx+ACYfrC2WOUVs=": {
+            "public_key": "fc1N/s3c/jDsx+ACYfrC2WOUVs=",
+            "allowed_ips": ["192.168.99.7/32"],
+            "handshake_fresh": False,
+            "transfer": {
+                "received": {"value": 0, "unit": "B"},
+                "sent": {"value": 0, "unit": "B"},
+            },
+            "persistent_keepalive": {"value": 25, "unit": "seconds"},
+        },
+    }
+    stale = parse_wg_dump(WG_DUMP, now=1760000180)
+    assert not stale["eqBvqFkdKlR55/XVwp4o8mYnJN9Gnp0jAn0="]["handshake_fresh"]
+
+
+def test_wireguard_status_patch():
+    from gefyra.connection.stowaway.utils import parse_wg_dump, wireguard_status_patch
+
+    peer = parse_wg_dump(WG_DUMP, now=1760000024)["fc1N/s3c/jDsx+ACYfrC2WOUVs="]
+    # a status in the former format is replaced, stale fields are removed
+    patch = wireguard_status_patch(
+        {"public_key": peer["public_key"], "preshared_key": "(hidden)"}, peer
+    )
+    assert patch["preshared_key"] is None
+    assert "public_key" not in patch
+    assert patch["transfer"] == peer["transfer"]
+
+    current = dict(peer)
+    # only the byte counters changed
+    peer["transfer"] = {
+        "received": {"value": 92, "unit": "B"},
+        "sent": {"value": 148, "unit": "B"},
+    }
+    assert wireguard_status_patch(current, peer) is None
+
+    peer["handshake_fresh"] = True
+    peer["latest_handshake"] = "2025-10-09T08:53:20Z"
+    assert wireguard_status_patch(current, peer) == {
+        "handshake_fresh": True,
+        "latest_handshake": "2025-10-09T08:53:20Z",
+        "transfer": peer["transfer"],
+    }
+
+
+class TestStowawayWireguardStatus(IsolatedAsyncioTestCase):
+    def _client(self, name, public_key, wireguard=None):
+        body = {
+            "metadata": {"name": name, "namespace": "gefyra"},
+            "state": "ACTIVE",
+            "providerConfig": {"Interface.PublicKey": public_key},
+        }
+        if wireguard is not None:
+            body["status"] = {"wireguard": wireguard}
+        return body
+
+    async def test_only_changed_clients_are_patched(self):
+        from gefyra.connection.stowaway import handler
+        from gefyra.connection.stowaway.utils import parse_wg_dump
+
+        peers = parse_wg_dump(WG_DUMP)
+        unchanged = dict(peers["fc1N/s3c/jDsx+ACYfrC2WOUVs="])
+        unchanged["transfer"] = {}
+        clients = [
+            self._client("client-a", "eqBvqFkdKlR55/XVwp4o8mYnJN9Gnp0jAn0="),
+            self._client("client-b", "fc1N/s3c/jDsx+ACYfrC2WOUVs=", unchanged),
+        ]
+        stowaway = AsyncMock()
+        stowaway.ready.return_value = True
+        stowaway.read_wireguard_status.return_value = WG_DUMP
+
+        with (
+            patch.object(handler, "custom_object_api") as custom_object_api,
+            patch.object(handler, "Stowaway", return_value=stowaway),
+            patch("gefyra.clientstate.custom_api") as custom_api,
+        ):
+            custom_object_api.list_namespaced_custom_object.return_value = {
+                "items": clients
+            }
+            await handler.read_wireguard_status(logger)
+
+        custom_api.patch_namespaced_custom_object.assert_called_once()
+        kwargs = custom_api.patch_namespaced_custom_object.call_args[1]
+        self.assertEqual(kwargs["name"], "client-a")
+        self.assertEqual(
+            kwargs["body"]["status"]["wireguard"]["endpoint"],
+            {"host": "10.132.0.12", "port": 33416},
+        )
+
+
+class TestStowawayPeerCredentials(IsolatedAsyncioTestCase):
+    PEER_CONF = (
+        "[Interface]\n"
+        "Address = 192.168.99.2\n"
+        "PrivateKey = private-key\n"
+        "[Peer]\n"
+        "PublicKey = server-key\n"
+        "Endpoint = 10.0.0.1:31820\n"
+    )
+
+    def test_files_are_read_in_memory(self):
+        import io
+        import tarfile
+
+        from gefyra.utils import stream_read_files_from_pod
+
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            for name, content in [
+                ("config/peer_a/peer_a.conf", b"conf"),
+                ("config/peer_a/publickey-peer_a", b"key\n"),
+            ]:
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+        data = archive.getvalue()
+        chunks = [(data[:700], None, False), (data[700:], None, True)]
+
+        with (
+            patch("gefyra.utils.k8s.stream.stream") as stream,
+            patch("gefyra.utils.WSFileManager") as reader,
+        ):
+            reader.return_value.read_bytes.side_effect = chunks
+            files = stream_read_files_from_pod(
+                "stowaway-0",
+                "gefyra",
+                ["/config/peer_a/peer_a.conf", "/config/peer_a/publickey-peer_a"],
+            )
+        stream.assert_called_once()
+        self.assertEqual(
+            stream.call_args[1]["command"],
+            [
+                "tar",
+                "cf",
+                "-",
+                "/config/peer_a/peer_a.conf",
+                "/config/peer_a/publickey-peer_a",
+            ],
+        )
+        self.assertEqual(
+            files,
+            {
+                "/config/peer_a/peer_a.conf": b"conf",
+                "/config/peer_a/publickey-peer_a": b"key\n",
+            },
+        )
+
+    @patch.multiple(
+        "gefyra.connection.stowaway",
+        stream_read_files_from_pod=DEFAULT,
+        core_v1_api=DEFAULT,
+        exec_command_pod=DEFAULT,
+    )
+    async def test_credentials_are_cached_until_rekeyed(
+        self, stream_read_files_from_pod, core_v1_api, exec_command_pod
+    ):
+        from gefyra.configuration import OperatorConfiguration
+        from gefyra.connection.stowaway import Stowaway
+        from gefyra.connection.stowaway.peers import PEER_ADD, PeerChange
+
+        def read_files(pod_name, namespace, paths):
+            conf, key = paths
+            return {conf: self.PEER_CONF.encode(), key: b"client-key\n"}
+
+        stream_read_files_from_pod.side_effect = read_files
+        core_v1_api.read_namespaced_config_map.return_value = V1ConfigMap(
+            metadata=V1ObjectMeta(name="gefyra-stowaway-config", namespace="gefyra"),
+            data={"PEERS": "0"},
+        )
+        exec_command_pod.return_value = "PEER client1 ADDED"
+        stowaway = Stowaway(OperatorConfiguration(), logger)
+        stowaway._get_stowaway_pod = AsyncMock(return_value=NginxPodFactory())
+
+        details = await stowaway._get_wireguard_connection_details("client1")
+        self.assertEqual(details["Interface.PublicKey"], "client-key")
+        self.assertEqual(details["Peer.Endpoint"], "10.0.0.1:31820")
+        # callers must not be able to change the cached details
+        details["Interface.PublicKey"] = "changed"
+        self.assertEqual(
+            await stowaway._get_wireguard_connection_details("client1"),
+            {**details, "Interface.PublicKey": "client-key"},
+        )
+        stream_read_files_from_pod.assert_called_once()
+
+        # the peer is added again, i.e. it gets new keys
+        await stowaway._apply_peer_changes([PeerChange("client1", PEER_ADD)])
+        await stowaway._get_wireguard_connection_details("client1")
+        self.assertEqual(stream_read_files_from_pod.call_count, 2)
@@ -1,12 +1,21 @@
-#!/bin/sh
+#!/bin/bash
 # vim:sw=4:ts=4:et
 
+# Syncs the proxy routes in $1 (one file per route: "to_ip:to_port,proxy_port") to
+# one nginx include file per route. Only changed routes are (re)written or removed,
+# nginx is reloaded only if anything changed.
+
 set -e
 
 DEFAULT_CONF_FILE="/etc/nginx/nginx.conf"
+STREAM_CONF_DIRECTORY="/etc/nginx/stream.d"
 INPUT_DIRECTORY=$1
+RELOAD=0
+
+mkdir -p $STREAM_CONF_DIRECTORY
 
-echo "worker_processes  auto;
+if ! grep -qs "include $STREAM_CONF_DIRECTORY/\*.conf;" $DEFAULT_CONF_FILE; then
+    echo "worker_processes  auto;
 
 error_log  /var/log/nginx/error.log notice;
 pid        /tmp/nginx.pid;
@@ -15,25 +24,43 @@ pid        /tmp/nginx.pid;
 events {
     worker_connections  1024;
 }
-" > $DEFAULT_CONF_FILE
+
+stream {
+    include $STREAM_CONF_DIRECTORY/*.conf;
+}" > $DEFAULT_CONF_FILE
+    RELOAD=1
+fi
 
 gen_server_block () {
-    echo "  server {
-          listen $1;
-          proxy_pass $2;
-         }
-         " >> $DEFAULT_CONF_FILE
+    echo "server {
+    listen $1;
+    proxy_pass $2;
+}"
 }
 
-echo "stream {
-     " >> $DEFAULT_CONF_FILE
 echo "Reading in: $INPUT_DIRECTORY"
-for filename in $(ls $INPUT_DIRECTORY);
-do
-    echo "Generating $filename ..."
-    route=($(cat $INPUT_DIRECTORY/$filename | tr "," " "))
-    gen_server_block ${route[1]} ${route[0]}
+for path in "$INPUT_DIRECTORY"/*; do
+    [ -f "$path" ] || continue
+    filename=$(basename "$path")
+    route=($(tr "," " " < "$path"))
+    block=$(gen_server_block "${route[1]}" "${route[0]}")
+    if [ "$(cat "$STREAM_CONF_DIRECTORY/$filename.conf" 2>/dev/null)" != "$block" ]; then
+        echo "Generating $filename ..."
+        echo "$block" > "$STREAM_CONF_DIRECTORY/$filename.conf"
+        RELOAD=1
+    fi
+done
+
+for conf in "$STREAM_CONF_DIRECTORY"/*.conf; do
+    [ -f "$conf" ] || continue
+    filename=$(basename "$conf" .conf)
+    if [ ! -f "$INPUT_DIRECTORY/$filename" ]; then
+        echo "Removing $filename ..."
+        rm -f "$conf"
+        RELOAD=1
+    fi
 done
-echo "}" >> $DEFAULT_CONF_FILE
 
-nginx -s reload
\ No newline at end of file
+if [ "$RELOAD" -eq 1 ]; then
+    nginx -s reload
+fi